@@ -0,0 +1,86 @@
+"""
+PoW solver benchmark: the previous per-nonce rehash + byte loop check
+against the midstate solver used by calculate_txn_pow.
+
+    python benchmarks/pow_bench.py [--sizes 120,250,500] [--ttls 30,60,120] [--rounds 3] [--workers N]
+
+With --workers the process pool backend is timed too, for one transaction
+at a time and for the whole batch.
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+sys.path.append('.')
+
+from dioxide_python_sdk.utils.gadget import calculate_txn_pow, calculate_txn_pow_batch, get_pow_difficulty, get_ttl_from_signed_txn
+from dioxide_python_sdk.utils.pow import ParallelPowSolver
+
+
+def reference_txn_pow(tx):
+    pow_data = hashlib.sha512(tx).digest()[0:-4]
+    diff = get_pow_difficulty(len(tx)+12, get_ttl_from_signed_txn(tx))
+    target, nonzero = diff._TargetNum, diff._NonZeroBytes
+
+    def fulfilled(val):
+        if target <= int.from_bytes(val[nonzero-4:nonzero], 'little'):
+            return False
+        return all(b == 0 for b in val[nonzero:32])
+
+    nonces = [0] * 3
+    nonce = 0
+    for i in range(3):
+        while not fulfilled(hashlib.sha256(pow_data + nonce.to_bytes(4, 'little')).digest()):
+            nonce += 1
+        nonces[i] = nonce
+        nonce += 1
+    return nonces
+
+
+def make_tx(size, ttl):
+    tx = bytearray(os.urandom(size))
+    tx[12:14] = ((ttl - 1) & 0x1FF).to_bytes(2, 'little')
+    return bytes(tx)
+
+
+def timed(fn, txs):
+    start = time.perf_counter()
+    results = [fn(tx) for tx in txs]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="120,250,500")
+    parser.add_argument("--ttls", default="30,60,120")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args()
+    pool = ParallelPowSolver(args.workers) if args.workers > 1 else None
+
+    print("{:>6} {:>5} {:>10} {:>12} {:>12} {:>8}".format("size", "ttl", "attempts", "reference s", "solver s", "speedup"))
+    for size in [int(x) for x in args.sizes.split(",")]:
+        for ttl in [int(x) for x in args.ttls.split(",")]:
+            txs = [make_tx(size, ttl) for _ in range(args.rounds)]
+            ref_time, ref_nonces = timed(reference_txn_pow, txs)
+            new_time, new_nonces = timed(calculate_txn_pow, txs)
+            assert ref_nonces == new_nonces, "solver nonces differ from reference"
+            attempts = sum(n[-1] + 1 for n in new_nonces) // len(txs)
+            print("{:>6} {:>5} {:>10} {:>12.3f} {:>12.3f} {:>7.2f}x".format(
+                size, ttl, attempts, ref_time / len(txs), new_time / len(txs), ref_time / new_time))
+            if pool is not None:
+                par_time, par_nonces = timed(lambda tx: calculate_txn_pow(tx, pool), txs)
+                start = time.perf_counter()
+                batch_nonces = calculate_txn_pow_batch(txs, pool)
+                batch_time = time.perf_counter() - start
+                assert par_nonces == new_nonces and batch_nonces == new_nonces
+                print("{:>6} {:>5} {:>10} parallel {:.3f}s/tx, batch {:.3f}s/tx ({} workers)".format(
+                    "", "", "", par_time / len(txs), batch_time / len(txs), args.workers))
+    if pool is not None:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
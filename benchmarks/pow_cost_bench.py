@@ -0,0 +1,57 @@
+"""
+PoW cost estimator check: predicted attempts and seconds per transaction
+against what calculate_txn_pow actually takes, and the TTL pick_ttl
+chooses for a few latency targets.
+
+    python benchmarks/pow_cost_bench.py [--sizes 150,300,600] [--ttls 2,30,120] [--rounds 20] [--targets 30,300,1800]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append('.')
+
+from dioxide_python_sdk.utils.gadget import calculate_txn_pow
+from dioxide_python_sdk.utils.pow_cost import PowCostEstimator, NONCE_BYTES
+
+
+def make_payload(size, ttl):
+    # signed payload without nonces; size is the signed size with them
+    tx = bytearray(os.urandom(size - NONCE_BYTES))
+    tx[12:14] = ((ttl - 1) & 0x1FF).to_bytes(2, 'little')
+    return bytes(tx)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="150,300,600")
+    parser.add_argument("--ttls", default="2,30,120")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--targets", default="30,300,1800")
+    args = parser.parse_args()
+
+    estimator = PowCostEstimator()
+    print("calibrated hash rate: {:.0f}/s".format(estimator.calibrate(duration=0.5)))
+    print("{:>6} {:>5} {:>12} {:>12} {:>10} {:>10}".format("size", "ttl", "est attempts", "attempts", "est s", "solve s"))
+    for size in [int(x) for x in args.sizes.split(",")]:
+        for ttl in [int(x) for x in args.ttls.split(",")]:
+            payloads = [make_payload(size, ttl) for _ in range(args.rounds)]
+            start = time.perf_counter()
+            nonces = [calculate_txn_pow(p) for p in payloads]
+            elapsed = (time.perf_counter() - start) / len(payloads)
+            attempts = sum(n[-1] + 1 for n in nonces) / len(nonces)
+            est_attempts, est_seconds = estimator.estimate(payloads[0])
+            print("{:>6} {:>5} {:>12.0f} {:>12.0f} {:>10.4f} {:>10.4f}".format(
+                size, ttl, est_attempts, attempts, est_seconds, elapsed))
+
+    print()
+    print("{:>6} {:>10} {:>5} {:>10}".format("size", "target s", "ttl", "pow s"))
+    for size in [int(x) for x in args.sizes.split(",")]:
+        for target in [float(x) for x in args.targets.split(",")]:
+            ttl = estimator.pick_ttl(size, target)
+            print("{:>6} {:>10.0f} {:>5} {:>10.4f}".format(size, target, ttl, estimator.seconds(size, ttl)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+SM2 signing benchmark: gmssl CryptSM2.sign_with_sm3 (the previous
+DioxAccount path) against the cached-context Sm2Signer.
+
+    python benchmarks/sm2_bench.py [--rounds 50] [--size 256]
+"""
+import argparse
+import base64
+import os
+import sys
+import time
+
+sys.path.append('.')
+
+from gmssl.sm2 import CryptSM2
+
+from dioxide_python_sdk.utils.sm2 import Sm2Signer, N
+
+SK = base64.b64decode("+OfM+tj9R8I/BnIjCvc+JAdl0ADy1vAkbu0n2KINwzw=")
+PK = base64.b64decode("AX1hRvLswVwarsbSDiQHzxmSGwR95G4DPfjnLP2oAtDr3kNsJ7X7Q5l5yhnWg/5hTe30O/CZRIbOvv94y3cmvQ==")
+
+
+def per_call(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--size", type=int, default=256)
+    args = parser.parse_args()
+    msg = os.urandom(args.size)
+
+    signer = Sm2Signer(SK, PK)
+    signer.sign(msg)  # build the shared G table outside the timing
+
+    k = int.from_bytes(os.urandom(32), "big") % N
+    reference = bytes.fromhex(CryptSM2(private_key=SK.hex(), public_key=PK.hex(), asn1=False).sign_with_sm3(msg, "%064x" % k))
+    assert signer.sign(msg, k) == reference, "signature differs from gmssl"
+
+    def gmssl_sign():
+        # the previous account path built a new CryptSM2 per signature
+        CryptSM2(private_key=SK.hex(), public_key=PK.hex(), asn1=False).sign_with_sm3(msg)
+
+    old = per_call(gmssl_sign, args.rounds)
+    new = per_call(lambda: signer.sign(msg), args.rounds)
+    verify_old = per_call(lambda: CryptSM2(private_key=SK.hex(), public_key=PK.hex(), asn1=False).verify_with_sm3(reference.hex(), msg), args.rounds)
+    verify_new = per_call(lambda: signer.verify(reference, msg), args.rounds)
+    print("sign   gmssl {:8.3f} ms  fast {:8.3f} ms  {:6.1f}x".format(old * 1000, new * 1000, old / new))
+    print("verify gmssl {:8.3f} ms  fast {:8.3f} ms  {:6.1f}x".format(verify_old * 1000, verify_new * 1000, verify_old / verify_new))
+
+
+if __name__ == "__main__":
+    main()
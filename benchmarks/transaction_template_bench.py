@@ -0,0 +1,62 @@
+"""
+Per-transaction build cost: UnsignedTransaction.serialize (field by field,
+log2 gas-price encoding every call) against a TransactionTemplate that
+patches ISN, timestamp and input into a preallocated buffer.
+
+    python benchmarks/transaction_template_bench.py [--rounds 20000] [--input 64]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.account import DioxAddress, DioxAddressType
+from dioxide_python_sdk.client.contract import ContractInvokeID
+from dioxide_python_sdk.client.transaction import UnsignedTransaction, TransactionTemplate
+
+
+def per_call(fn, rounds):
+    start = time.perf_counter()
+    for i in range(rounds):
+        fn(i)
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--input", type=int, default=64)
+    args = parser.parse_args()
+    data = os.urandom(args.input)
+    timestamp = time.time_ns() // 1_000_000
+
+    for name, delegatee in (("plain", None), ("delegated", "testa")):
+        address = None
+        if delegatee is not None:
+            address = DioxAddress(None, DioxAddressType.DAPP)
+            address.set_delegatee_from_string(delegatee)
+
+        def serialize(isn):
+            tx = UnsignedTransaction(ContractInvokeID(0x1100000001), 0, timestamp=timestamp, delegatee=address)
+            tx.set_gas_price(1000)
+            tx.set_gas_limit(200000)
+            tx.set_isn(isn)
+            tx.input = data
+            tx.input_size = len(data)
+            return tx.serialize()
+
+        prototype = UnsignedTransaction(ContractInvokeID(0x1100000001), 0, timestamp=timestamp, delegatee=address)
+        prototype.set_gas_price(1000)
+        prototype.set_gas_limit(200000)
+        template = TransactionTemplate(prototype)
+        assert template.build(7, input=data, timestamp=timestamp) == serialize(7), "template differs from serialize"
+
+        old = per_call(serialize, args.rounds)
+        new = per_call(lambda isn: template.build(isn, input=data, timestamp=timestamp), args.rounds)
+        print("{:10s} serialize {:7.2f} us  template {:7.2f} us  {:5.1f}x".format(name, old * 1e6, new * 1e6, old / new))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,8 @@ import crc32c # type: ignore
 import krock32
 from enum import Enum
 import re
-from ..utils.gadget import calculate_txn_pow
+from concurrent.futures import ProcessPoolExecutor
+from ..utils.gadget import calculate_txn_pow,append_txn_pow
 
 class DioxAccountType(Enum):
     ETHEREUM = 1
@@ -142,6 +143,7 @@ class DioxAccount:
         self.__public_key = pk
         self.__address = addr
         self.__account_type = type
+        self.__key_cache = {}
 
     def __str__(self):
         s = '"PrivateKey":{},"PublicKey":{},"Address":{},"AddressType":{}'.format(self.sk_b64,self.pk_b64,self.address,self.account_type.name)
@@ -242,6 +244,7 @@ class DioxAccount:
     @sk_bytes.setter
     def sk_bytes(self,sk):
         self.__private_key = sk
+        self.__key_cache.clear()
 
     @property
     def pk_bytes(self):
@@ -250,6 +253,7 @@ class DioxAccount:
     @pk_bytes.setter
     def pk_bytes(self,pk):
         self.__public_key = pk
+        self.__key_cache.clear()
 
     @property
     def address_bytes(self):
@@ -270,6 +274,7 @@ class DioxAccount:
     @account_type.setter
     def account_type(self,type):
         self.__account_type = type
+        self.__key_cache.clear()
 
     def is_valid(self):
         if self.account_type.value >= DioxAccountType.END.value:
@@ -293,24 +298,41 @@ class DioxAccount:
         ret.update({"AddressType":self.account_type.name})
         return ret
 
+    def _cached_key(self,name,factory):
+        # key objects are built once per account instead of on every sign/verify
+        key = self.__key_cache.get(name)
+        if key is None:
+            key = factory()
+            self.__key_cache[name] = key
+        return key
+
+    def _get_signing_key(self):
+        return self._cached_key("ed25519_sk",lambda: ed25519.SigningKey(sk_s=self.__private_key))
+
+    def _get_verifying_key(self):
+        return self._cached_key("ed25519_vk",lambda: ed25519.VerifyingKey(vk_s=self.__public_key))
+
     def _get_sm2_crypt(self):
         from gmssl.sm2 import CryptSM2
 
-        return CryptSM2(
+        return self._cached_key("sm2",lambda: CryptSM2(
             private_key=self.__private_key.hex(),
             public_key=self.__public_key.hex(),
             asn1=False,
-        )
+        ))
+
+    def _get_sm2_signer(self):
+        from ..utils.sm2 import Sm2Signer
+
+        return self._cached_key("sm2_signer",lambda: Sm2Signer(self.__private_key,self.__public_key))
 
     def sign(self,msg:bytes):
         try:
             if self.account_type == DioxAccountType.ED25519:
-                sk = ed25519.SigningKey(sk_s=self.__private_key)
-                sig = sk.sign(msg)
+                sig = self._get_signing_key().sign(msg)
             elif self.account_type == DioxAccountType.SM2:
-                sig_hex = self._get_sm2_crypt().sign_with_sm3(msg)
-                sig = bytes.fromhex(sig_hex)
-                if len(sig) != 64:
+                sig = self._get_sm2_signer().sign(msg)
+                if sig is None or len(sig) != 64:
                     return None
             else:
                 return None
@@ -318,19 +340,42 @@ class DioxAccount:
             return None
         return sig
 
-    def sign_diox_transaction(self,txdata:bytes):
+    def sign_many(self,txdatas,workers=None,chunksize=None):
+        """
+        Sign and solve PoW for many composed transactions. With workers > 1
+        the work is fanned out to a process pool whose workers build this
+        account's key once. Results keep input order; an entry is None when
+        signing it failed, as with sign_diox_transaction.
+        """
+        txdatas = list(txdatas)
+        if workers is None or workers <= 1 or len(txdatas) <= 1:
+            return [self.sign_diox_transaction(txdata) for txdata in txdatas]
+        if chunksize is None:
+            chunksize = max(1,len(txdatas)//(workers*4))
+        initargs = (self.__private_key,self.__public_key,self.__address,self.account_type.value)
+        with ProcessPoolExecutor(max_workers=workers,initializer=_init_sign_worker,initargs=initargs) as executor:
+            return list(executor.map(_sign_in_worker,txdatas,chunksize=chunksize))
+
+    def sign_transaction_payload(self,txdata:bytes):
+        """Signed transaction without PoW nonces: txdata + sid + public key + signature."""
         try:
             sid = self.account_type.value.to_bytes(1,byteorder="little")
             sign_payload = txdata + sid + self.__public_key
             sig = self.sign(sign_payload)
             if sig is None:
                 return None
-            signed_tx_data = sign_payload + sig
+            return sign_payload + sig
+        except:
+            return None
+
+    def sign_diox_transaction(self,txdata:bytes):
+        try:
+            signed_tx_data = self.sign_transaction_payload(txdata)
+            if signed_tx_data is None:
+                return None
             # calculate txn pow
             nonces:list[int] = calculate_txn_pow(signed_tx_data)
-            for nonce in nonces:
-                signed_tx_data = signed_tx_data + nonce.to_bytes(4,'little')
-            return signed_tx_data
+            return append_txn_pow(signed_tx_data,nonces)
         except:
             return None
 
@@ -338,14 +383,26 @@ class DioxAccount:
     def verify(self,sig,msg):
         try:
             if self.account_type == DioxAccountType.ED25519:
-                pk = ed25519.VerifyingKey(vk_s=self.__public_key)
-                pk.verify(sig,msg)
+                self._get_verifying_key().verify(sig,msg)
             elif self.account_type == DioxAccountType.SM2:
                 if len(sig) != 64:
                     return False
-                return self._get_sm2_crypt().verify_with_sm3(sig.hex(), msg)
+                return self._get_sm2_signer().verify(sig, msg)
             else:
                 return False
         except:
             return False
         return True
+
+
+#--------------------------------------------------------------------------------
+# process pool workers for DioxAccount.sign_many
+
+_worker_account = None
+
+def _init_sign_worker(sk,pk,addr,type_value):
+    global _worker_account
+    _worker_account = DioxAccount(sk,pk,addr,DioxAccountType(type_value))
+
+def _sign_in_worker(txdata):
+    return _worker_account.sign_diox_transaction(txdata)
@@ -0,0 +1,148 @@
+"""
+  cache holds client side caches for contract source and chain metadata.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from box import Box  # type: ignore
+
+
+class SourceCodeCache:
+    """Contract source cache keyed by the build ``Hash`` from dx.contract_info.
+
+    Entries are zlib compressed in memory and, when ``cache_dir`` is set,
+    mirrored to disk so the cache survives restarts and can be shared by
+    processes on the same host.
+    """
+
+    def __init__(self, cache_dir=None, level=6):
+        self.cache_dir = cache_dir
+        self.level = level
+        self._entries = {}
+        self._lock = threading.Lock()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, code_hash):
+        # the Hash comes from the node: hash it again so the file name is always plain hex inside cache_dir
+        name = hashlib.sha256(str(code_hash).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, "{}.src.z".format(name))
+
+    def get(self, code_hash):
+        if not code_hash:
+            return None
+        with self._lock:
+            blob = self._entries.get(code_hash)
+        if blob is None and self.cache_dir is not None:
+            try:
+                with open(self._path(code_hash), "rb") as f:
+                    blob = f.read()
+            except OSError:
+                return None
+            with self._lock:
+                self._entries[code_hash] = blob
+        if blob is None:
+            return None
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    def put(self, code_hash, source):
+        if not code_hash:
+            return
+        blob = zlib.compress(json.dumps(source).encode("utf-8"), self.level)
+        with self._lock:
+            self._entries[code_hash] = blob
+        if self.cache_dir is not None:
+            tmp = "{}.{}.tmp".format(self._path(code_hash), os.getpid())
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, self._path(code_hash))
+
+    def __contains__(self, code_hash):
+        with self._lock:
+            if code_hash in self._entries:
+                return True
+        return self.cache_dir is not None and os.path.exists(self._path(code_hash))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class MetadataCache:
+    """Keyed cache for chain metadata (contract ABIs, dapp/token ids, shard indices).
+
+    Entries live in namespaces. Namespaces listed in ``immutable`` never
+    expire; the rest expire ``ttl`` seconds after they were stored, since
+    contracts can be upgraded and shard layout changes on scale-out.
+    ``shared`` is an optional SharedMetadataCache consulted on local misses
+    and filled on every put.
+    """
+
+    CONTRACT = "contract"
+    DAPP = "dapp"
+    TOKEN = "token"
+    SHARD = "shard"
+
+    def __init__(self, ttl=300, immutable=(DAPP, TOKEN), shared=None):
+        self.ttl = ttl
+        self.immutable = set(immutable)
+        self.shared = shared
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _expired(self, namespace, stored):
+        return namespace not in self.immutable and self.ttl is not None and time.time() - stored > self.ttl
+
+    def get(self, namespace, key):
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is not None:
+                value, stored = entry
+                if not self._expired(namespace, stored):
+                    return value
+                del self._entries[(namespace, key)]
+        if self.shared is None:
+            return None
+        entry = self.shared.get(namespace, key)
+        if entry is None:
+            return None
+        value, stored = entry
+        if self._expired(namespace, stored):
+            return None
+        if isinstance(value, dict):
+            value = Box(value, default_box=True)
+        with self._lock:
+            self._entries[(namespace, key)] = (value, stored)
+        return value
+
+    def put(self, namespace, key, value):
+        stored = time.time()
+        with self._lock:
+            self._entries[(namespace, key)] = (value, stored)
+        if self.shared is not None:
+            self.shared.put(namespace, key, value, stored)
+
+    def invalidate(self, namespace, key=None):
+        with self._lock:
+            if key is not None:
+                self._entries.pop((namespace, key), None)
+            else:
+                for k in [k for k in self._entries if k[0] == namespace]:
+                    del self._entries[k]
+        if self.shared is not None and key is not None:
+            self.shared.invalidate(namespace, key)
+
+    def keys(self, namespace):
+        with self._lock:
+            return [k[1] for k in self._entries if k[0] == namespace]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,290 @@
+"""
+  core_compose builds core contract transactions (core.wallet.transfer,
+  core.coin.mint, core.delegation.*) locally instead of through tx.compose.
+
+  The core ABIs are not published by dx.contract_info, so each function's
+  input is described here by one fixed encoder: its parameters in node
+  order, each with a single serializer type. Token ids always come from
+  the client's get_token_id (dx.token). The opcode, build and node defaults
+  are still taken from the first tx.compose of a function, and the
+  function is composed locally only after the fixed encoder rebuilt that
+  transaction byte for byte; otherwise it keeps using tx.compose. Token
+  attachments are checked the same way, once per client: the first
+  token-carrying tx.compose is rebuilt locally, and attachments are only
+  encoded locally (for core and dapp calls) when that rebuild matched.
+"""
+import threading
+import time
+
+from . import clientlogger
+from .account import DioxAddress, DioxAddressType
+from .contract import (
+    ContractInvokeID,
+    CORE_CONTRACT_COIN,
+    CORE_CONTRACT_DELEGATION,
+    CORE_CONTRACT_SCOPE_BITSHIFT,
+    DAPP_ID_CORE,
+)
+from .transaction import UnsignedTransaction, InternalTxnFlag
+from .types import EngineID
+from ..utils.serializer import serialize
+
+# fixed unsigned header: version..gas_limit is 28 bytes, core contracts add a 1-byte build
+OPCODE_OFFSET = 16
+CORE_CONTRACT_OFFSET = 17
+GAS_OFFSET = 18
+BUILD_OFFSET = 28
+CORE_HEADER_SIZE = 29
+
+
+def address_bytes_of(address):
+    if isinstance(address, (bytes, bytearray)):
+        return bytes(address)
+    addr = DioxAddress.from_key(str(address))
+    if addr is None:
+        raise ValueError("invalid address: {}".format(address))
+    return addr.address_bytes
+
+
+# converters take (client, value) and return what serialize expects
+def _int(client, value):
+    return int(value)
+
+
+def _str(client, value):
+    return str(value)
+
+
+def _list(client, value):
+    return list(value)
+
+
+def _address(client, value):
+    return address_bytes_of(value)
+
+
+def _token_id(client, value):
+    return client.get_token_id(value)
+
+
+class CoreFunction:
+    def __init__(self, name, core_contract, params):
+        self.name = name
+        self.core_contract = core_contract
+        # [(name, serializer type, converter)] in input order
+        self.params = params
+
+    def contract_invoke_id(self, build):
+        # CoreContractIDFromRvm maps this back to core_contract
+        return ContractInvokeID(sn=self.core_contract, engine_id=EngineID.Core.value, dapp_id=DAPP_ID_CORE,
+                                scope=self.core_contract >> CORE_CONTRACT_SCOPE_BITSHIFT, build=build)
+
+    def accepts(self, args):
+        return set(args or ()) == {name for name, _, _ in self.params}
+
+    def encode(self, client, args):
+        """Input bytes of ``args``; raises ValueError when they are not exactly this function's parameters."""
+        if not self.accepts(args):
+            raise ValueError("{} takes {}".format(self.name, [name for name, _, _ in self.params]))
+        return b"".join(serialize(t, conv(client, args[name])) for name, t, conv in self.params)
+
+
+CORE_FUNCTIONS = {f.name: f for f in [
+    CoreFunction("core.coin.mint", CORE_CONTRACT_COIN, [("Amount", "bigint", _int)]),
+    CoreFunction("core.wallet.transfer", CORE_CONTRACT_COIN,
+                 [("To", "address", _address), ("Amount", "bigint", _int), ("TokenId", "uint64", _token_id)]),
+    CoreFunction("core.delegation.create", CORE_CONTRACT_DELEGATION,
+                 [("Type", "uint8", _int), ("Name", "string", _str), ("Deposit", "bigint", _int)]),
+    CoreFunction("core.delegation.create_token", CORE_CONTRACT_DELEGATION,
+                 [("Minter", "uint64", _int), ("MinterFlags", "uint8", _int), ("TokenStates", "uint8", _int),
+                  ("Symbol", "string", _str), ("InitSupply", "bigint", _int), ("Deposit", "bigint", _int),
+                  ("Decimals", "uint8", _int)]),
+    CoreFunction("core.delegation.deploy_contracts", CORE_CONTRACT_DELEGATION,
+                 [("code", "array<string>", _list), ("cargs", "array<string>", _list)]),
+]}
+
+
+class _Learned:
+    """What the first tx.compose of a function taught us."""
+
+    def __init__(self, opcode, build, gas_price, gas_limit, ttl):
+        self.opcode = opcode
+        self.build = build
+        self.gas_price = gas_price
+        self.gas_limit = gas_limit
+        self.ttl = ttl
+
+
+def _node_settings(raw):
+    """(gas_price, gas_limit, ttl) encoded in an unsigned transaction."""
+    mantissa = int.from_bytes(raw[GAS_OFFSET:GAS_OFFSET + 4], "little")
+    exp = int.from_bytes(raw[GAS_OFFSET + 4:GAS_OFFSET + 6], "little")
+    gas_limit = int.from_bytes(raw[GAS_OFFSET + 6:GAS_OFFSET + 10], "little")
+    return mantissa << exp, gas_limit, 1 + (int.from_bytes(raw[12:14], "little") & 0x1FF)
+
+
+def _delegatee_of(sender):
+    if hasattr(sender, "address_bytes"):
+        return DioxAddress(sender.address_bytes, DioxAddressType.DEFAULT)
+    name, _, kind = str(sender).partition(":")
+    if kind != "dapp":
+        try:
+            return DioxAddress(address_bytes_of(sender), DioxAddressType.DEFAULT)
+        except Exception:
+            pass
+    delegatee = DioxAddress(None, DioxAddressType.DAPP)
+    if not delegatee.set_delegatee_from_string(name):
+        raise ValueError("invalid delegatee: {}".format(sender))
+    return delegatee
+
+
+def _rpc_sender(sender):
+    """tx.compose takes "address:type" strings, not accounts."""
+    if hasattr(sender, "account_type"):
+        return "{}:{}".format(sender.address, sender.account_type.name.lower())
+    return sender
+
+
+def _address_of(sender):
+    return sender.address if hasattr(sender, "address") else str(sender).split(":")[0]
+
+
+class CoreComposer:
+    logger = clientlogger.client_logger
+
+    def __init__(self, client, functions=None):
+        self.client = client
+        self.functions = CORE_FUNCTIONS if functions is None else functions
+        self._learned = {}
+        self._unsupported = set()
+        # None until a token-carrying tx.compose was checked, then whether add_fca matched it
+        self.fca_layout = None
+        self._lock = threading.Lock()
+
+    def supports(self, function):
+        return function in self.functions and function not in self._unsupported
+
+    def is_calibrated(self, function):
+        return function in self._learned
+
+    def compose(self, sender, function, args, tokens=None, isn=None, is_delegatee=False,
+                gas_price=None, gas_limit=None, ttl=None):
+        """
+        Unsigned core transaction bytes, composed locally once the function is
+        calibrated. ``tokens`` are attached with UnsignedTransaction.add_fca
+        after resolving them with the client's token_attachments.
+        """
+        learned = self._learned.get(function)
+        spec = self.functions.get(function)
+        # delegated transactions without an explicit ISN are left to the node
+        local = learned is not None and spec.accepts(args) and (isn is not None or not is_delegatee) and \
+            (tokens is None or self.fca_layout is True) and \
+            (gas_price is not None or learned.gas_price is not None) and \
+            (gas_limit is not None or learned.gas_limit is not None) and \
+            (ttl is not None or learned.ttl is not None)
+        if not local:
+            kwargs = {} if ttl is None else {"ttl": ttl}
+            raw = self.client.compose_transaction(_rpc_sender(sender), function, args, tokens=tokens, isn=isn,
+                                                  is_delegatee=is_delegatee, gas_price=gas_price,
+                                                  gas_limit=gas_limit, **kwargs)
+            if learned is None and tokens is None and self.supports(function) and spec.accepts(args):
+                self.calibrate(function, raw, sender, args, is_delegatee, gas_price, gas_limit, ttl)
+            elif learned is not None:
+                self._learn_defaults(learned, raw, gas_price, gas_limit, ttl)
+                if tokens is not None and self.fca_layout is None and spec.accepts(args):
+                    self.check_fca_layout(raw, lambda: self._rebuild(spec, learned, raw, sender, args, is_delegatee,
+                                                                     tokens))
+            return raw
+        if isn is None:
+            isn = self.client.get_isn(_address_of(sender))
+        return self.build(function, learned, sender, args, isn, is_delegatee,
+                          learned.gas_price if gas_price is None else gas_price,
+                          learned.gas_limit if gas_limit is None else gas_limit,
+                          learned.ttl if ttl is None else ttl, tokens=tokens)
+
+    def build(self, function, learned, sender, args, isn, is_delegatee, gas_price, gas_limit, ttl, timestamp=None,
+              tokens=None):
+        spec = self.functions[function]
+        delegatee = _delegatee_of(sender) if is_delegatee else None
+        tx = UnsignedTransaction(spec.contract_invoke_id(learned.build), learned.opcode,
+                                 timestamp=time.time_ns() // 1_000_000 if timestamp is None else timestamp,
+                                 delegatee=delegatee)
+        tx.set_isn(isn)
+        tx.set_gas_price(gas_price)
+        tx.set_gas_limit(gas_limit)
+        tx.ttl = ttl
+        if args:
+            tx.input = spec.encode(self.client, args)
+            tx.input_size = len(tx.input)
+        else:
+            tx.mode |= InternalTxnFlag.TMF_ZERO_ARG.value
+        if tokens is not None:
+            for token_id, amount in self.client.token_attachments(tokens):
+                tx.add_fca(token_id, amount)
+        return tx.serialize()
+
+    def calibrate(self, function, raw, sender, args, is_delegatee=False, gas_price=None, gas_limit=None, ttl=None,
+                  tokens=None):
+        """Check the fixed encoder against one tx.compose result; returns True if the function can now be composed locally."""
+        spec = self.functions[function]
+        with self._lock:
+            if function in self._learned or function in self._unsupported:
+                return function in self._learned
+            try:
+                learned = self._learn(spec, raw, sender, args, is_delegatee, gas_price, gas_limit, ttl, tokens)
+            except Exception as e:
+                self.logger.debug("core compose: rebuilding {} failed: {}".format(function, e))
+                learned = None
+            if learned is None:
+                if tokens is not None:
+                    # the attachments may be what differs: a call without tokens decides for the function
+                    return False
+                self._unsupported.add(function)
+                self.logger.warning("core compose: {} does not match tx.compose, keeping RPC".format(function))
+                return False
+            self._learned[function] = learned
+            if tokens is not None and self.fca_layout is None:
+                self.fca_layout = True
+            return True
+
+    def check_fca_layout(self, raw, rebuild):
+        """Settle fca_layout from one token-carrying tx.compose result and ``rebuild()``, its local rebuild."""
+        with self._lock:
+            if self.fca_layout is None:
+                try:
+                    rebuilt = rebuild()
+                except Exception as e:
+                    self.logger.debug("core compose: rebuilding token attachments failed: {}".format(e))
+                    rebuilt = None
+                self.fca_layout = rebuilt == bytes(raw)
+                if not self.fca_layout:
+                    self.logger.warning("core compose: token attachments do not match tx.compose, keeping RPC")
+            return self.fca_layout
+
+    @staticmethod
+    def _learn_defaults(learned, raw, gas_price, gas_limit, ttl):
+        # the node's defaults are only visible when the caller left a field unset
+        node_gas_price, node_gas_limit, node_ttl = _node_settings(raw)
+        if gas_price is None:
+            learned.gas_price = node_gas_price
+        if gas_limit is None:
+            learned.gas_limit = node_gas_limit
+        if ttl is None:
+            learned.ttl = node_ttl
+
+    def _learn(self, spec, raw, sender, args, is_delegatee, gas_price, gas_limit, ttl, tokens):
+        if len(raw) < CORE_HEADER_SIZE + 2 or raw[CORE_CONTRACT_OFFSET] != spec.core_contract:
+            return None
+        learned = _Learned(raw[OPCODE_OFFSET], raw[BUILD_OFFSET], None, None, None)
+        self._learn_defaults(learned, raw, gas_price, gas_limit, ttl)
+        # rebuild the node's own transaction and require byte equality
+        if self._rebuild(spec, learned, raw, sender, args, is_delegatee, tokens) != bytes(raw):
+            return None
+        return learned
+
+    def _rebuild(self, spec, learned, raw, sender, args, is_delegatee, tokens):
+        # the node's transaction with its own header fields
+        node_gas_price, node_gas_limit, node_ttl = _node_settings(raw)
+        return self.build(spec.name, learned, sender, args, int.from_bytes(raw[8:12], "little"), is_delegatee,
+                          node_gas_price, node_gas_limit, node_ttl, timestamp=int.from_bytes(raw[2:8], "little"),
+                          tokens=tokens)
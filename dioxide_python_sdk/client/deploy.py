@@ -0,0 +1,167 @@
+"""
+  deploy submits contract deployments for many dapps concurrently and
+  resolves each one when the chain applies it. A deployment is confirmed
+  through the client's TxnTracker, its core.contracts Scheduled
+  TargetHeight is looked up once, and a single waiter thread follows the
+  shared HeadTracker for every deployment in flight. Nothing is printed:
+  failures reach the caller through the futures and the client logger,
+  so it can run headless.
+"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from . import clientlogger
+from .dioxclient import DioxError
+from .txn_tracker import FAILED_STATUS
+from ..utils.gadget import quiet_exceptions
+
+DEFAULT_SUBMIT_WORKERS = 8
+DEFAULT_WAIT_SLICE = 0.5
+
+
+class ContractDeployer:
+    """Concurrent deploy_contracts submission with event-driven completion.
+
+    ``submit`` returns a Future resolved with the deploy transaction hash
+    once the head passes the deployment's TargetHeight (or right after
+    confirmation when nothing was scheduled). It fails with the client's
+    DioxError of compose/sign/send, with DioxError(-10008) when the
+    transaction fails on chain, or DioxError(-10000) once ``timeout`` seconds
+    from submit have passed, whatever stage the deployment is in.
+    """
+
+    logger = clientlogger.client_logger
+
+    def __init__(self, client, workers=DEFAULT_SUBMIT_WORKERS, wait_slice=DEFAULT_WAIT_SLICE):
+        self.client = client
+        self.wait_slice = wait_slice
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deployer")
+        self._pending = []
+        self._deadlines = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._waiter = None
+
+    def close(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._waiter is not None:
+            self._waiter.join(timeout=1)
+            self._waiter = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, dapp_name, delegator, deploy_args, timeout=None):
+        """Deploy ``deploy_args`` (code/cargs[/time]) to ``dapp_name`` signed by ``delegator``."""
+        future = Future()
+        if timeout is not None:
+            with self._cond:
+                # [deadline, tx hash once sent]
+                self._deadlines[future] = [time.time() + timeout, None]
+                self._start_waiter()
+                self._cond.notify_all()
+        self._executor.submit(self._send, future, dapp_name, delegator, deploy_args)
+        return future
+
+    def _resolve(self, future, tx_hash=None, error=None):
+        with self._cond:
+            self._deadlines.pop(future, None)
+        if future.done():
+            return
+        if error is None:
+            future.set_result(tx_hash)
+        else:
+            if tx_hash is None:
+                self.logger.warning("deploy failed before it was sent: {}".format(error))
+            else:
+                self.logger.warning("deploy {} failed: {}".format(tx_hash, error))
+            future.set_exception(error)
+
+    def _send(self, future, dapp_name, delegator, deploy_args):
+        if future.done():
+            return
+        try:
+            with quiet_exceptions():
+                tx_hash = self.client.send_deploy_transaction(dapp_name, delegator, deploy_args)
+        except Exception as e:
+            # nothing was sent, so there is no transaction hash yet
+            self._resolve(future, None, e)
+            return
+        with self._cond:
+            entry = self._deadlines.get(future, None)
+            if entry is not None:
+                entry[1] = tx_hash
+        self.client.track_transaction(tx_hash).add_done_callback(
+            lambda f: self._executor.submit(self._on_confirmed, future, tx_hash, f))
+
+    def _on_confirmed(self, future, tx_hash, confirmed):
+        if future.done():
+            return
+        if confirmed.cancelled():
+            future.cancel()
+            return
+        state = confirmed.result()
+        if state in FAILED_STATUS:
+            self._resolve(future, tx_hash, DioxError(-10008, "deploy {} {}".format(tx_hash, state)))
+            return
+        try:
+            with quiet_exceptions():
+                target = self.client.get_deploy_target_height(tx_hash)
+        except Exception as e:
+            self._resolve(future, tx_hash, e)
+            return
+        if target < 0:
+            self._resolve(future, tx_hash)
+            return
+        with self._cond:
+            heapq.heappush(self._pending, (target, next(self._seq), tx_hash, future))
+            self._start_waiter()
+            self._cond.notify_all()
+
+    def _start_waiter(self):
+        # under self._cond
+        if self._waiter is None:
+            self._waiter = threading.Thread(target=self._wait_loop, name="deploy-waiter", daemon=True)
+            self._waiter.start()
+
+    def _expire(self, now):
+        with self._cond:
+            expired = [(future, entry[1]) for future, entry in self._deadlines.items() if now > entry[0]]
+        # the TxnTracker future is shared with other callers and stays tracked;
+        # this deployer's callback on it returns early once the deploy is resolved
+        for future, tx_hash in expired:
+            self._resolve(future, tx_hash, DioxError(-10000, "deploy {} timeout".format(tx_hash)))
+
+    def _wait_loop(self):
+        tracker = self.client.head_tracker
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._pending and not self._deadlines and not self._stop.is_set():
+                    self._cond.wait()
+                if self._stop.is_set():
+                    return
+                target = self._pending[0][0] if self._pending else None
+                if target is None:
+                    # only deployments still being sent or confirmed: just watch their deadlines
+                    self._cond.wait(self.wait_slice)
+            if target is not None:
+                # the deployment is applied once the head is past TargetHeight
+                tracker.wait_until_height(target + 1, self.wait_slice)
+            done = []
+            with self._cond:
+                keep = []
+                for entry in self._pending:
+                    if tracker.height > entry[0]:
+                        done.append(entry)
+                    elif not entry[3].done():
+                        keep.append(entry)
+                if len(keep) != len(self._pending):
+                    heapq.heapify(keep)
+                    self._pending = keep
+            for _, _, tx_hash, future in done:
+                self._resolve(future, tx_hash)
+            self._expire(time.time())
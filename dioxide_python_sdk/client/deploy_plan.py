@@ -0,0 +1,149 @@
+"""
+  deploy_plan decides which local contract sources actually need a deploy.
+  Each file is hashed and compared with the source of the contract of the
+  same name on chain (dx.contract_info / dx.source_code), so unchanged
+  builds are not recompiled and do not pay for PoW again.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+
+from . import clientlogger
+
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+_CONTRACT_NAME = re.compile(r"^\s*contract\s+([A-Za-z_]\w*)", re.M)
+
+
+def contract_name_of(source):
+    match = _CONTRACT_NAME.search(source)
+    return match.group(1) if match is not None else None
+
+
+def source_digest(source):
+    """sha256 of a source with line endings and trailing whitespace normalized."""
+    lines = source.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    text = "\n".join(line.rstrip() for line in lines).strip("\n")
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _source_text(response):
+    if isinstance(response, str):
+        return response
+    if isinstance(response, dict):
+        for key in ("Source", "SourceCode", "Code"):
+            if isinstance(response.get(key, None), str):
+                return response[key]
+    return None
+
+
+class DeployPlan:
+    """Outcome of DeployPlanner.plan: one (path, name, status) entry per contract.
+
+    ``contracts`` is the subset of the input mapping (path -> constructor
+    args, input order kept) that must be deployed, ready for
+    deploy_contracts; it is empty when everything is already on chain.
+    """
+
+    def __init__(self, dapp_name):
+        self.dapp_name = dapp_name
+        self.entries = []
+        self.contracts = {}
+
+    def add(self, path, name, status, cargs):
+        self.entries.append((path, name, status))
+        if status != UNCHANGED:
+            self.contracts[path] = cargs
+
+    def names(self, status):
+        return [name for _, name, s in self.entries if s == status]
+
+    @property
+    def unchanged(self):
+        return self.names(UNCHANGED)
+
+    def __bool__(self):
+        return bool(self.contracts)
+
+    def __len__(self):
+        return len(self.contracts)
+
+
+class DeployPlanner:
+    """Hash based change detection for deploy_contracts.
+
+    A contract is UNCHANGED when the digest of its local source equals the
+    digest of the source deployed under the same name. Verified matches
+    are remembered as (local digest, build Hash), and optionally kept in the
+    ``state_path`` JSON file. A later plan of the same file then costs one
+    dx.contract_info request. Source is only downloaded again when the
+    build Hash on chain or the local file changed.
+    """
+
+    logger = clientlogger.client_logger
+
+    def __init__(self, client, state_path=None):
+        self.client = client
+        self.state_path = state_path
+        self._verified = {}
+        self._lock = threading.Lock()
+        if state_path is not None and os.path.exists(state_path):
+            try:
+                with open(state_path, encoding="utf-8") as f:
+                    self._verified = {k: tuple(v) for k, v in json.load(f).items()}
+            except (OSError, ValueError) as e:
+                self.logger.warning("deploy plan state {} ignored: {}".format(state_path, e))
+
+    def _save(self):
+        if self.state_path is None:
+            return
+        with self._lock:
+            data = json.dumps({k: list(v) for k, v in self._verified.items()})
+        tmp = "{}.{}.tmp".format(self.state_path, os.getpid())
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.state_path)
+
+    def _build_hash(self, dapp_name, name):
+        try:
+            info = self.client.get_contract_info(dapp_name, name, use_cache=False)
+        except Exception as e:
+            # node errors (DioxError) mean the contract is not deployed; anything else is real
+            if getattr(e, "code", None) is None:
+                raise
+            return None
+        return info.get("Hash", None) or None
+
+    def status(self, dapp_name, name, digest):
+        """NEW, CHANGED or UNCHANGED for a local source digest of ``dapp_name.name``."""
+        key = "{}.{}".format(dapp_name, name)
+        build_hash = self._build_hash(dapp_name, name)
+        if build_hash is None:
+            return NEW
+        with self._lock:
+            verified = self._verified.get(key, None)
+        if verified == (digest, build_hash):
+            return UNCHANGED
+        source = _source_text(self.client.get_source_code(dapp_name, name))
+        if source is None or source_digest(source) != digest:
+            return CHANGED
+        with self._lock:
+            self._verified[key] = (digest, build_hash)
+        return UNCHANGED
+
+    def plan(self, dapp_name, contracts):
+        """Compare ``contracts`` (path -> constructor args) against what ``dapp_name`` runs."""
+        plan = DeployPlan(dapp_name)
+        for path, cargs in contracts.items():
+            with open(os.path.normpath(path), encoding="utf-8", errors="replace") as f:
+                source = f.read()
+            name = contract_name_of(source)
+            digest = source_digest(source)
+            status = NEW if name is None else self.status(dapp_name, name, digest)
+            plan.add(path, name, status, cargs)
+        self._save()
+        return plan
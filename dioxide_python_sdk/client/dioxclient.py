@@ -8,7 +8,7 @@ from ..client.stat import StatTool
 from ..config.client_config import Config
 from ..utils.rpc import HTTPProvide
 from ..client.account import DioxAccount,DioxAccountType,DioxAddress,DioxAddressType
-from ..utils.gadget import exception_handler,get_subscribe_message,progress_bar
+from ..utils.gadget import exception_handler,get_subscribe_message,progress_bar,quiet_exceptions
 from ..client.filters import (
     dapp_filter,
     contract_filter,
@@ -28,15 +28,22 @@ from ..client.handlers import (
 )
 from box import Box  # type: ignore
 from . import types as dioxtypes
-import queue
 import base64
 import time
 import json
 from ..client.contract import Scope
+from ..client.head_tracker import HeadTracker
+from ..client.txn_tracker import TxnTracker
+from ..client.relay_tree import RelayTree
+from ..client.cache import SourceCodeCache,MetadataCache
+from ..client.shared_cache import SharedMetadataCache
+from ..client.isn import IsnAllocator, IsnGapMonitor
+from ..client.core_compose import CoreComposer, _node_settings, _rpc_sender
+from ..client.deploy_plan import DeployPlanner
 import os
 import threading
 import websockets  # type: ignore
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, CancelledError, TimeoutError as FutureTimeoutError
 import asyncio
 
 
@@ -64,12 +71,57 @@ class DioxClient:
         self.ws_rpc = ws_url
         self.ws_connections = {}
         self.loop = asyncio.new_event_loop()
+        self._head_tracker = None
+        self._head_tracker_lock = threading.Lock()
+        self._txn_tracker = None
+        self._isn_gap_monitor = None
+        self._deployer = None
+        self.source_cache = SourceCodeCache(Config.source_cache_dir)
+        shared_cache = None
+        if Config.shared_cache_path is not None:
+            shared_cache = SharedMetadataCache(Config.shared_cache_path)
+        self.metadata_cache = MetadataCache(Config.metadata_cache_ttl,shared=shared_cache)
+        # (namespace, key) of entries warm_up prefetched
+        self._warmed = set()
+        self.isn_allocator = IsnAllocator(self)
+        self.core_composer = CoreComposer(self)
+        self._token_ids = {}
+        self.deploy_planner = DeployPlanner(self,Config.deploy_plan_state_path)
         threading.Thread(target=self.__start_loop, daemon=True).start()
 
     def __start_loop(self):
         asyncio.set_event_loop(self.loop)
         self.loop.run_forever()
 
+    @property
+    def head_tracker(self) -> HeadTracker:
+        with self._head_tracker_lock:
+            if self._head_tracker is None:
+                self._head_tracker = HeadTracker(self).start()
+            return self._head_tracker
+
+    @property
+    def txn_tracker(self) -> TxnTracker:
+        with self._head_tracker_lock:
+            if self._txn_tracker is None:
+                self._txn_tracker = TxnTracker(self).start()
+            return self._txn_tracker
+
+    @property
+    def isn_gap_monitor(self) -> IsnGapMonitor:
+        with self._head_tracker_lock:
+            if self._isn_gap_monitor is None:
+                self._isn_gap_monitor = IsnGapMonitor(self).start()
+            return self._isn_gap_monitor
+
+    @property
+    def deployer(self):
+        from .deploy import ContractDeployer
+        with self._head_tracker_lock:
+            if self._deployer is None:
+                self._deployer = ContractDeployer(self)
+            return self._deployer
+
     def get_client_version(self):
         info = "url:{}\n".format(Config.url)
         info = "rpc:{}\n".format(self.rpc)
@@ -162,17 +214,24 @@ class DioxClient:
     @params:
         scope: global/shard/address/uds(user define scope)
         scope_key: key for scope; may be empty if scope is global
+        use_cache: return cached index if present; None (default) only for keys warm_up prefetched
     @response -- int:
         Shard index for the key.
     """
     @exception_handler
-    def get_shard_index(self,scope,scope_key):
+    def get_shard_index(self,scope,scope_key,use_cache=None):
+        cache_key = (scope,scope_key)
+        cached = self._cached(use_cache,MetadataCache.SHARD,cache_key)
+        if cached is not None:
+            return cached
         method = "dx.shard_index"
         params = {}
         params.update({"scope":scope})
         params.update({"scope_key":scope_key})
         response = self.make_request(method,params)
-        return int(response["ShardIndex"])
+        shard_index = int(response["ShardIndex"])
+        self.metadata_cache.put(MetadataCache.SHARD,cache_key,shard_index)
+        return shard_index
 
     """
     @description:
@@ -339,6 +398,9 @@ class DioxClient:
     """
     @description:
         Build transaction locally without RPC (inverse of parse logic).
+        Core functions (core.wallet.transfer, core.coin.mint, core.delegation.*)
+        go through client.core_composer: the first call of each is composed by
+        tx.compose and checked byte for byte, later calls are built locally.
     @params:
         sender: sender address or DioxAccount
         function: contract function (<dapp>.<contract>.<function>)
@@ -350,14 +412,91 @@ class DioxClient:
         gas_price: gas price
         gas_limit: gas limit
         ttl: transaction TTL
+        tokens: token attachments, [{symbol: amount}, ...] as for tx.compose
+            (at most 3). Symbols are resolved to ids with get_token_id and
+            each attachment is encoded as a uint64 id and a bigint amount.
+            The first token-carrying call goes through tx.compose and is
+            rebuilt locally; attachments are only encoded locally once that
+            rebuild matched byte for byte (core_composer.fca_layout).
     @response -- bytes
         Unsigned transaction bytes.
     """
     @exception_handler
     def compose_transaction_local(self, sender, function: str, args: dict, signature: str = None,
                                   contract_info=None, isn=None, is_delegatee=False,
-                                  gas_price=None, gas_limit=None, ttl=None):
+                                  gas_price=None, gas_limit=None, ttl=None, tokens=None):
+        if function.startswith("core."):
+            return self.core_composer.compose(sender, function, args, tokens=tokens, isn=isn, is_delegatee=is_delegatee,
+                                              gas_price=gas_price, gas_limit=gas_limit, ttl=ttl)
+        if tokens is not None and self.core_composer.fca_layout is not True:
+            return self._compose_tokens_rpc(sender, function, args, tokens, signature, contract_info,
+                                            isn, is_delegatee, gas_price, gas_limit, ttl)
+        tx, signature = self._prepare_local_transaction(sender, function, signature, contract_info,
+                                                        is_delegatee, gas_price, gas_limit, ttl)
+        if isn is not None:
+            tx.set_isn(isn)
+        else:
+            sender_addr = sender.address if hasattr(sender, 'address') else sender
+            tx.set_isn(self.get_isn(sender_addr))
+        self._fill_local_transaction(tx, signature, args, tokens)
+        return tx.serialize()
+
+    def _fill_local_transaction(self, tx, signature, args, tokens):
         from ..utils.gadget import serialize_args
+
+        if args and signature:
+            serialized_input = serialize_args(signature, args)
+            tx.input = bytes.fromhex(serialized_input)
+            tx.input_size = len(tx.input)
+        elif not args:
+            tx.mode |= 0x400
+        if tokens is not None:
+            for token_id, amount in self.token_attachments(tokens):
+                tx.add_fca(token_id, amount)
+
+    def _compose_tokens_rpc(self, sender, function, args, tokens, signature, contract_info,
+                            isn, is_delegatee, gas_price, gas_limit, ttl):
+        kwargs = {} if ttl is None else {"ttl": ttl}
+        raw = self.compose_transaction(_rpc_sender(sender), function, args, tokens=tokens, isn=isn,
+                                       is_delegatee=is_delegatee, gas_price=gas_price, gas_limit=gas_limit, **kwargs)
+        if self.core_composer.fca_layout is None:
+            self.core_composer.check_fca_layout(raw, lambda: self._rebuild_local_transaction(
+                raw, sender, function, args, tokens, signature, contract_info, is_delegatee))
+        return raw
+
+    def _rebuild_local_transaction(self, raw, sender, function, args, tokens, signature, contract_info, is_delegatee):
+        # the node's transaction with its own header fields
+        node_gas_price, node_gas_limit, node_ttl = _node_settings(raw)
+        tx, signature = self._prepare_local_transaction(sender, function, signature, contract_info,
+                                                        is_delegatee, node_gas_price, node_gas_limit, node_ttl)
+        tx.timestamp = int.from_bytes(raw[2:8], "little")
+        tx.set_isn(int.from_bytes(raw[8:12], "little"))
+        self._fill_local_transaction(tx, signature, args, tokens)
+        return tx.serialize()
+
+    """
+    @description:
+        Compile a reusable template for repeated calls of one function with
+        the same sender and gas settings. The invariant header is encoded
+        once; each build only patches ISN, timestamp and input.
+    @params:
+        same as compose_transaction_local, without args and isn
+    @response -- TransactionTemplate
+        template.build(isn, args=None, input=None, timestamp=None) -> bytes
+        (one template per thread: builds reuse its buffer)
+    """
+    @exception_handler
+    def compose_transaction_template(self, sender, function: str, signature: str = None,
+                                     contract_info=None, is_delegatee=False,
+                                     gas_price=None, gas_limit=None, ttl=None):
+        from .transaction import TransactionTemplate
+
+        tx, signature = self._prepare_local_transaction(sender, function, signature, contract_info,
+                                                        is_delegatee, gas_price, gas_limit, ttl)
+        return TransactionTemplate(tx, signature)
+
+    def _prepare_local_transaction(self, sender, function, signature, contract_info,
+                                   is_delegatee, gas_price, gas_limit, ttl):
         from .transaction import UnsignedTransaction
         from .contract import ContractInvokeID, ContractID, ContractVersionID
         from .account import DioxAddress, DioxAddressType
@@ -369,7 +508,7 @@ class DioxClient:
         dapp_name, contract_name, function_name = parts
 
         if contract_info is None:
-            contract_info = self.get_contract_info(dapp_name, contract_name)
+            contract_info = self.get_contract_info(dapp_name, contract_name, use_cache=True)
 
         contract_id_val = contract_info.ContractID
         contract_version_id_val = contract_info.ContractVersionID
@@ -430,13 +569,7 @@ class DioxClient:
             else:
                 delegatee = DioxAddress(sender.address_bytes, DioxAddressType.DEFAULT)
 
-        tx = UnsignedTransaction(contract_invoke_id, opcode, delegatee=delegatee)
-
-        if isn is not None:
-            tx.set_isn(isn)
-        else:
-            sender_addr = sender.address if hasattr(sender, 'address') else sender
-            tx.set_isn(self.get_isn(sender_addr))
+        tx = UnsignedTransaction(contract_invoke_id, opcode, timestamp=time.time_ns() // 1_000_000, delegatee=delegatee)
 
         if gas_price is not None:
             tx.set_gas_price(gas_price)
@@ -444,15 +577,7 @@ class DioxClient:
             tx.set_gas_limit(gas_limit)
         if ttl is not None:
             tx.ttl = ttl
-
-        if args and signature:
-            serialized_input = serialize_args(signature, args)
-            tx.input = bytes.fromhex(serialized_input)
-            tx.input_size = len(tx.input)
-        elif not args:
-            tx.mode |= 0x400
-
-        return tx.serialize()
+        return tx, signature
 
     """
     @description:
@@ -471,7 +596,9 @@ class DioxClient:
         response = self.make_request(method,params)
         tx_hash = response["Hash"]
         if sync:
-            if self.wait_for_transaction_confirmed(tx_hash,timeout):
+            from .transaction import txn_expiry
+
+            if self.wait_for_transaction_confirmed(tx_hash,timeout,txn_expiry(signed_txn)):
                 return tx_hash
             else:
                 raise DioxError(-10000, "timeout")
@@ -484,31 +611,54 @@ class DioxClient:
     @params:
         dapp_name: dapp name
         contract_name: contract name
+        use_cache: return cached info if present (expires after Config.metadata_cache_ttl);
+            None (default) only for contracts warm_up prefetched
     @response -- object
         ContractID, ContractVersionID, Contract, Hash, ImplmentedInterfaces,
         StateVariables, Scopes, Interfaces, Functions
     """
     @exception_handler
-    def get_contract_info(self,dapp_name,contract_name):
+    def get_contract_info(self,dapp_name,contract_name,use_cache=None):
+        name = "{}.{}".format(dapp_name,contract_name)
+        cached = self._cached(use_cache,MetadataCache.CONTRACT,name)
+        if cached is not None:
+            return cached
         method = "dx.contract_info"
-        params = {"contract":"{}.{}".format(dapp_name,contract_name)}
+        params = {"contract":name}
         response = self.make_request(method,params)
-        return Box(response,default_box=True)
+        info = Box(response,default_box=True)
+        self.metadata_cache.put(MetadataCache.CONTRACT,name,info)
+        return info
 
     """
     @description:
-        Get source code of deployed contract.
+        Get source code of deployed contract. Source is cached by the build
+        Hash from a fresh dx.contract_info, so a repeated call for an unchanged
+        build costs one contract_info request instead of a full download. A
+        download is cached under the Hash in the dx.source_code response when
+        it has one, otherwise under the Hash read before the download.
     @params:
         dapp_name: dapp name
         contract_name: contract name
+        use_cache: reuse cached source when the build hash matches
     @response -- str
         Contract source code string.
     """
     @exception_handler
-    def get_source_code(self,dapp_name,contract_name):
+    def get_source_code(self,dapp_name,contract_name,use_cache=True):
+        code_hash = None
+        if use_cache:
+            code_hash = self.get_contract_info(dapp_name,contract_name,use_cache=False).get("Hash",None)
+            cached = self.source_cache.get(code_hash)
+            if cached is not None:
+                return cached
         method = "dx.source_code"
         params = {"contract":"{}.{}".format(dapp_name,contract_name)}
         response = self.make_request(method,params)
+        if code_hash:
+            # a Hash in the response names exactly the build it came from
+            source_hash = response.get("Hash",None) if isinstance(response,dict) else None
+            self.source_cache.put(source_hash or code_hash,response)
         return response
 
     """
@@ -540,16 +690,7 @@ class DioxClient:
             deploy_args.update({"cargs": [json.dumps(construct_args)]})
         if compile_time is not None:
             deploy_args.update({"time":compile_time})
-        dapp_address = DioxAddress(None,DioxAddressType.DAPP)
-        if not dapp_address.set_delegatee_from_string(dapp_name):
-            raise DioxError(-10002, "invalid dapp name")
-        deployed_txn = self.compose_transaction(
-            sender=dapp_address.address,
-            function="core.delegation.deploy_contracts",
-            args=deploy_args,
-            is_delegatee=True
-        )
-        tx_hash = self.send_raw_transaction(delegator.sign_diox_transaction(deployed_txn),True)
+        tx_hash = self.send_deploy_transaction(dapp_name,delegator,deploy_args,True)
         self.wait_for_deploy(tx_hash)
         return tx_hash
 
@@ -566,6 +707,56 @@ class DioxClient:
     """
     @exception_handler
     def deploy_contracts(self,dapp_name,delegator:DioxAccount,contracts:dict[str,dict]=None,compile_time=None):
+        deploy_args = self.contracts_deploy_args(contracts,compile_time)
+        tx_hash = self.send_deploy_transaction(dapp_name,delegator,deploy_args,True)
+        self.wait_for_deploy(tx_hash)
+        return tx_hash
+
+    """
+    @description:
+        Work out which contracts of a deploy_contracts mapping differ from
+        what the dapp already runs. Local sources are hashed and compared
+        with the on-chain source of the contract with the same name.
+    @params:
+        dapp_name: dapp name
+        contracts: dict mapping absolute path -> constructor args
+    @response -- DeployPlan
+        entries: (path, contract name, "new" | "changed" | "unchanged");
+        contracts: the subset of contracts that needs deploying
+    """
+    def plan_deploy(self,dapp_name,contracts:dict[str,dict]):
+        return self.deploy_planner.plan(dapp_name,contracts)
+
+    """
+    @description:
+        Deploy only the contracts whose source differs from the chain, all
+        in one deploy_contracts transaction.
+    @params:
+        dapp_name: dapp name
+        delegator: dapp owner, signing account
+        contracts: dict mapping absolute path -> constructor args
+        compile_time: max compile time (optional)
+    @response -- str
+        Deploy transaction hash, or None when nothing changed.
+    """
+    @exception_handler
+    def deploy_changed_contracts(self,dapp_name,delegator:DioxAccount,contracts:dict[str,dict],compile_time=None):
+        plan = self.plan_deploy(dapp_name,contracts)
+        if not plan:
+            self.logger.info("deploy {}: all {} contracts unchanged".format(dapp_name,len(plan.entries)))
+            return None
+        return self.deploy_contracts(dapp_name,delegator,plan.contracts,compile_time)
+
+    """
+    @description:
+        Build core.delegation.deploy_contracts args from contract files.
+    @params:
+        contracts: dict mapping absolute path -> constructor args
+        compile_time: max compile time (optional)
+    @response -- dict
+        {"code": [...], "cargs": [...], "time": compile_time}
+    """
+    def contracts_deploy_args(self,contracts:dict[str,dict],compile_time=None):
         deploy_args={}
         codes = []
         cargs = []
@@ -591,6 +782,21 @@ class DioxClient:
         deploy_args.update({"cargs":cargs})
         if compile_time is not None:
             deploy_args.update({"time":compile_time})
+        return deploy_args
+
+    """
+    @description:
+        Compose, sign and send a core.delegation.deploy_contracts transaction
+        for a dapp, without waiting for the deployment itself.
+    @params:
+        dapp_name: dapp name
+        delegator: dapp owner, signing account
+        deploy_args: {"code": [...], "cargs": [...], "time": ...}
+        sync: wait for the transaction to be confirmed
+    @response -- str
+        Deploy transaction hash.
+    """
+    def send_deploy_transaction(self,dapp_name,delegator:DioxAccount,deploy_args,sync=False):
         dapp_address = DioxAddress(None,DioxAddressType.DAPP)
         if not dapp_address.set_delegatee_from_string(dapp_name):
             raise DioxError(-10002, "invalid dapp name")
@@ -600,24 +806,90 @@ class DioxClient:
             args=deploy_args,
             is_delegatee=True
         )
-        tx_hash = self.send_raw_transaction(delegator.sign_diox_transaction(deployed_txn),True)
-        self.wait_for_deploy(tx_hash)
-        return tx_hash
+        return self.send_raw_transaction(delegator.sign_diox_transaction(deployed_txn),sync)
+
+    """
+    @description:
+        Deploy contracts to many dapps concurrently. Submissions run on the
+        client's ContractDeployer; every deployment is followed through the
+        shared TxnTracker and HeadTracker until the head passes its
+        core.contracts Scheduled TargetHeight. Nothing is printed.
+    @params:
+        deployments: iterable of (dapp_name, delegator, contracts), where
+            contracts maps absolute path -> constructor args as in deploy_contracts
+        compile_time: max compile time (optional)
+        timeout: seconds per deployment, None waits forever
+    @response -- list[concurrent.futures.Future]
+        One future per deployment, in order, resolved with its deploy
+        transaction hash or failed with DioxError.
+    """
+    def deploy_contracts_async(self,deployments,compile_time=None,timeout=DEFAULT_TIMEOUT):
+        batch = [(dapp_name,delegator,self.contracts_deploy_args(contracts,compile_time))
+                 for dapp_name,delegator,contracts in deployments]
+        deployer = self.deployer
+        return [deployer.submit(dapp_name,delegator,deploy_args,timeout) for dapp_name,delegator,deploy_args in batch]
+
+    """
+    @description:
+        Block until chain head reaches height. All waiters share the client's
+        HeadTracker, so RPC load does not grow with the number of waiters.
+    @params:
+        height: target block height
+        timeout: seconds to wait, None waits forever
+    @response -- bool
+        False on timeout.
+    """
+    def wait_until_height(self,height,timeout=DEFAULT_TIMEOUT):
+        return self.head_tracker.wait_until_height(height,timeout)
 
+    """
+    @description:
+        Track a transaction and its relays through the client's shared
+        TxnTracker, which is fed by the confirm/finalize subscriptions and
+        polls only for hashes the stream missed.
+    @params:
+        tx_hash: transaction hash (an optional ":shard" suffix is accepted)
+        until: "confirmed" or "finalized"
+        expiry: optional expiry in ms (transaction.txn_expiry of the sent
+            bytes); the future then resolves with TXN_EXPIRED as soon as a
+            finalized block is later than it, instead of waiting for a timeout
+    @response -- concurrent.futures.Future
+        Resolves with the root ConfirmState name once the whole relay tree
+        reaches until, or with TXN_EXPIRED/TXN_ABORTED/TXN_RELAY_INVALIDED
+        as soon as any transaction in it fails.
+    """
+    def track_transaction(self,tx_hash,until="confirmed",expiry=None):
+        return self.txn_tracker.track(tx_hash,until,expiry)
+
+    """
+    @description:
+        Look up when a deployment is applied, from core.contracts Scheduled.
+    @params:
+        deploy_hash: deploy transaction hash
+    @response -- int
+        TargetHeight, or -1 when the deployment is not scheduled.
+    """
     @exception_handler
-    def wait_for_deploy(self,deploy_hash):
+    def get_deploy_target_height(self,deploy_hash):
         state = self.get_contract_state("core","contracts",Scope.Global,None).State
-        target_height = -1
+        key = self._normalize_relay_hash(deploy_hash)
         if state is not None and state != {}:
             for s in state.Scheduled:
-                if s.BuildKey == deploy_hash:
-                    target_height = s.TargetHeight
-                    break
-        base = cur_height = self.get_block_number()
+                if s.BuildKey == deploy_hash or s.BuildKey == key:
+                    return s.TargetHeight
+        return -1
+
+    @exception_handler
+    def wait_for_deploy(self,deploy_hash):
+        target_height = self.get_deploy_target_height(deploy_hash)
+        tracker = self.head_tracker
+        if tracker.height < 0:
+            tracker.update(self.get_block_number())
+        base = cur_height = tracker.height
         while cur_height <= target_height:
             progress_bar(cur_height-base,target_height-base,title="Deploy Process: ")
-            cur_height = self.get_block_number()
-            time.sleep(0.5)
+            tracker.wait_until_height(cur_height+1,DEFAULT_TIMEOUT)
+            cur_height = tracker.height
         print("\nDeploy finish.")
 
     """
@@ -643,30 +915,150 @@ class DioxClient:
         Get dapp info.
     @params:
         dapp_name: dapp name
+        use_cache: return cached info if present; None (default) only for dapps warm_up prefetched
     @response -- object
         DappID
     """
     @exception_handler
-    def get_dapp_info(self,dapp_name):
+    def get_dapp_info(self,dapp_name,use_cache=None):
+        cached = self._cached(use_cache,MetadataCache.DAPP,dapp_name)
+        if cached is not None:
+            return cached
         method = "dx.dapp"
         params = {"name":"{}".format(dapp_name)}
         response = self.make_request(method,params)
-        return Box(response,default_box=True)
+        info = Box(response,default_box=True)
+        self.metadata_cache.put(MetadataCache.DAPP,dapp_name,info)
+        return info
 
     """
     @description:
         Get token info.
     @params:
         token_symbol: token symbol (uppercase)
+        use_cache: return cached info if present; None (default) only for tokens warm_up prefetched
     @response -- object
         TokenId
     """
     @exception_handler
-    def get_token_info(self,token_symbol):
+    def get_token_info(self,token_symbol,use_cache=None):
+        cached = self._cached(use_cache,MetadataCache.TOKEN,token_symbol)
+        if cached is not None:
+            return cached
         method = "dx.token"
         params = {"symbol":"{}".format(token_symbol)}
         response = self.make_request(method,params)
-        return Box(response,default_box=True)
+        info = Box(response,default_box=True)
+        self.metadata_cache.put(MetadataCache.TOKEN,token_symbol,info)
+        return info
+
+    """
+    @description:
+        Token id of a symbol. Ids are resolved through get_token_info once
+        and kept for the lifetime of the client, as token ids never change.
+    @params:
+        token: token symbol, or a token id (returned as is)
+    @response -- int
+        Token id.
+    """
+    def get_token_id(self,token):
+        if isinstance(token,int):
+            return token
+        token_id = self._token_ids.get(token,None)
+        if token_id is None:
+            value = self.get_token_info(token,use_cache=True).get("TokenId",None)
+            if value is None or value == {}:
+                raise DioxError(-10009, "unknown token: {}".format(token))
+            try:
+                token_id = int(value)
+            except (TypeError,ValueError):
+                raise DioxError(-10009, "token {} has no numeric id: {}".format(token,value))
+            self._token_ids[token] = token_id
+        return token_id
+
+    """
+    @description:
+        Resolve token attachments to (token id, amount) pairs.
+    @params:
+        tokens: [{symbol: amount}, ...], [(symbol, amount), ...] or {symbol: amount}
+    @response -- list
+        [(token_id, amount), ...] in order.
+    """
+    def token_attachments(self,tokens):
+        if isinstance(tokens,dict):
+            pairs = list(tokens.items())
+        else:
+            pairs = []
+            for token in tokens:
+                pairs.extend(token.items() if isinstance(token,dict) else [tuple(token)])
+        return [(self.get_token_id(symbol),int(amount)) for symbol,amount in pairs]
+
+    """
+    @description:
+        Prefetch metadata a service knows it will use, concurrently, so the
+        first request runs against warm caches. The getters then serve the
+        prefetched entries from the cache by default (use_cache=None).
+    @params:
+        manifest: dict with optional keys
+            contracts: list of "dapp.contract" names (their dapps are fetched too)
+            dapps: list of dapp names
+            tokens: list of token symbols
+            shards: list of (scope, scope_key) pairs
+        workers: concurrent requests (default Config.default_thread_nums)
+    @response -- object
+        Elapsed: seconds taken
+        Loaded: {"contracts": n, "dapps": n, "tokens": n, "shards": n}
+        Failed: {(kind, item): error message}, kind as in Loaded; failures are not printed
+    """
+    @exception_handler
+    def warm_up(self,manifest:dict,workers=None):
+        stat = StatTool.begin()
+        contracts = list(manifest.get("contracts",[]))
+        dapps = list(manifest.get("dapps",[]))
+        for name in contracts:
+            dapp_name = name.split(".")[0]
+            if dapp_name not in dapps:
+                dapps.append(dapp_name)
+        jobs = []
+        for name in contracts:
+            parts = name.split(".")
+            if len(parts) != 2:
+                raise DioxError(-10003, f"Invalid contract name: {name}, expected 'dapp.contract'")
+            jobs.append(("contracts",name,self.get_contract_info,(parts[0],parts[1]),(MetadataCache.CONTRACT,name)))
+        for name in dapps:
+            jobs.append(("dapps",name,self.get_dapp_info,(name,),(MetadataCache.DAPP,name)))
+        for symbol in manifest.get("tokens",[]):
+            jobs.append(("tokens",symbol,self.get_token_info,(symbol,),(MetadataCache.TOKEN,symbol)))
+        for scope,scope_key in manifest.get("shards",[]):
+            jobs.append(("shards","{}:{}".format(scope,scope_key),self.get_shard_index,(scope,scope_key),
+                         (MetadataCache.SHARD,(scope,scope_key))))
+
+        def fetch(fn,args):
+            # quiet_exceptions is per thread, so it is entered in the worker
+            with quiet_exceptions():
+                return fn(*args,use_cache=False)
+
+        loaded = {"contracts":0,"dapps":0,"tokens":0,"shards":0}
+        failed = {}
+        with ThreadPoolExecutor(max_workers=workers or Config.default_thread_nums) as executor:
+            futures = [(kind,name,entry,executor.submit(fetch,fn,args)) for kind,name,fn,args,entry in jobs]
+            for kind,name,entry,future in futures:
+                try:
+                    future.result()
+                    loaded[kind] += 1
+                    self._warmed.add(entry)
+                except Exception as e:
+                    # a dapp and a token may share a name
+                    failed[(kind,name)] = str(e)
+        stat.done()
+        stat.info("warm_up:loaded {},failed {}".format(loaded,len(failed)))
+        return Box({"Elapsed":stat.timeused,"Loaded":loaded,"Failed":failed})
+
+    def _cached(self,use_cache,namespace,key):
+        # use_cache=None: the cache is read only for entries warm_up prefetched
+        if use_cache is None:
+            use_cache = (namespace,key) in self._warmed
+        return self.metadata_cache.get(namespace,key) if use_cache else None
 
 
     """
@@ -679,14 +1071,22 @@ class DioxClient:
     """
     @exception_handler
     def get_events_by_transaction(self,txhash):
-        tx = self.get_transaction(txhash)
-        ret = []
-        relays = self.get_all_relay_transactions(tx,detail=True)
-        for relay in relays:
-            print(relay)
-            if relay.get("Mode","").find("TMF_EXTERNAL") != -1:
-                ret.append(relay)
-        return ret
+        return self.get_relay_tree(txhash).events
+
+    """
+    @description:
+        Fetch a transaction and every relay it emitted. Each level of the
+        relay graph is fetched concurrently and every hash exactly once.
+    @params:
+        tx_hash: root transaction hash
+        workers: concurrent dx.transaction requests per level
+    @response -- RelayTree
+        transactions: {hash: tx} in BFS order, statuses, invocations, events,
+        relay_hashes, is_confirmed(), is_finalized(), is_success(), find(function)
+    """
+    @exception_handler
+    def get_relay_tree(self,tx_hash,workers=None):
+        return RelayTree.fetch(self,tx_hash,workers)
 
     #if overflow tcp buffer, consider use message queue
     @exception_handler
@@ -761,21 +1161,83 @@ class DioxClient:
         else:
             compose_sender = sender_addr
         
-        unsigned_txn = self.compose_transaction(sender=compose_sender,
-                                          function=function,
-                                          args=args,
-                                          tokens=tokens,
-                                          isn=isn,
-                                          is_delegatee=is_delegatee,
-                                          gas_price=gas_price,
-                                          gas_limit=gas_limit
-                                        )
+        # only core functions have a local composer; everything else is composed by the node
+        compose = self.core_composer.compose if self.core_composer.supports(function) else self.compose_transaction
+        unsigned_txn = compose(sender=compose_sender,
+                               function=function,
+                               args=args,
+                               tokens=tokens,
+                               isn=isn,
+                               is_delegatee=is_delegatee,
+                               gas_price=gas_price,
+                               gas_limit=gas_limit
+                             )
         signed_txn = user.sign_diox_transaction(unsigned_txn)
         if signed_txn is None:
             raise DioxError(-10006, "failed to sign transaction")
 
         return self.send_raw_transaction(signed_txn,is_sync,timeout)
 
+    """
+    @description:
+        Submit a stream of transactions through a staged pipeline: compose,
+        sign, PoW and send run concurrently, connected by bounded queues.
+        ISNs are allocated locally per sender, seeded once from dx.isn.
+    @params:
+        calls: iterable of dicts with keys user, function, args and optional
+            isn, delegatee, gas_price, gas_limit, ttl, tokens
+        compose_workers / sign_workers: threads per stage
+        pow_workers: processes solving PoW (1 solves in a thread)
+        send_concurrency: tx.send requests in flight
+        queue_size: capacity of each inter-stage queue
+        gap_monitor: IsnGapMonitor (e.g. client.isn_gap_monitor) that
+            resubmits or fills allocated ISNs whose transaction failed or
+            expired, so later ISNs of the sender do not wait for a timeout
+        rate_controller: AimdRateController (e.g. client.rate_controller())
+            pacing tx.send at the highest rate the node sustains
+    @response -- generator
+        (call, tx_hash) or (call, exception), in completion order.
+    """
+    def submit_stream(self,calls,**pipeline_options):
+        from .pipeline import SubmissionPipeline
+        return SubmissionPipeline(self,**pipeline_options).run(calls)
+
+    """
+    @description:
+        Start an AIMD send-rate controller for submit_stream /
+        submission_scheduler. It follows the MEMPOOL subscription,
+        dx.overview TxnCount/Throughput and the send error rate.
+    @params:
+        initial_rate: starting tx/s
+        increase: tx/s added per interval while the chain keeps up
+        decrease: factor applied on congestion
+        **options: min_rate, max_rate, interval, overview_interval,
+            max_error_rate, min_insert_ratio, use_subscription, use_overview
+    @response -- AimdRateController
+    """
+    def rate_controller(self,initial_rate=50,increase=10,decrease=0.5,**options):
+        from .rate_control import AimdRateController
+        return AimdRateController(self,initial_rate=initial_rate,increase=increase,decrease=decrease,**options).start()
+
+    """
+    @description:
+        Start a priority submission scheduler. Each submitted call carries a
+        priority class that picks its gas price tier (Config.gas_price_tiers),
+        and calls enter the submission pipeline in weighted fair queuing
+        order (Config.priority_weights).
+    @params:
+        gas_price_tiers: {class: gas_price}, defaults to Config.gas_price_tiers
+        weights: {class: weight}, defaults to Config.priority_weights
+        default_priority: class of calls submitted without one
+        **pipeline_options: as submit_stream
+    @response -- SubmissionScheduler
+        submit(call, priority) returns a Future of the tx hash; stats()
+        reports per-class queueing delay.
+    """
+    def submission_scheduler(self,gas_price_tiers=None,weights=None,**options):
+        from .scheduler import SubmissionScheduler
+        return SubmissionScheduler(self,gas_price_tiers=gas_price_tiers,weights=weights,**options).start()
+
     @exception_handler
     def send_transaction_with_sk(self, private_key: str, function: str, args: dict, sync=False, timeout=DEFAULT_TIMEOUT):
         method = "tx.send_withSK"
@@ -921,73 +1383,46 @@ class DioxClient:
         return relay_hash
 
     def is_tx_confirmed_with_relays(self,tx):
-        q = queue.Queue()
-        q.put(tx.Hash)
-        while not q.empty():
-            cur_tx = self.get_transaction(q.get())
-            if not self.is_tx_confirmed(cur_tx):
-                return False
-            for relay_tx_hash in cur_tx.Invocation.get("Relays",[]):
-                q.put(self._normalize_relay_hash(relay_tx_hash))
-        return True
+        return self.get_relay_tree(tx.Hash).is_confirmed()
 
     def is_tx_success_with_relays(self,tx):
-        q = queue.Queue()
-        q.put(tx.Hash)
-        while not q.empty():
-            cur_tx = self.get_transaction(q.get())
-            if not self.is_tx_success(cur_tx):
-                return False
-            for relay_tx_hash in cur_tx.Invocation.get("Relays",[]):
-                q.put(self._normalize_relay_hash(relay_tx_hash))
-        return True
+        return self.get_relay_tree(tx.Hash).is_success()
 
     def get_all_relay_transactions(self,tx,detail=False):
-        res = []
-        if self.is_tx_confirmed_with_relays(tx):
-            q = queue.Queue()
-            q.put(tx)
-            while not q.empty():
-                for h in q.get().Invocation.get("Relays",[]):
-                    normalized_h = self._normalize_relay_hash(h)
-                    res.append(self.get_transaction(normalized_h) if detail is True else h)
-                    q.put(self.get_transaction(normalized_h))
-            return res
-        else:
+        tree = self.get_relay_tree(tx.Hash)
+        if not tree.is_confirmed():
             return None
+        return tree.relays if detail is True else tree.relay_hashes
 
-    def wait_for_transaction_confirmed(self,tx_hash,timeout):
+    def wait_for_relay_tree(self,tx_hash,timeout,poll_interval=1):
+        # confirmed transactions are remembered between polls; only the
+        # pending frontier of the relay tree is fetched again
         start = time.time()
-        tx = self.get_transaction(tx_hash)
-        while not self.is_tx_confirmed_with_relays(tx):
+        tree = self.get_relay_tree(tx_hash)
+        while not tree.is_confirmed():
             if time.time() - start > timeout:
-                return False
-            time.sleep(1)
-        return True
+                return None
+            time.sleep(poll_interval)
+            tree.refresh(self)
+        return tree
 
-    def wait_for_dapp_deployed(self,tx_hash,timeout):
-        if not self.wait_for_transaction_confirmed(tx_hash,timeout):
-            return False
-        tx = self.get_transaction(tx_hash)
-        if not self.is_tx_success_with_relays(tx):
+    def wait_for_transaction_confirmed(self,tx_hash,timeout,expiry=None):
+        # through the shared TxnTracker: a failed or expired transaction returns False without waiting out timeout
+        try:
+            state = self.txn_tracker.track(tx_hash,expiry=expiry).result(timeout)
+        except (FutureTimeoutError,CancelledError):
             return False
-        relays = self.get_all_relay_transactions(tx,detail=True)
-        for relay in relays:
-            if relay.Function == 'core.coin.address.deposit':
-                return False
-        return True
+        return state in dioxtypes.TXN_CONFIRMED_STATUS
+
+    def _is_deployed(self,tree):
+        # a refund deposit relay means the creation was rolled back
+        return tree is not None and tree.is_success() and not tree.find('core.coin.address.deposit')
+
+    def wait_for_dapp_deployed(self,tx_hash,timeout):
+        return self._is_deployed(self.wait_for_relay_tree(tx_hash,timeout))
 
     def wait_for_token_deployed(self,tx_hash,timeout):
-        if not self.wait_for_transaction_confirmed(tx_hash,timeout):
-            return False
-        tx = self.get_transaction(tx_hash)
-        if not self.is_tx_success_with_relays(tx):
-            return False
-        relays = self.get_all_relay_transactions(tx,detail=True)
-        for relay in relays:
-            if relay.Function == 'core.coin.address.deposit':
-                return False
-        return True
+        return self._is_deployed(self.wait_for_relay_tree(tx_hash,timeout))
 
     """
     @description:
@@ -1048,7 +1483,7 @@ class DioxClient:
 
         # Get contract info to find function signature
         try:
-            contract_info = self.get_contract_info(dapp_name, contract_name)
+            contract_info = self.get_contract_info(dapp_name, contract_name, use_cache=True)
         except Exception as e:
             # If contract info cannot be retrieved, return empty dict
             self.logger.warning(f"Cannot get contract info for {dapp_name}.{contract_name}: {e}")
@@ -0,0 +1,149 @@
+"""
+  head_tracker keeps one view of the chain head per DioxClient.
+  It is fed by the CONSENSUS_HEADER subscription and falls back to
+  polling dx.committed_head_height when the stream goes quiet, so any
+  number of waiters share a single source of head updates.
+"""
+import threading
+import time
+
+from . import types as dioxtypes
+from . import clientlogger
+from .subscription import SubscriptionThread
+
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_STALE_AFTER = 2.0
+
+
+class HeadTracker:
+    """Shared chain head height/hash tracker.
+
+    Waiters block on ``wait_until_height`` instead of polling the node on
+    their own; the tracker polls at most once per ``poll_interval`` and only
+    while someone is waiting and the subscription has not pushed a header
+    for ``stale_after`` seconds.
+    """
+
+    logger = clientlogger.client_logger
+
+    def __init__(self, client, poll_interval=DEFAULT_POLL_INTERVAL, stale_after=DEFAULT_STALE_AFTER, use_subscription=True):
+        self.client = client
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.use_subscription = use_subscription
+        self.height = -1
+        self.hash = None
+        self.timestamp = None
+        self._cond = threading.Condition()
+        self._waiters = 0
+        self._listeners = []
+        self._last_push = 0.0
+        self._stop = threading.Event()
+        self._threads = []
+        self._subscription = None
+        self._started = False
+
+    def start(self):
+        with self._cond:
+            if self._started:
+                return self
+            self._started = True
+            self._stop.clear()
+        if self.use_subscription:
+            self._subscription = SubscriptionThread(self.client, dioxtypes.SubscribeTopic.CONSENSUS_HEADER,
+                                                    self._on_header, name="head-tracker-sub").start()
+        self._spawn(self._poll_loop, "head-tracker-poll")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._started = False
+            self._cond.notify_all()
+        if self._subscription is not None:
+            self._subscription.stop()
+            self._subscription = None
+        for t in self._threads:
+            t.join(timeout=1)
+        self._threads = []
+
+    def _spawn(self, target, name):
+        t = threading.Thread(target=target, name=name, daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def add_listener(self, callback):
+        """Register ``callback(height, hash)``, called on every head advance."""
+        with self._cond:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._cond:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def update(self, height, hash=None, timestamp=None, pushed=False):
+        """Publish a head observation; stale or duplicate heights are ignored."""
+        height = int(height)
+        with self._cond:
+            if pushed:
+                self._last_push = time.time()
+            if height <= self.height:
+                return False
+            self.height = height
+            self.hash = hash
+            if timestamp is not None:
+                self.timestamp = timestamp
+            listeners = list(self._listeners)
+            self._cond.notify_all()
+        for cb in listeners:
+            try:
+                cb(height, hash)
+            except Exception as e:
+                self.logger.error("head tracker listener error: {}".format(e))
+        return True
+
+    def wait_until_height(self, height, timeout=None):
+        """Block until the head reaches ``height``. Returns False on timeout."""
+        if not self._started:
+            self.start()
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            self._waiters += 1
+            self._cond.notify_all()
+            try:
+                while self.height < height:
+                    if self._stop.is_set():
+                        return False
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._waiters -= 1
+
+    def _on_header(self, msg):
+        if not isinstance(msg, dict) or msg.get("Height", None) is None:
+            return
+        self.update(msg["Height"], msg.get("Hash", None), msg.get("Timestamp", None), pushed=True)
+
+    def _needs_poll(self):
+        if self._waiters == 0 and self.height >= 0:
+            return False
+        if not self.use_subscription:
+            return True
+        return time.time() - self._last_push > self.stale_after
+
+    def _poll_loop(self):
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._stop.is_set() and not self._needs_poll():
+                    self._cond.wait(self.poll_interval)
+            if self._stop.is_set():
+                return
+            try:
+                self.update(self.client.get_block_number())
+            except Exception as e:
+                self.logger.error("head tracker poll failed: {}".format(e))
+            self._stop.wait(self.poll_interval)
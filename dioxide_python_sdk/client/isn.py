@@ -0,0 +1,316 @@
+"""
+  isn allocates transaction ISNs locally so one address can have many
+  transactions in flight without a dx.isn round trip per transaction.
+  IsnGapMonitor watches those allocations against dx.isn and repairs an
+  ISN once its transaction is known to have failed or expired.
+"""
+import threading
+
+from . import clientlogger
+from .txn_tracker import FAILED_STATUS
+
+
+class IsnAllocator:
+    """Hands out consecutive ISNs per address, seeded once from dx.isn.
+
+    An ISN whose transaction never reached the node can be given back with
+    ``release``; it is handed out again before any new ISN so the address
+    does not end up with a hole that blocks every later transaction.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._next = {}
+        self._free = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _address_lock(self, address):
+        with self._lock:
+            lock = self._locks.get(address)
+            if lock is None:
+                lock = self._locks[address] = threading.Lock()
+            return lock
+
+    def allocate(self, address):
+        with self._address_lock(address):
+            free = self._free.get(address)
+            if free:
+                isn = min(free)
+                free.discard(isn)
+                return isn
+            isn = self._next.get(address)
+            if isn is None:
+                isn = self.client.get_isn(address)
+            self._next[address] = isn + 1
+            return isn
+
+    def release(self, address, isn):
+        """Give back an allocated ``isn`` that was never sent."""
+        with self._address_lock(address):
+            next_isn = self._next.get(address)
+            if next_isn is None or isn >= next_isn:
+                return
+            free = self._free.setdefault(address, set())
+            free.add(isn)
+            # released ISNs at the top just move the counter back
+            while next_isn - 1 in free:
+                next_isn -= 1
+                free.discard(next_isn)
+            self._next[address] = next_isn
+            if not free:
+                del self._free[address]
+
+    def released(self, address):
+        """Take the released ISNs of ``address`` that are still holes below the next ISN."""
+        with self._address_lock(address):
+            return sorted(self._free.pop(address, ()))
+
+    def peek(self, address):
+        """Next ISN that would be allocated, or None if the address was never seeded."""
+        with self._address_lock(address):
+            return self._next.get(address)
+
+    def reset(self, address, isn=None):
+        """Re-seed an address: from ``isn`` if given, otherwise from dx.isn on next allocate."""
+        with self._address_lock(address):
+            self._free.pop(address, None)
+            if isn is None:
+                self._next.pop(address, None)
+            else:
+                self._next[address] = isn
+
+
+DEFAULT_CHECK_INTERVAL = 1.0
+DEFAULT_MAX_RESUBMITS = 2
+
+ALLOCATED = "allocated"
+SENT = "sent"
+FAILED = "failed"
+
+
+def isn_of(txn):
+    """ISN of an unsigned or signed transaction."""
+    return int.from_bytes(txn[8:12], "little")
+
+
+def transfer_noop(address):
+    """Default gap filler: a zero DIO transfer to the sender itself."""
+    return "core.wallet.transfer", {"To": address, "Amount": "0", "TokenId": "DIO"}
+
+
+class _Slot:
+    __slots__ = ("isn", "call", "state", "attempts", "tx_hash", "replaced")
+
+    def __init__(self, isn, call):
+        self.isn = isn
+        self.call = call
+        self.state = ALLOCATED
+        self.attempts = 0
+        self.tx_hash = None
+        # hashes this slot was sent under before the current one
+        self.replaced = []
+
+
+class IsnGapMonitor:
+    """Detects and repairs ISN gaps for addresses with transactions in flight.
+
+    Every locally allocated ISN is recorded with the call it was allocated
+    for. A slot is repaired only once it is known to have failed: its
+    compose/sign/PoW/send raised, or the TxnTracker reported it
+    TXN_EXPIRED/TXN_ABORTED/TXN_RELAY_INVALIDED (expiry is checked against
+    finalized block time). Slow transactions are left alone. A repair
+    re-signs and resubmits the original call, every field kept, with the
+    same ISN up to ``max_resubmits`` times, then fills the ISN with
+    ``noop(address)`` so the later ISNs can proceed. Each repair is reported
+    to the listeners as (address, isn, old hash, new hash), and
+    ``replacement_of`` maps a hash the caller was given to the current one.
+    """
+
+    logger = clientlogger.client_logger
+
+    def __init__(self, client, check_interval=DEFAULT_CHECK_INTERVAL, max_resubmits=DEFAULT_MAX_RESUBMITS,
+                 noop=transfer_noop, use_tracker=True):
+        self.client = client
+        self.check_interval = check_interval
+        self.max_resubmits = max_resubmits
+        self.noop = noop
+        self.use_tracker = use_tracker
+        self.resubmitted = 0
+        self.filled = 0
+        self._slots = {}
+        self._users = {}
+        self._replaced_by = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._check_loop, name="isn-gap-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(slots) for slots in self._slots.values())
+
+    def add_listener(self, callback):
+        """Call ``callback(address, isn, old_hash, new_hash)`` after every repair; old_hash is None if never sent."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def replacement_of(self, tx_hash):
+        """The hash now carrying the ISN of ``tx_hash`` (``tx_hash`` itself when it was not replaced)."""
+        with self._lock:
+            while tx_hash in self._replaced_by:
+                tx_hash = self._replaced_by[tx_hash]
+            return tx_hash
+
+    # recording ---------------------------------------------------------------
+    def allocated(self, user, isn, call=None):
+        """Record ``isn`` as allocated to ``call`` for ``user``'s address."""
+        with self._lock:
+            self._users[user.address] = user
+            self._slots.setdefault(user.address, {})[isn] = _Slot(isn, call)
+
+    def sent(self, address, isn, tx_hash, expiry=None):
+        with self._lock:
+            slot = self._slots.get(address, {}).get(isn)
+            if slot is None:
+                return
+            slot.state = SENT
+            slot.tx_hash = tx_hash
+        if self.use_tracker and tx_hash:
+            self.client.txn_tracker.track(tx_hash, expiry=expiry).add_done_callback(
+                lambda f: self._on_result(address, isn, tx_hash, f))
+
+    def failed(self, address, isn, error=None):
+        with self._lock:
+            slot = self._slots.get(address, {}).get(isn)
+            if slot is None:
+                return
+            slot.state = FAILED
+        self.logger.warning("isn {} of {} failed: {}".format(isn, address, error))
+        self._wake.set()
+
+    def _on_result(self, address, isn, tx_hash, future):
+        if future.cancelled():
+            return
+        result = future.result()
+        with self._lock:
+            slot = self._slots.get(address, {}).get(isn)
+            if slot is None or slot.tx_hash != tx_hash:
+                return
+            if result not in FAILED_STATUS:
+                # confirmed: dx.isn has moved past it
+                self._forget(address, isn)
+                return
+        self.failed(address, isn, result)
+
+    def _forget(self, address, isn):
+        # under self._lock
+        slot = self._slots[address].pop(isn)
+        for old in slot.replaced:
+            self._replaced_by.pop(old, None)
+
+    # detection ---------------------------------------------------------------
+    def gaps(self, address):
+        """ISNs of ``address`` that are known to have failed and must be repaired."""
+        chain_isn = self.client.get_isn(address)
+        with self._lock:
+            slots = self._slots.get(address, {})
+            for isn in [isn for isn in slots if isn < chain_isn]:
+                self._forget(address, isn)
+            if not slots:
+                self._slots.pop(address, None)
+                return []
+            return sorted(isn for isn, slot in slots.items() if slot.state == FAILED)
+
+    def check_once(self):
+        """Check every address with ISNs in flight and repair its gaps; returns how many were repaired."""
+        with self._lock:
+            addresses = list(self._slots)
+        repaired = 0
+        for address in addresses:
+            try:
+                isns = self.gaps(address)
+            except Exception as e:
+                self.logger.error("isn gap check of {} failed: {}".format(address, e))
+                continue
+            for isn in isns:
+                if self.repair(address, isn):
+                    repaired += 1
+        return repaired
+
+    def _check_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.check_once()
+            except Exception as e:
+                self.logger.error("isn gap monitor failed: {}".format(e))
+            self._wake.wait(self.check_interval)
+            self._wake.clear()
+
+    # repair ------------------------------------------------------------------
+    def repair(self, address, isn):
+        """Resubmit the call that owns ``isn`` or, once that keeps failing, fill it with a no-op."""
+        from .pipeline import SubmissionPipeline
+        from .transaction import txn_expiry
+
+        with self._lock:
+            user = self._users.get(address)
+            slot = self._slots.setdefault(address, {}).get(isn)
+            if user is None or slot is None:
+                return False
+            slot.attempts += 1
+            resubmit = slot.call is not None and slot.attempts <= self.max_resubmits
+            old_hash = slot.tx_hash
+            slot.state = ALLOCATED
+        if resubmit:
+            # every field of the original call (ttl, tokens, gas, ...) with the same ISN
+            call = dict(slot.call, isn=isn)
+            call.setdefault("user", user)
+        else:
+            function, args = self.noop(address)
+            call = {"user": user, "function": function, "args": args, "isn": isn}
+        pipeline = SubmissionPipeline(self.client)
+        try:
+            signed = pipeline.pow(call, pipeline.sign(call, pipeline.compose(call)))
+            tx_hash = pipeline.send(call, signed)
+        except Exception as e:
+            # retried on the next check, not straight away
+            with self._lock:
+                slot.state = FAILED
+            self.logger.warning("isn {} of {} repair failed: {}".format(isn, address, e))
+            return False
+        if resubmit:
+            self.resubmitted += 1
+        else:
+            self.filled += 1
+        self.logger.info("isn {} of {} {}: {} replaces {}".format(isn, address, "resubmitted" if resubmit else "filled",
+                                                                  tx_hash, old_hash))
+        with self._lock:
+            if old_hash is not None:
+                slot.replaced.append(old_hash)
+                self._replaced_by[old_hash] = tx_hash
+            listeners = list(self._listeners)
+        self.sent(address, isn, tx_hash, txn_expiry(signed))
+        for callback in listeners:
+            try:
+                callback(address, isn, old_hash, tx_hash)
+            except Exception as e:
+                self.logger.error("isn repair listener failed: {}".format(e))
+        return True
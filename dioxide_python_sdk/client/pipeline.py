@@ -0,0 +1,241 @@
+"""
+  pipeline runs transaction submission as concurrent stages:
+
+    compose -> sign -> pow -> send
+
+  Stages are connected by bounded queues so a slow stage pushes back on
+  the ones before it, and results are yielded as soon as each transaction
+  is sent. Throughput is bounded by the slowest stage instead of the sum
+  of all of them. Transactions that would expire before they can land are
+  dropped ahead of PoW and send. Without an IsnGapMonitor, the ISN of a
+  transaction that failed before reaching the node is given back to the
+  allocator, and any such ISN still unused when the stream ends is filled
+  with a no-op.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import clientlogger
+from .isn import isn_of, transfer_noop
+from .dioxclient import DioxError
+from .transaction import txn_expiry
+from ..config.client_config import Config
+from ..utils.gadget import get_txn_pow_difficulty, append_txn_pow
+from ..utils.pow import POW_NONCE_COUNT, pow_data_of, _solve_job
+
+_DONE = object()
+_POLL = 0.1
+
+
+class SubmissionPipeline:
+    logger = clientlogger.client_logger
+
+    def __init__(self, client, compose_workers=2, sign_workers=2, pow_workers=None, send_concurrency=16,
+                 queue_size=256, pow_executor=None, gap_monitor=None, rate_controller=None, noop=transfer_noop):
+        self.client = client
+        self.compose_workers = compose_workers
+        self.sign_workers = sign_workers
+        self.pow_workers = pow_workers or 1
+        self.send_concurrency = send_concurrency
+        self.queue_size = queue_size
+        self._pow_executor = pow_executor
+        self._owns_executor = pow_executor is None and self.pow_workers > 1
+        self.gap_monitor = gap_monitor
+        self.rate_controller = rate_controller
+        self.noop = noop
+        self.filled = 0
+        self._released = {}
+        self._released_lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    # stage functions ---------------------------------------------------------
+    def compose(self, call):
+        user = call["user"]
+        delegatee = call.get("delegatee", None)
+        isn = call.get("isn", None)
+        if isn is None and delegatee is None:
+            isn = self.client.isn_allocator.allocate(user.address)
+            if self.gap_monitor is not None:
+                self.gap_monitor.allocated(user, isn, call)
+            try:
+                return self._compose(call, user, delegatee, isn)
+            except Exception as e:
+                if self.gap_monitor is not None:
+                    self.gap_monitor.failed(user.address, isn, e)
+                else:
+                    self._release(user, isn)
+                raise
+        return self._compose(call, user, delegatee, isn)
+
+    def _compose(self, call, user, delegatee, isn):
+        kwargs = dict(isn=isn, gas_price=call.get("gas_price", None), gas_limit=call.get("gas_limit", None))
+        if delegatee is not None:
+            sender = delegatee
+            kwargs["is_delegatee"] = True
+        else:
+            sender = user
+        return self.client.compose_transaction_local(sender, call["function"], call["args"], ttl=call.get("ttl", None),
+                                                     tokens=call.get("tokens", None), **kwargs)
+
+    def sign(self, call, unsigned):
+        signed = call["user"].sign_transaction_payload(unsigned)
+        if signed is None:
+            raise ValueError("failed to sign transaction")
+        return signed
+
+    @staticmethod
+    def _check_expiry(txn):
+        # the node rejects it on arrival, or it expires waiting for a block
+        if txn_expiry(txn) <= time.time() * 1000 + Config.txn_inflight_margin * 1000:
+            raise DioxError(-10007, "transaction would expire in flight")
+
+    def pow(self, call, signed):
+        self._check_expiry(signed)
+        job = (pow_data_of(signed), get_txn_pow_difficulty(signed).threshold, POW_NONCE_COUNT)
+        if self._pow_executor is not None:
+            nonces = self._pow_executor.submit(_solve_job, *job).result()
+        else:
+            nonces = _solve_job(*job)
+        return append_txn_pow(signed, nonces)
+
+    def send(self, call, signed):
+        self._check_expiry(signed)
+        if self.rate_controller is None:
+            tx_hash = self.client.send_raw_transaction(signed)
+        else:
+            self.rate_controller.acquire()
+            try:
+                tx_hash = self.client.send_raw_transaction(signed)
+            except Exception:
+                self.rate_controller.on_send(False)
+                raise
+            self.rate_controller.on_send(tx_hash is not None, tx_hash)
+        if self.gap_monitor is not None and self._allocates_isn(call):
+            self.gap_monitor.sent(call["user"].address, isn_of(signed), tx_hash, txn_expiry(signed))
+        return tx_hash
+
+    @staticmethod
+    def _allocates_isn(call):
+        return call.get("isn", None) is None and call.get("delegatee", None) is None
+
+    def _stage_failed(self, name, call, value, error):
+        # compose reports its own failures; later stages carry the ISN in the transaction bytes
+        if name == "compose" or not self._allocates_isn(call):
+            return
+        if self.gap_monitor is not None:
+            self.gap_monitor.failed(call["user"].address, isn_of(value), error)
+        elif name != "send" or isinstance(error, DioxError):
+            # a send that failed on the wire may still have reached the node; keep its ISN
+            self._release(call["user"], isn_of(value))
+
+    def _release(self, user, isn):
+        self.client.isn_allocator.release(user.address, isn)
+        with self._released_lock:
+            self._released[user.address] = user
+
+    def submit_now(self, call):
+        """Run ``call`` through every stage on the calling thread and return its tx hash."""
+        signed = self.sign(call, self.compose(call))
+        return self.send(call, self.pow(call, signed))
+
+    def _fill_released(self):
+        with self._released_lock:
+            users, self._released = self._released, {}
+        for address, user in users.items():
+            for isn in self.client.isn_allocator.released(address):
+                function, args = self.noop(address)
+                try:
+                    tx_hash = self.submit_now({"user": user, "function": function, "args": args, "isn": isn})
+                except Exception as e:
+                    self.logger.error("pipeline isn {} of {} left unfilled: {}".format(isn, address, e))
+                    continue
+                self.filled += 1
+                self.logger.info("pipeline isn {} of {} filled: {}".format(isn, address, tx_hash))
+
+    # plumbing ----------------------------------------------------------------
+    def _put(self, q, item):
+        while not self._cancelled.is_set():
+            try:
+                q.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        while not self._cancelled.is_set():
+            try:
+                return q.get(timeout=_POLL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _start_stage(self, name, fn, in_q, out_q, workers, next_workers, results):
+        remaining = [workers]
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                item = self._get(in_q)
+                if item is _DONE:
+                    break
+                call, value = item
+                try:
+                    value = fn(call, value)
+                except Exception as e:
+                    self.logger.error("pipeline {} failed: {}".format(name, e))
+                    self._stage_failed(name, call, value, e)
+                    results.put((call, e))
+                    continue
+                self._put(out_q, (call, value))
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                for _ in range(next_workers):
+                    self._put(out_q, _DONE)
+
+        threads = [threading.Thread(target=worker, name="pipeline-{}".format(name), daemon=True) for _ in range(workers)]
+        for t in threads:
+            t.start()
+        return threads
+
+    def run(self, calls):
+        """Yield (call, tx_hash | exception) for every call, in completion order."""
+        if self._owns_executor:
+            self._pow_executor = ProcessPoolExecutor(max_workers=self.pow_workers)
+        results = queue.Queue()
+        compose_q = queue.Queue(self.queue_size)
+        sign_q = queue.Queue(self.queue_size)
+        pow_q = queue.Queue(self.queue_size)
+        send_q = queue.Queue(self.queue_size)
+        self._start_stage("compose", lambda c, _: self.compose(c), compose_q, sign_q, self.compose_workers, self.sign_workers, results)
+        self._start_stage("sign", self.sign, sign_q, pow_q, self.sign_workers, self.pow_workers, results)
+        self._start_stage("pow", self.pow, pow_q, send_q, self.pow_workers, self.send_concurrency, results)
+        self._start_stage("send", self.send, send_q, results, self.send_concurrency, 1, results)
+
+        def feed():
+            try:
+                for call in calls:
+                    if not self._put(compose_q, (call, None)):
+                        return
+            except Exception as e:
+                results.put((None, e))
+            for _ in range(self.compose_workers):
+                self._put(compose_q, _DONE)
+
+        threading.Thread(target=feed, name="pipeline-feed", daemon=True).start()
+        try:
+            while True:
+                item = self._get(results)
+                if item is _DONE:
+                    break
+                yield item
+            self._fill_released()
+        finally:
+            self._cancelled.set()
+            if self._owns_executor and self._pow_executor is not None:
+                self._pow_executor.shutdown(cancel_futures=True)
+                self._pow_executor = None
@@ -0,0 +1,232 @@
+"""
+  rate_control paces tx.send with an additive-increase/multiplicative-decrease
+  controller. Every ``interval`` the send rate grows by ``increase`` tx/s
+  while the chain keeps up, and is cut by ``decrease`` on congestion:
+    - the send error rate exceeds ``max_error_rate``;
+    - the MEMPOOL subscription (subscribe.mempool_insert) reports fewer
+      inserts of our own transactions than we sent. A window is judged
+      one interval after it closes, so late inserts still count for it;
+    - dx.overview shows the pending TxnCount growing while its Throughput
+      is below our send rate.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from . import types as dioxtypes
+from . import clientlogger
+from .subscription import SubscriptionThread
+from .txn_tracker import normalize_hash
+
+DEFAULT_INITIAL_RATE = 50.0
+DEFAULT_MIN_RATE = 1.0
+DEFAULT_MAX_RATE = 100000.0
+DEFAULT_INCREASE = 10.0
+DEFAULT_DECREASE = 0.5
+DEFAULT_INTERVAL = 1.0
+DEFAULT_OVERVIEW_INTERVAL = 2.0
+DEFAULT_MAX_ERROR_RATE = 0.05
+DEFAULT_MIN_INSERT_RATIO = 0.8
+# a window that used less than this share of the rate does not earn an increase
+DEFAULT_MIN_UTILIZATION = 0.8
+HISTORY_SIZE = 600
+# sent hashes remembered to recognise our own transactions in MEMPOOL inserts,
+# and inserts remembered until the send that produced them returns
+SENT_HASHES_SIZE = 100000
+
+
+class AimdRateController:
+    """AIMD pacing for tx.send.
+
+    Senders call ``acquire()`` before each send and ``on_send(ok, tx_hash)``
+    after it. ``rate`` settles at the highest send rate the node sustains: it
+    climbs linearly while sends succeed and the mempool and chain keep pace,
+    and halves (by default) as soon as any congestion signal fires.
+    """
+
+    logger = clientlogger.client_logger
+
+    def __init__(self, client=None, initial_rate=DEFAULT_INITIAL_RATE, min_rate=DEFAULT_MIN_RATE,
+                 max_rate=DEFAULT_MAX_RATE, increase=DEFAULT_INCREASE, decrease=DEFAULT_DECREASE,
+                 interval=DEFAULT_INTERVAL, overview_interval=DEFAULT_OVERVIEW_INTERVAL,
+                 max_error_rate=DEFAULT_MAX_ERROR_RATE, min_insert_ratio=DEFAULT_MIN_INSERT_RATIO,
+                 use_subscription=True, use_overview=True):
+        self.client = client
+        self.rate = float(initial_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.interval = interval
+        self.overview_interval = overview_interval
+        self.max_error_rate = max_error_rate
+        self.min_insert_ratio = min_insert_ratio
+        self.use_subscription = use_subscription and client is not None
+        self.use_overview = use_overview and client is not None
+        self.history = []
+        self.last_signal = None
+        self._sent = 0
+        self._errors = 0
+        self._window = 0
+        # window -> [sent, inserts of those sends]
+        self._window_inserts = {}
+        self._sent_hashes = OrderedDict()
+        self._early_inserts = OrderedDict()
+        self._mempool_seen = False
+        self._backlog = None
+        self._backlog_growth = None
+        self._throughput = None
+        self._window_start = time.monotonic()
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._subscription = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._stop.clear()
+            self._window_start = time.monotonic()
+            self._thread = threading.Thread(target=self._control_loop, name="aimd-rate-control", daemon=True)
+            self._thread.start()
+        if self.use_subscription:
+            self._subscription = SubscriptionThread(self.client, dioxtypes.SubscribeTopic.MEMPOOL,
+                                                    self.on_mempool, name="aimd-mempool-sub").start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._subscription is not None:
+            self._subscription.stop()
+            self._subscription = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    # senders -----------------------------------------------------------------
+    def acquire(self):
+        """Block until the current rate allows one more send."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def on_send(self, ok=True, tx_hash=None):
+        with self._lock:
+            self._sent += 1
+            counts = self._window_inserts.setdefault(self._window, [0, 0])
+            counts[0] += 1
+            if not ok:
+                self._errors += 1
+            elif tx_hash:
+                tx_hash = normalize_hash(tx_hash)
+                # the node may report the insert before tx.send returns
+                if self._early_inserts.pop(tx_hash, False) is None:
+                    counts[1] += 1
+                    return
+                self._sent_hashes[tx_hash] = self._window
+                if len(self._sent_hashes) > SENT_HASHES_SIZE:
+                    self._sent_hashes.popitem(last=False)
+
+    # signals -----------------------------------------------------------------
+    @staticmethod
+    def _mempool_hashes(msg):
+        if isinstance(msg, dict):
+            txns = msg.get("Transactions", None)
+            if not isinstance(txns, list):
+                txns = [msg]
+        elif isinstance(msg, list):
+            txns = msg
+        else:
+            txns = [msg]
+        hashes = []
+        for tx in txns:
+            tx_hash = tx.get("Hash", None) if isinstance(tx, dict) else tx
+            if isinstance(tx_hash, str):
+                hashes.append(normalize_hash(tx_hash))
+        return hashes
+
+    def on_mempool(self, msg):
+        """MEMPOOL subscription handler: count inserts of transactions this controller saw sent.
+
+        The subscription reports every insert on the node; only hashes passed
+        to ``on_send`` are comparable with our send count. An insert is
+        counted in the window of its send, also when it arrives before
+        ``on_send`` or after that window closed.
+        """
+        hashes = self._mempool_hashes(msg)
+        with self._lock:
+            self._mempool_seen = True
+            for tx_hash in hashes:
+                window = self._sent_hashes.pop(tx_hash, None)
+                if window is None:
+                    self._early_inserts[tx_hash] = None
+                    if len(self._early_inserts) > SENT_HASHES_SIZE:
+                        self._early_inserts.popitem(last=False)
+                    continue
+                counts = self._window_inserts.get(window, None)
+                if counts is not None:
+                    counts[1] += 1
+
+    def observe_overview(self, overview):
+        """Feed one dx.overview result: TxnCount[0] is the pending backlog, Throughput the chain TPS."""
+        txn_count = overview.get("TxnCount", None)
+        throughput = overview.get("Throughput", None)
+        with self._lock:
+            if isinstance(txn_count, (list, tuple)) and txn_count:
+                backlog = int(txn_count[0])
+                if self._backlog is not None:
+                    self._backlog_growth = backlog - self._backlog
+                self._backlog = backlog
+            if throughput is not None:
+                self._throughput = float(throughput)
+
+    # control -----------------------------------------------------------------
+    def _congestion(self, sent, errors, elapsed, judged):
+        if sent and errors / sent > self.max_error_rate:
+            return "errors"
+        # judged: [sent, inserts] of the previous window, whose inserts had a whole interval to arrive
+        if self._mempool_seen and judged is not None and judged[0] and \
+                judged[1] < judged[0] * self.min_insert_ratio:
+            return "mempool"
+        if self._backlog_growth is not None and self._backlog_growth > 0 and \
+                self._throughput is not None and self._throughput < sent / elapsed:
+            return "backlog"
+        return None
+
+    def adjust(self, now=None):
+        """Close the current window and apply one AIMD step; returns the new rate."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            elapsed = max(now - self._window_start, 1e-9)
+            sent, errors = self._sent, self._errors
+            judged = self._window_inserts.pop(self._window - 1, None)
+            signal = self._congestion(sent, errors, elapsed, judged)
+            if signal is not None:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                # one decrease per backlog report
+                self._backlog_growth = None
+            elif sent >= self.rate * elapsed * DEFAULT_MIN_UTILIZATION:
+                self.rate = min(self.max_rate, self.rate + self.increase * elapsed / self.interval)
+            self.last_signal = signal
+            self.history.append((now, self.rate, sent / elapsed, signal))
+            del self.history[:-HISTORY_SIZE]
+            self._sent = self._errors = 0
+            self._window += 1
+            self._window_start = now
+            return self.rate
+
+    def _control_loop(self):
+        next_overview = 0.0
+        while not self._stop.wait(self.interval):
+            if self.use_overview and time.monotonic() >= next_overview:
+                next_overview = time.monotonic() + self.overview_interval
+                try:
+                    self.observe_overview(self.client.get_overview())
+                except Exception as e:
+                    self.logger.debug("rate control overview failed: {}".format(e))
+            self.adjust()
@@ -0,0 +1,143 @@
+"""
+  relay_tree fetches a transaction together with every relay it emitted.
+  The relay graph is walked breadth first; each level is fetched
+  concurrently and every hash is fetched exactly once, and the result is a
+  RelayTree that the confirmation/success/event helpers all read from.
+  A tree can be refreshed in place: settled transactions are remembered and
+  only the still-pending frontier is fetched again.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from . import types as dioxtypes
+from .txn_tracker import normalize_hash
+from ..config.client_config import Config
+
+SUCCESS_STATUS = "IVKRET_SUCCESS"
+
+
+class RelayTree:
+    """A root transaction and its relays, keyed by normalized hash in BFS order."""
+
+    def __init__(self, root):
+        self.root = normalize_hash(root)
+        self.transactions = {}
+        self.children = {}
+        self.relay_hashes = []
+        self.missing = set()
+        self._seen = set()
+        self._queries = {}
+
+    @classmethod
+    def fetch(cls, client, root_hash, workers=None, executor=None):
+        tree = cls(root_hash)
+        tree.expand(client, [root_hash], workers, executor)
+        return tree
+
+    def expand(self, client, queries, workers=None, executor=None, refetch=False):
+        """Fetch ``queries`` and everything reachable from them, one concurrent level at a time."""
+        owned = None
+        level = [q for q in queries if refetch or normalize_hash(q) not in self.transactions]
+        for q in level:
+            self._seen.add(normalize_hash(q))
+            self._queries.setdefault(normalize_hash(q), q)
+        try:
+            while level:
+                if len(level) > 1 and executor is None:
+                    owned = executor = ThreadPoolExecutor(max_workers=workers or Config.default_thread_nums)
+                if len(level) == 1:
+                    results = [self._get(client, level[0])]
+                else:
+                    results = list(executor.map(lambda q: self._get(client, q), level))
+                next_level = []
+                for query, tx in zip(level, results):
+                    next_level.extend(self.add(query, tx))
+                level = next_level
+        finally:
+            if owned is not None:
+                owned.shutdown()
+        return self
+
+    @staticmethod
+    def _get(client, query):
+        try:
+            return client.get_transaction(query)
+        except Exception:
+            return None
+
+    def add(self, query, tx):
+        """Record one fetched transaction; returns relay hashes not seen before."""
+        key = normalize_hash(query)
+        if tx is None:
+            self.missing.add(key)
+            return []
+        self.missing.discard(key)
+        self.transactions[key] = tx
+        relays = list(_invocation(tx).get("Relays", []) or [])
+        self.children[key] = [normalize_hash(r) for r in relays]
+        new = []
+        for relay in relays:
+            relay_key = normalize_hash(relay)
+            if relay_key in self._seen:
+                continue
+            self._seen.add(relay_key)
+            self._queries[relay_key] = relay
+            self.relay_hashes.append(relay)
+            new.append(relay)
+        return new
+
+    def pending(self, statuses=dioxtypes.TXN_CONFIRMED_STATUS):
+        """Hashes not yet in ``statuses``: the frontier a refresh fetches again."""
+        keys = [key for key, tx in self.transactions.items() if tx.get("ConfirmState", None) not in statuses]
+        return keys + [key for key in self.missing if key not in self.transactions]
+
+    def refresh(self, client, statuses=dioxtypes.TXN_CONFIRMED_STATUS, workers=None, executor=None):
+        """Re-fetch only the pending frontier (and relays it newly emits); settled nodes are kept."""
+        frontier = [self._queries.get(key, key) for key in self.pending(statuses)]
+        return self.expand(client, frontier, workers, executor, refetch=True)
+
+    # views -------------------------------------------------------------------
+    @property
+    def root_transaction(self):
+        return self.transactions.get(self.root, None)
+
+    @property
+    def relays(self):
+        """Relay transactions in BFS order (the root excluded)."""
+        return [tx for key, tx in self.transactions.items() if key != self.root]
+
+    @property
+    def statuses(self):
+        return {key: tx.get("ConfirmState", None) for key, tx in self.transactions.items()}
+
+    @property
+    def invocations(self):
+        return {key: _invocation(tx) for key, tx in self.transactions.items()}
+
+    @property
+    def events(self):
+        """External relays (relay@external) emitted anywhere in the tree."""
+        return [tx for tx in self.relays if tx.get("Mode", "").find("TMF_EXTERNAL") != -1]
+
+    def find(self, function):
+        return [tx for tx in self.relays if tx.get("Function", None) == function]
+
+    def _all(self, predicate):
+        return not self.missing and self.root in self.transactions and \
+            all(predicate(tx) for tx in self.transactions.values())
+
+    def is_confirmed(self):
+        return self._all(lambda tx: tx.get("ConfirmState", None) in dioxtypes.TXN_CONFIRMED_STATUS)
+
+    def is_finalized(self):
+        return self._all(lambda tx: tx.get("ConfirmState", None) in dioxtypes.TXN_FINALIZED_STATUS)
+
+    def is_success(self):
+        return self._all(lambda tx: _invocation(tx).get("Status", None) == SUCCESS_STATUS)
+
+    def __len__(self):
+        return len(self.transactions)
+
+
+def _invocation(tx):
+    invocation = tx.get("Invocation", None)
+    return invocation if isinstance(invocation, dict) else {}
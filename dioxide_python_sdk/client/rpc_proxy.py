@@ -0,0 +1,221 @@
+"""
+  rpc_proxy is a local caching proxy for a fleet of SDK processes on one host.
+  It accepts the node's /api JSON requests, serves immutable and short-TTL
+  reads from one shared cache, coalesces concurrent identical misses into a
+  single upstream request and forwards everything else (tx.send, ...) as is.
+
+  usage:
+    python -m dioxide_python_sdk.client.rpc_proxy --upstream http://node:62222/api --port 62223
+  then point clients at it:
+    DioxClient(url="http://127.0.0.1:62223/api")
+"""
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from . import clientlogger
+from . import types as dioxtypes
+from .dioxclient import DioxClient
+from ..config.client_config import Config
+
+IMMUTABLE = None
+# blocks by hash and finalized transactions no longer change their content,
+# but their State/ConfirmState still moves on (e.g. to TXN_ARCHIVED)
+SETTLED_TTL = 10.0
+
+# method -> ttl seconds (IMMUTABLE never expires). Methods not listed are
+# forwarded uncached; dx.isn and tx.* must always reach the node.
+DEFAULT_CACHE_POLICY = {
+    "dx.dapp": IMMUTABLE,
+    "dx.token": IMMUTABLE,
+    "dx.overview": 1.0,
+    "dx.committed_head_height": 0.5,
+    "dx.contract_info": 5.0,
+    "dx.source_code": 5.0,
+    "dx.contract_state": 0.5,
+    "dx.shard_index": 60.0,
+    "dx.consensus_header": 1.0,
+    "dx.transaction_block": 1.0,
+    "dx.transaction": 0.5,
+}
+
+
+def response_ttl(method, params, response, policy=DEFAULT_CACHE_POLICY):
+    """Return (cacheable, ttl) for an upstream response."""
+    if method not in policy or response is None or "err" in response:
+        return False, None
+    ret = response.get("ret", None)
+    if method in ("dx.consensus_header", "dx.transaction_block") and params.get("query_type", 0) == 1:
+        # addressed by block hash
+        return True, max(SETTLED_TTL, policy[method])
+    if method == "dx.transaction" and isinstance(ret, dict) and \
+            ret.get("ConfirmState", None) in dioxtypes.TXN_FINALIZED_STATUS:
+        return True, max(SETTLED_TTL, policy[method])
+    return True, policy[method]
+
+
+class RpcCache:
+    """LRU response cache with per-entry expiry and miss coalescing."""
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def fetch(self, key, loader, ttl_of):
+        """Return a cached response for key, or load it once for all concurrent callers."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, expires = entry
+                if expires is None or expires > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self._entries[key]
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+                leader = True
+        if not leader:
+            return future.result()
+        try:
+            response = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        cacheable, ttl = ttl_of(response)
+        with self._lock:
+            self._inflight.pop(key, None)
+            if cacheable:
+                self._entries[key] = (response, None if ttl is None else time.time() + ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(response)
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {"Entries": len(self._entries), "Hits": self.hits,
+                    "Misses": self.misses, "Coalesced": self.coalesced}
+
+
+class RpcCachingProxy:
+    logger = clientlogger.client_logger
+
+    def __init__(self, upstream=Config.rpc_url, host="127.0.0.1", port=62223, policy=None, max_entries=100000):
+        self.client = DioxClient(url=upstream)
+        self.policy = DEFAULT_CACHE_POLICY if policy is None else policy
+        self.cache = RpcCache(max_entries)
+        self.forwarded = 0
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    def handle(self, method, params):
+        """Answer one /api request; returns the node's JSON response object."""
+        forward = lambda: self._forward(method, params)
+        if method not in self.policy:
+            return forward()
+        key = (method, json.dumps(params, sort_keys=True))
+        return self.cache.fetch(key, forward, lambda r: response_ttl(method, params, r, self.policy))
+
+    def _forward(self, method, params):
+        self.forwarded += 1
+        return self.client.rpc.make_request(method, params)
+
+    def stats(self):
+        stats = self.cache.stats()
+        stats.update({"Forwarded": self.forwarded})
+        return stats
+
+    def _make_handler(self):
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, code, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _dispatch(self, raw_body):
+                url = urlparse(self.path)
+                if url.path == "/stats":
+                    return self._reply(200, proxy.stats())
+                if url.path != "/api":
+                    return self._reply(404, {"err": -1, "ret": "not found"})
+                query = parse_qs(url.query)
+                method = query.get("req", [None])[0]
+                if method is None:
+                    return self._reply(400, {"err": -1, "ret": "missing req"})
+                try:
+                    params = json.loads(raw_body) if raw_body else {}
+                    response = proxy.handle(method, params)
+                except Exception as e:
+                    proxy.logger.error("rpc proxy {} failed: {}".format(method, e))
+                    return self._reply(502, {"err": -1, "ret": str(e)})
+                self._reply(200, response)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0) or 0)
+                self._dispatch(self.rfile.read(length) if length else b"")
+
+            def do_GET(self):
+                self._dispatch(b"")
+
+            def log_message(self, format, *args):
+                proxy.logger.debug("rpc proxy: " + format % args)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local caching proxy for dioxide RPC")
+    parser.add_argument("--upstream", default=Config.rpc_url)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=62223)
+    parser.add_argument("--max-entries", type=int, default=100000)
+    args = parser.parse_args(argv)
+    proxy = RpcCachingProxy(args.upstream, args.host, args.port, max_entries=args.max_entries)
+    print("dioxide rpc proxy on http://{}:{}/api -> {}".format(args.host, proxy.address[1], args.upstream))
+    proxy.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+  scheduler puts a priority class on every submitted call. Each class maps
+  to a gas price tier, and calls enter the submission pipeline in weighted
+  fair queuing order, so order-critical calls are not stuck behind bulk
+  traffic while bulk traffic still gets its share of the send pool.
+"""
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from . import clientlogger
+from .pipeline import SubmissionPipeline
+from ..config.client_config import Config
+
+DEFAULT_PRIORITY = "normal"
+DEFAULT_QUEUE_SIZE = 4
+DELAY_SAMPLES = 1024
+
+
+class WeightedFairQueue:
+    """Unbounded per-class FIFO lanes served by self-clocked weighted fair queuing.
+
+    Every item gets a virtual finish tag of ``max(vtime, lane's last tag) +
+    1/weight``; ``get`` always serves the smallest tag. Backlogged classes
+    are therefore served in proportion to their weights, and an idle class
+    cannot build up credit to later starve the others.
+    """
+
+    def __init__(self, weights):
+        self.weights = dict(weights)
+        self._heap = []
+        self._last = {}
+        self._vtime = 0.0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def put(self, cls, item):
+        weight = self.weights.get(cls, None)
+        if not weight or weight <= 0:
+            raise ValueError("unknown priority class: {}".format(cls))
+        with self._cond:
+            finish = max(self._vtime, self._last.get(cls, 0.0)) + 1.0 / weight
+            self._last[cls] = finish
+            heapq.heappush(self._heap, (finish, next(self._seq), cls, item, time.time()))
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Return (cls, item, queueing delay); raises queue.Empty on timeout."""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while not self._heap:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._cond.wait(remaining)
+            finish, _, cls, item, enqueued = heapq.heappop(self._heap)
+            self._vtime = finish
+            return cls, item, time.time() - enqueued
+
+    def pending(self):
+        with self._cond:
+            counts = dict.fromkeys(self.weights, 0)
+            for _, _, cls, _, _ in self._heap:
+                counts[cls] += 1
+            return counts
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+
+
+class _TierStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=DELAY_SAMPLES)
+
+    def add(self, delay):
+        self.count += 1
+        self.total += delay
+        self.max = max(self.max, delay)
+        self.samples.append(delay)
+
+    def percentile(self, p):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+class SubmissionScheduler:
+    """Priority front end for SubmissionPipeline.
+
+    ``submit(call, priority)`` returns a Future resolved with the tx hash or
+    the exception of any stage. The class sets ``gas_price`` from
+    ``gas_price_tiers`` unless the call already has one. Calls wait in a
+    WeightedFairQueue and are handed to a pipeline with small inter-stage
+    queues (``queue_size``), so nearly all queueing happens where the
+    weights apply.
+    """
+
+    logger = clientlogger.client_logger
+
+    def __init__(self, client, gas_price_tiers=None, weights=None, default_priority=DEFAULT_PRIORITY,
+                 queue_size=DEFAULT_QUEUE_SIZE, **pipeline_options):
+        self.client = client
+        self.gas_price_tiers = dict(Config.gas_price_tiers if gas_price_tiers is None else gas_price_tiers)
+        weights = Config.priority_weights if weights is None else weights
+        self.default_priority = default_priority
+        self.queue = WeightedFairQueue({cls: weights.get(cls, 1) for cls in self.gas_price_tiers})
+        self.pipeline = SubmissionPipeline(client, queue_size=queue_size, **pipeline_options)
+        self._stats = {cls: _TierStats() for cls in self.gas_price_tiers}
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="submission-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=1):
+        """Stop dispatching; calls still queued fail with CancelledError."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        with self._lock:
+            futures, self._futures = self._futures, {}
+        for _, future in futures.values():
+            future.cancel()
+
+    def submit(self, call, priority=None):
+        priority = self.default_priority if priority is None else priority
+        if priority not in self.gas_price_tiers:
+            raise ValueError("unknown priority class: {}".format(priority))
+        call = dict(call)
+        if call.get("gas_price", None) is None:
+            call["gas_price"] = self.gas_price_tiers[priority]
+        future = Future()
+        with self._lock:
+            self._futures[id(call)] = (call, future)
+        self.queue.put(priority, call)
+        if self._thread is None:
+            self.start()
+        return future
+
+    def submit_many(self, calls, priority=None):
+        return [self.submit(call, priority) for call in calls]
+
+    def stats(self):
+        """Per priority class: dispatched count, pending count and queueing delay in seconds."""
+        pending = self.queue.pending()
+        with self._lock:
+            return {cls: {"gas_price": self.gas_price_tiers[cls],
+                          "weight": self.queue.weights[cls],
+                          "dispatched": s.count,
+                          "pending": pending.get(cls, 0),
+                          "mean_delay": s.total / s.count if s.count else 0.0,
+                          "p50_delay": s.percentile(0.5),
+                          "p99_delay": s.percentile(0.99),
+                          "max_delay": s.max}
+                    for cls, s in self._stats.items()}
+
+    def _dispatch(self):
+        while not self._stop.is_set():
+            try:
+                cls, call, delay = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            with self._lock:
+                self._stats[cls].add(delay)
+            yield call
+
+    def _run(self):
+        try:
+            for call, result in self.pipeline.run(self._dispatch()):
+                if call is None:
+                    self.logger.error("submission scheduler: {}".format(result))
+                    continue
+                with self._lock:
+                    entry = self._futures.pop(id(call), None)
+                if entry is None or entry[1].done():
+                    continue
+                if isinstance(result, Exception):
+                    entry[1].set_exception(result)
+                else:
+                    entry[1].set_result(result)
+        except Exception as e:
+            self.logger.error("submission scheduler stopped: {}".format(e))
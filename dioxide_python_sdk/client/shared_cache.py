@@ -0,0 +1,199 @@
+"""
+  shared_cache is an mmap-backed metadata cache shared by DioxClient
+  processes on one host, so ABIs and dapp/token ids are fetched once per
+  host instead of once per worker.
+
+  File layout:
+    header  [magic:8][slot_count:4][slot_size:4] padded to 64 bytes
+    slot    [version:8][key_hash:8][stored:8][key_len:2][value_len:4][crc:4][pad:6][key][value]
+
+  Every slot is guarded by a seqlock: writers make ``version`` odd before
+  touching the slot and even again afterwards, readers retry until they
+  copy the slot under the same even version. Payloads also carry a crc32c
+  so a reader can never hand out a torn entry.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+import crc32c  # type: ignore
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non posix
+    fcntl = None
+
+MAGIC = b"DIOXSHM1"
+FILE_HEADER_SIZE = 64
+SLOT_HEADER = struct.Struct("<QQdHII6x")
+MAX_PROBE = 8
+READ_RETRIES = 64
+
+DEFAULT_SLOT_COUNT = 2048
+DEFAULT_SLOT_SIZE = 32 * 1024
+
+
+def default_shared_cache_path():
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "dioxide_python_sdk.cache")
+
+
+class SharedMetadataCache:
+    """Cross-process metadata store with the get/put/invalidate shape used by MetadataCache."""
+
+    def __init__(self, path=None, slot_count=DEFAULT_SLOT_COUNT, slot_size=DEFAULT_SLOT_SIZE):
+        if fcntl is None:
+            raise RuntimeError("SharedMetadataCache requires a posix platform")
+        if slot_size <= SLOT_HEADER.size:
+            raise ValueError("slot_size too small")
+        self.path = path or default_shared_cache_path()
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self._lock = threading.Lock()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        size = FILE_HEADER_SIZE + slot_count * slot_size
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, FILE_HEADER_SIZE, 0)
+            if len(header) < FILE_HEADER_SIZE or header[:8] != MAGIC:
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, MAGIC + struct.pack("<II", slot_count, slot_size), 0)
+            else:
+                count, ssize = struct.unpack_from("<II", header, 8)
+                if (count, ssize) != (slot_count, slot_size):
+                    raise ValueError("shared cache {} has geometry {}x{}, expected {}x{}".format(
+                        self.path, count, ssize, slot_count, slot_size))
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._mm = mmap.mmap(self._fd, size)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            os.close(self._fd)
+            self._mm = None
+
+    @staticmethod
+    def _key_bytes(namespace, key):
+        return "{}\x00{}".format(namespace, json.dumps(key)).encode("utf-8")
+
+    @staticmethod
+    def _key_hash(key_bytes):
+        # never 0, which marks an empty or invalidated slot
+        return int.from_bytes(hashlib.blake2b(key_bytes, digest_size=8).digest(), "little") | 1
+
+    def _offset(self, index):
+        return FILE_HEADER_SIZE + index * self.slot_size
+
+    def _probe(self, key_hash):
+        home = key_hash % self.slot_count
+        for i in range(MAX_PROBE):
+            yield (home + i) % self.slot_count
+
+    def _read_slot(self, index):
+        """Consistent copy of a slot: (header fields, payload) or None if it stayed busy."""
+        off = self._offset(index)
+        mm = self._mm
+        for _ in range(READ_RETRIES):
+            v1 = struct.unpack_from("<Q", mm, off)[0]
+            if v1 & 1:
+                continue
+            header = SLOT_HEADER.unpack_from(mm, off)
+            length = header[3] + header[4]
+            if SLOT_HEADER.size + length > self.slot_size:
+                continue
+            payload = mm[off + SLOT_HEADER.size:off + SLOT_HEADER.size + length]
+            if struct.unpack_from("<Q", mm, off)[0] == v1:
+                return header, payload
+        return None
+
+    def get(self, namespace, key):
+        """Return (value, stored_time) or None."""
+        key_bytes = self._key_bytes(namespace, key)
+        key_hash = self._key_hash(key_bytes)
+        for index in self._probe(key_hash):
+            slot = self._read_slot(index)
+            if slot is None:
+                return None
+            (version, slot_hash, stored, key_len, value_len, crc), payload = slot
+            if version == 0:
+                return None
+            if slot_hash != key_hash or payload[:key_len] != key_bytes:
+                continue
+            if crc32c.crc32c(payload) != crc:
+                return None
+            return json.loads(payload[key_len:].decode("utf-8")), stored
+        return None
+
+    def _write_slot(self, index, key_hash, stored, key_bytes, value_bytes):
+        off = self._offset(index)
+        mm = self._mm
+        version = struct.unpack_from("<Q", mm, off)[0]
+        struct.pack_into("<Q", mm, off, version + 1)
+        payload = key_bytes + value_bytes
+        mm[off + SLOT_HEADER.size:off + SLOT_HEADER.size + len(payload)] = payload
+        struct.pack_into("<QdHII", mm, off + 8, key_hash, stored, len(key_bytes), len(value_bytes), crc32c.crc32c(payload))
+        struct.pack_into("<Q", mm, off, version + 2)
+
+    def _locked(self):
+        return _FileLock(self._lock, self._fd)
+
+    def put(self, namespace, key, value, stored):
+        """Store value; returns False when it does not fit in a slot."""
+        key_bytes = self._key_bytes(namespace, key)
+        value_bytes = json.dumps(value).encode("utf-8")
+        if SLOT_HEADER.size + len(key_bytes) + len(value_bytes) > self.slot_size:
+            return False
+        key_hash = self._key_hash(key_bytes)
+        with self._locked():
+            target = None
+            for index in self._probe(key_hash):
+                off = self._offset(index)
+                version, slot_hash, _, key_len = struct.unpack_from("<QQdH", self._mm, off)
+                if slot_hash == key_hash and self._mm[off + SLOT_HEADER.size:off + SLOT_HEADER.size + key_len] == key_bytes:
+                    target = index
+                    break
+                if target is None and slot_hash == 0:
+                    target = index
+                if version == 0:
+                    break
+            if target is None:
+                target = key_hash % self.slot_count
+            self._write_slot(target, key_hash, stored, key_bytes, value_bytes)
+        return True
+
+    def invalidate(self, namespace, key):
+        key_bytes = self._key_bytes(namespace, key)
+        key_hash = self._key_hash(key_bytes)
+        with self._locked():
+            for index in self._probe(key_hash):
+                off = self._offset(index)
+                version, slot_hash, _, key_len = struct.unpack_from("<QQdH", self._mm, off)
+                if version == 0:
+                    return
+                if slot_hash == key_hash and self._mm[off + SLOT_HEADER.size:off + SLOT_HEADER.size + key_len] == key_bytes:
+                    # tombstone: keeps the version chain so probing continues past it
+                    self._write_slot(index, 0, 0.0, b"", b"")
+                    return
+
+
+class _FileLock:
+    """Thread lock plus flock, since flock alone does not exclude threads sharing the fd."""
+
+    def __init__(self, lock, fd):
+        self.lock = lock
+        self.fd = fd
+
+    def __enter__(self):
+        self.lock.acquire()
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.lock.release()
+        return False
@@ -0,0 +1,283 @@
+"""
+  signed_transaction is the inverse of DioxAccount.sign_diox_transaction:
+  it splits signed transaction bytes into their fields without copying
+  them, and validates signatures and PoW in bulk without a node.
+
+    txdata | signer id (1) | public key | signature (64) | 3 x nonce (4)
+
+  txdata is the UnsignedTransaction.serialize() layout: a 28-byte header,
+  the build (core contracts) or rvm contract id, an optional delegatee,
+  then input size and input, then the token attachments (add_fca: a
+  uint64 token id and a bigint amount each) when the header's tsc is not 0.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+from .account import DioxAccount, DioxAccountType
+from .contract import CORE_CONTRACT_RVM, CORE_CONTRACT_SCOPE_BITSHIFT
+from ..utils.gadget import get_txn_pow_difficulty
+from ..utils.pow import POW_NONCE_COUNT, is_nonce_valid, pow_data_of
+
+HEADER_SIZE = 28
+DELEGATEE_SIZE = 36
+SIGNATURE_SIZE = 64
+NONCE_SIZE = 4
+FCA_TOKEN_ID_SIZE = 8
+BIGINT_LIMB_SIZE = 8
+PUBLIC_KEY_SIZE = {
+    DioxAccountType.ED25519.value: 32,
+    DioxAccountType.SM2.value: 64,
+}
+
+MALFORMED = "malformed"
+BAD_SIGNATURE = "bad_signature"
+BAD_POW = "bad_pow"
+
+_VERIFIER_CACHE_SIZE = 1024
+
+
+
+def _fca_size(data, offset, end, tsc):
+    """Size of ``tsc`` token attachments at ``offset``, or -1 if they do not fit before ``end``."""
+    start = offset
+    for _ in range(tsc):
+        if offset + FCA_TOKEN_ID_SIZE >= end:
+            return -1
+        # bigint: sign|count byte, then count 64-bit limbs (one zero limb for 0)
+        offset += FCA_TOKEN_ID_SIZE + 1 + BIGINT_LIMB_SIZE * max(data[offset + FCA_TOKEN_ID_SIZE] & 0x7F, 1)
+    return offset - start if offset <= end else -1
+
+class SignedTransaction:
+    """Field view over signed transaction bytes.
+
+    Byte fields (delegatee, input, public_key, signature, txdata, ...) are
+    memoryview slices of the original buffer; integer header fields are
+    decoded on access. ``parse`` raises ValueError when the bytes cannot be
+    a signed transaction.
+    """
+
+    __slots__ = ("data", "contract_size", "delegatee_offset", "input_offset", "input_size", "signer_offset",
+                 "public_key_size")
+
+    def __init__(self, data, contract_size, delegatee_offset, input_offset, input_size, signer_offset,
+                 public_key_size):
+        self.data = data
+        self.contract_size = contract_size
+        self.delegatee_offset = delegatee_offset
+        self.input_offset = input_offset
+        self.input_size = input_size
+        self.signer_offset = signer_offset
+        self.public_key_size = public_key_size
+
+    @classmethod
+    def parse(cls, signed):
+        data = signed if isinstance(signed, memoryview) else memoryview(signed)
+        if data.ndim != 1 or data.itemsize != 1:
+            data = data.cast("B")
+        n = len(data)
+        tail = SIGNATURE_SIZE + POW_NONCE_COUNT * NONCE_SIZE
+        if n < HEADER_SIZE + 1 + 2 + 1 + tail:
+            raise ValueError("signed transaction too short: {} bytes".format(n))
+        core_contract = data[17]
+        contract_size = 8 if core_contract & ((1 << CORE_CONTRACT_SCOPE_BITSHIFT) - 1) == CORE_CONTRACT_RVM else 1
+        head = HEADER_SIZE + contract_size
+        tsc = (int.from_bytes(data[12:14], "little") >> 13) & 0x3
+        for signer_id, pk_size in PUBLIC_KEY_SIZE.items():
+            signer_offset = n - tail - pk_size - 1
+            if signer_offset < head + 2 or data[signer_offset] != signer_id:
+                continue
+            # the delegatee has no flag of its own: it is present when the input size only fits after it
+            for delegatee in (False, True):
+                size_offset = head + (DELEGATEE_SIZE if delegatee else 0)
+                if size_offset + 2 > signer_offset:
+                    continue
+                input_size = int.from_bytes(data[size_offset:size_offset + 2], "little")
+                fca_offset = size_offset + 2 + input_size
+                if fca_offset <= signer_offset and \
+                        fca_offset + _fca_size(data, fca_offset, signer_offset, tsc) == signer_offset:
+                    return cls(data, contract_size, head if delegatee else None, size_offset + 2, input_size,
+                               signer_offset, pk_size)
+        raise ValueError("not a signed transaction")
+
+    # header ------------------------------------------------------------------
+    def _uint(self, start, size):
+        return int.from_bytes(self.data[start:start + size], "little")
+
+    @property
+    def version(self):
+        return self.data[0]
+
+    @property
+    def packflag(self):
+        return self.data[1]
+
+    @property
+    def timestamp(self):
+        return self._uint(2, 6)
+
+    @property
+    def isn(self):
+        return self._uint(8, 4)
+
+    @property
+    def ttl(self):
+        return 1 + (self._uint(12, 2) & 0x1FF)
+
+    @property
+    def sc(self):
+        return 1 + ((self._uint(12, 2) >> 9) & 0xF)
+
+    @property
+    def tsc(self):
+        return (self._uint(12, 2) >> 13) & 0x3
+
+    @property
+    def mode(self):
+        return self._uint(14, 2)
+
+    @property
+    def opcode(self):
+        return self.data[16]
+
+    @property
+    def core_contract(self):
+        return self.data[17]
+
+    @property
+    def gas_price(self):
+        return self._uint(18, 4) << self._uint(22, 2)
+
+    @property
+    def gas_limit(self):
+        return self._uint(24, 4)
+
+    @property
+    def build(self):
+        """Build of a core contract call, None for rvm contracts."""
+        return self.data[HEADER_SIZE] if self.contract_size == 1 else None
+
+    @property
+    def rvm_contract(self):
+        """ContractInvokeID value of an rvm contract call, None for core contracts."""
+        return self._uint(HEADER_SIZE, 8) if self.contract_size == 8 else None
+
+    # body --------------------------------------------------------------------
+    @property
+    def delegatee(self):
+        if self.delegatee_offset is None:
+            return None
+        return self.data[self.delegatee_offset:self.delegatee_offset + DELEGATEE_SIZE]
+
+    @property
+    def input(self):
+        return self.data[self.input_offset:self.input_offset + self.input_size]
+
+    @property
+    def fca(self):
+        """Token attachment bytes (token id + amount per token), empty when tsc is 0."""
+        return self.data[self.input_offset + self.input_size:self.signer_offset]
+
+    @property
+    def txdata(self):
+        """The unsigned transaction (UnsignedTransaction.serialize())."""
+        return self.data[0:self.signer_offset]
+
+    @property
+    def signer_id(self):
+        return self.data[self.signer_offset]
+
+    @property
+    def account_type(self):
+        return DioxAccountType(self.signer_id)
+
+    @property
+    def public_key(self):
+        start = self.signer_offset + 1
+        return self.data[start:start + self.public_key_size]
+
+    @property
+    def signed_message(self):
+        """What the signature covers: txdata + signer id + public key."""
+        return self.data[0:self.signer_offset + 1 + self.public_key_size]
+
+    @property
+    def signature(self):
+        start = self.signer_offset + 1 + self.public_key_size
+        return self.data[start:start + SIGNATURE_SIZE]
+
+    @property
+    def pow_payload(self):
+        """Signed bytes without the nonces: the PoW input."""
+        return self.data[0:len(self.data) - POW_NONCE_COUNT * NONCE_SIZE]
+
+    @property
+    def nonces(self):
+        start = len(self.data) - POW_NONCE_COUNT * NONCE_SIZE
+        return tuple(self._uint(start + NONCE_SIZE * k, NONCE_SIZE) for k in range(POW_NONCE_COUNT))
+
+    def __len__(self):
+        return len(self.data)
+
+    # validation --------------------------------------------------------------
+    def verify_signature(self, verifiers=None):
+        key = (self.signer_id, bytes(self.public_key))
+        account = None if verifiers is None else verifiers.get(key)
+        if account is None:
+            account = DioxAccount(None, key[1], None, self.account_type)
+            if verifiers is not None:
+                if len(verifiers) >= _VERIFIER_CACHE_SIZE:
+                    verifiers.clear()
+                verifiers[key] = account
+        return account.verify(bytes(self.signature), bytes(self.signed_message))
+
+    def verify_pow(self):
+        nonces = self.nonces
+        if len(set(nonces)) != len(nonces):
+            return False
+        payload = bytes(self.pow_payload)
+        pow_data = pow_data_of(payload)
+        threshold = get_txn_pow_difficulty(payload).threshold
+        return all(is_nonce_valid(pow_data, nonce, threshold) for nonce in nonces)
+
+    def validate(self, check_signature=True, check_pow=True, verifiers=None):
+        """None if valid, otherwise BAD_SIGNATURE or BAD_POW."""
+        if check_pow and not self.verify_pow():
+            return BAD_POW
+        if check_signature and not self.verify_signature(verifiers):
+            return BAD_SIGNATURE
+        return None
+
+
+def parse_signed_transaction(signed):
+    return SignedTransaction.parse(signed)
+
+
+def _validate_one(signed, check_signature, check_pow, verifiers):
+    try:
+        tx = SignedTransaction.parse(signed)
+    except (ValueError, IndexError):
+        return MALFORMED
+    return tx.validate(check_signature, check_pow, verifiers)
+
+
+def _validate_chunk(args):
+    chunk, check_signature, check_pow = args
+    verifiers = {}
+    return [_validate_one(signed, check_signature, check_pow, verifiers) for signed in chunk]
+
+
+def validate_signed_transactions(txs, check_signature=True, check_pow=True, workers=None, chunksize=None):
+    """
+    Validate many signed transactions offline. Returns one entry per input,
+    in order: None when it is valid, otherwise MALFORMED, BAD_POW or
+    BAD_SIGNATURE. PoW is checked first as it is the cheaper test. Verifying
+    keys are built once per signer; with workers > 1 chunks are spread over
+    a process pool.
+    """
+    txs = [bytes(tx) for tx in txs] if workers is not None and workers > 1 else list(txs)
+    if workers is None or workers <= 1 or len(txs) <= 1:
+        return _validate_chunk((txs, check_signature, check_pow))
+    if chunksize is None:
+        chunksize = max(1, len(txs) // (workers * 4))
+    chunks = [(txs[i:i + chunksize], check_signature, check_pow) for i in range(0, len(txs), chunksize)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [result for chunk in executor.map(_validate_chunk, chunks) for result in chunk]
@@ -0,0 +1,41 @@
+"""
+  subscription runs a DioxClient websocket subscription on a dedicated
+  thread. DioxClient keys subscriptions by the subscribing thread, so the
+  thread stays alive until stop() and then unsubscribes its own connection.
+"""
+import threading
+
+from . import clientlogger
+
+
+class SubscriptionThread:
+    logger = clientlogger.client_logger
+
+    def __init__(self, client, topic, handler, filter=None, name="subscription"):
+        self.client = client
+        self.topic = topic
+        self.handler = handler
+        self.filter = filter
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1):
+        self._stop.set()
+        if self._thread.ident is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            self.client.subscribe(self.topic, self.handler, self.filter)
+        except Exception as e:
+            self.logger.error("subscribe {} failed: {}".format(self.topic.name, e))
+            return
+        self._stop.wait()
+        try:
+            self.client.unsubscribe(threading.get_ident())
+        except Exception:
+            pass
@@ -3,14 +3,24 @@
   @author: long
   @date: 2024-09-12
 """
-import time,math
+import time,math,struct
 from .contract import *
 from .account import *
+from ..utils.gadget import get_txn_hash,serialize_args
+from ..utils.serializer import serialize
 
 DEFAULT_TRANSCTION_VERSION = 108
 DEFAULT_TRANSCTION_TTL = 120 #2 hours
 TXN_GAS_PRICE_DEFAULT = 100
 TXN_GAS_LIMIT_DEFAULT = 500000
+TXN_TTL_UNIT_MS = 60 * 1000 # ttl counts minutes
+
+
+def txn_expiry(txn):
+    """Expiry (ms since epoch) of unsigned or signed transaction bytes: timestamp + ttl minutes."""
+    timestamp = int.from_bytes(txn[2:8], 'little')
+    ttl = 1 + (int.from_bytes(txn[12:14], 'little') & 0x1FF)
+    return timestamp + ttl * TXN_TTL_UNIT_MS
 
 
 class InternalTargetMode(Enum):
@@ -50,11 +60,12 @@ class InternalTxnFlag(Enum):
 	TMF_BITMASK	 = 0xF00
 
 class UnsignedTransaction:
-    def __init__(self,contract_invoke_id:ContractInvokeID,opcode,version = DEFAULT_TRANSCTION_VERSION, timestamp = int(time.time_ns()//1_000_000), delegatee:DioxAddress = None):
+    def __init__(self,contract_invoke_id:ContractInvokeID,opcode,version = DEFAULT_TRANSCTION_VERSION, timestamp = None, delegatee:DioxAddress = None):
         self.version = version
         self.packflag = 0
         self.delegatee = delegatee
-        self.timestamp = timestamp
+        # a default evaluated per call, not once at import
+        self.timestamp = int(time.time_ns()//1_000_000) if timestamp is None else timestamp
         self.mode = TxnGenerationMode.TGM_USER_SIGNED.value
         self.ttl = DEFAULT_TRANSCTION_TTL
         self.sc = 1
@@ -94,9 +105,10 @@ class UnsignedTransaction:
          self.gas_limit = gas_limit
 
     def add_fca(self,token_id:int,amount:int):
-        self.fca_token.extend(token_id.to_bytes(8,byteorder='little'))
-        amount_len = (amount.bit_length() + 7)//8
-        self.fca_token.extend(amount.to_bytes(amount_len,byteorder='little'))
+        # the serializer's token type: uint64 id + bigint amount, so several attachments stay delimited
+        if self.tsc >= 3:
+            raise ValueError("at most 3 token attachments per transaction")
+        self.fca_token.extend(serialize("token",{"id":token_id,"amount":amount}))
         self.tsc += 1
     
 
@@ -145,10 +157,75 @@ class UnsignedTransaction:
 
         res.extend(self.input_size.to_bytes(2,'little'))
         res.extend(self.input)
+        res.extend(self.fca_token)
         return bytes(res)
 
     def hash(self):
-        pass
+        """
+        get_txn_hash of the unsigned payload, for deduplicating before signing.
+        It is not the node's transaction Hash, which covers the signed bytes.
+        """
+        return get_txn_hash(self.serialize())
+
+
+class TransactionTemplate:
+    """
+    Pre-encoded UnsignedTransaction for repeated calls with the same contract,
+    opcode, sender and gas settings. The header is serialized once into a
+    preallocated buffer; build() patches timestamp, ISN, mode and input in
+    place with struct.pack_into. Builds reuse the buffer: use one template
+    per thread.
+    """
+    TIMESTAMP_ISN = struct.Struct("<IHI")   # timestamp low 32, high 16, isn at offset 2
+    MODE = struct.Struct("<H")              # at offset 14
+    INPUT_SIZE = struct.Struct("<H")
+    TIMESTAMP_ISN_OFFSET = 2
+    MODE_OFFSET = 14
+
+    def __init__(self,tx:UnsignedTransaction,signature:str=None,capacity=256):
+        if tx.fca_token:
+            # attachments follow the input, so they cannot be part of the fixed header
+            raise ValueError("transaction templates do not support token attachments")
+        self.signature = signature
+        saved = tx.input,tx.input_size,tx.mode
+        tx.input,tx.input_size = bytearray(),0
+        tx.mode = saved[2] & ~InternalTxnFlag.TMF_ZERO_ARG.value
+        try:
+            header = tx.serialize()[:-2]
+        finally:
+            tx.input,tx.input_size,tx.mode = saved
+        self.header_size = len(header)
+        self.mode = tx.mode & ~InternalTxnFlag.TMF_ZERO_ARG.value
+        self.zero_arg_mode = self.mode | InternalTxnFlag.TMF_ZERO_ARG.value
+        self._buffer = bytearray(self.header_size + 2 + capacity)
+        self._buffer[0:self.header_size] = header
+
+    def build(self,isn,args=None,input=None,timestamp=None)->bytes:
+        """Unsigned transaction bytes; input is raw bytes, args are serialized with the template signature."""
+        if args:
+            input = bytes.fromhex(serialize_args(self.signature,args)) if self.signature else b""
+        elif input is None:
+            input = b""
+        if timestamp is None:
+            timestamp = time.time_ns()//1_000_000
+        size = len(input)
+        end = self.header_size + 2 + size
+        buf = self._buffer
+        if end > len(buf):
+            buf.extend(bytes(end - len(buf)))
+        self.TIMESTAMP_ISN.pack_into(buf,self.TIMESTAMP_ISN_OFFSET,timestamp & 0xFFFFFFFF,(timestamp >> 32) & 0xFFFF,isn)
+        self.MODE.pack_into(buf,self.MODE_OFFSET,self.mode if (size or args) else self.zero_arg_mode)
+        self.INPUT_SIZE.pack_into(buf,self.header_size,size)
+        buf[self.header_size+2:end] = input
+        return bytes(buf[:end])
+
+    def build_many(self,isns,inputs=None,timestamp=None):
+        """Build one transaction per ISN; inputs, if given, pairs with isns."""
+        if timestamp is None:
+            timestamp = time.time_ns()//1_000_000
+        if inputs is None:
+            return [self.build(isn,timestamp=timestamp) for isn in isns]
+        return [self.build(isn,input=data,timestamp=timestamp) for isn,data in zip(isns,inputs)]
 
 if __name__ == "__main__":
     dapp_address = DioxAddress(None,DioxAddressType.DAPP)
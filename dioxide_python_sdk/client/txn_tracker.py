@@ -0,0 +1,403 @@
+"""
+  txn_tracker resolves confirmation for many outstanding transactions at once.
+  It is fed by the TRANSACTION (txn_confirm_on_head) and
+  FINALIZED_BLOCK_AND_TRANSACTION subscriptions, follows relay transactions
+  as they are reported and polls dx.transaction only for hashes the stream
+  has not reported for ``poll_after`` seconds. Roots tracked with an expiry
+  fail with TXN_EXPIRED as soon as a finalized block is later than it.
+"""
+import heapq
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from . import types as dioxtypes
+from . import clientlogger
+from .subscription import SubscriptionThread
+
+CONFIRMED = "confirmed"
+FINALIZED = "finalized"
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_POLL_AFTER = 5.0
+DEFAULT_POLL_BATCH = 256
+DEFAULT_POLL_WORKERS = 8
+
+TARGET_STATUS = {
+    CONFIRMED: dioxtypes.TXN_CONFIRMED_STATUS,
+    FINALIZED: dioxtypes.TXN_FINALIZED_STATUS,
+}
+FAILED_STATUS = [dioxtypes.TxnConfirmState.TXN_EXPIRED.name,
+                 dioxtypes.TxnConfirmState.TXN_ABORTED.name,
+                 dioxtypes.TxnConfirmState.TXN_RELAY_INVALIDED.name]
+# block timestamps below this are in seconds rather than milliseconds
+_MS_TIMESTAMP_MIN = 10 ** 11
+
+
+def normalize_hash(tx_hash):
+    """Strip the ``:shard`` suffix the node appends to relay hashes."""
+    if ':' in tx_hash:
+        base, suffix = tx_hash.rsplit(':', 1)
+        if suffix.isdigit():
+            return base
+    return tx_hash
+
+
+class _Node:
+    __slots__ = ("query", "state", "relays", "due", "roots")
+
+    def __init__(self, query, due):
+        self.query = query
+        self.state = None
+        self.relays = None      # None until the Invocation has been seen
+        self.due = due
+        self.roots = set()
+
+
+class _Root:
+    __slots__ = ("hash", "until", "future", "pending", "nodes", "expiry")
+
+    def __init__(self, tx_hash, until, expiry=None):
+        self.hash = tx_hash
+        self.until = until
+        self.expiry = expiry
+        self.future = Future()
+        self.pending = {tx_hash}
+        self.nodes = set()
+
+
+class TxnTracker:
+    """Confirmation tracker for a large number of outstanding transactions.
+
+    ``track`` returns a Future resolved with the root transaction's
+    ConfirmState name once it and all of its relays reach ``until``, or with
+    the failing state (TXN_EXPIRED, TXN_ABORTED, TXN_RELAY_INVALIDED) as soon
+    as any transaction in the tree fails. Pending hashes sit in a due-time
+    heap, so a poll round costs O(batch log n) however many are outstanding.
+
+    A root tracked with ``expiry`` (ms, see transaction.txn_expiry) is failed
+    with TXN_EXPIRED once a finalized block's time passes it while the root
+    is still unconfirmed: no later block can include it. One dx.transaction
+    check guards against a confirmation the stream missed.
+    """
+
+    logger = clientlogger.client_logger
+
+    def __init__(self, client, poll_interval=DEFAULT_POLL_INTERVAL, poll_after=DEFAULT_POLL_AFTER,
+                 poll_batch=DEFAULT_POLL_BATCH, poll_workers=DEFAULT_POLL_WORKERS, use_subscription=True):
+        self.client = client
+        self.poll_interval = poll_interval
+        self.poll_after = poll_after
+        self.poll_batch = poll_batch
+        self.poll_workers = poll_workers
+        self.use_subscription = use_subscription
+        self.polled = 0
+        self.pushed = 0
+        self.expired = 0
+        self.finalized_time = None
+        self._lock = threading.Lock()
+        self._nodes = {}
+        self._roots = {}
+        self._due = []
+        self._expiries = []
+        self._stop = threading.Event()
+        self._subscriptions = []
+        self._thread = None
+        self._executor = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._stop.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self.poll_workers)
+            self._thread = threading.Thread(target=self._poll_loop, name="txn-tracker-poll", daemon=True)
+            self._thread.start()
+        if self.use_subscription:
+            self._subscriptions = [
+                SubscriptionThread(self.client, dioxtypes.SubscribeTopic.TRANSACTION,
+                                   self._on_confirmed, name="txn-tracker-confirm").start(),
+                SubscriptionThread(self.client, dioxtypes.SubscribeTopic.FINALIZED_BLOCK_AND_TRANSACTION,
+                                   self._on_finalized, name="txn-tracker-finalize").start(),
+            ]
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for sub in self._subscriptions:
+            sub.stop()
+        self._subscriptions = []
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._roots)
+
+    # tracking ----------------------------------------------------------------
+    def track(self, tx_hash, until=CONFIRMED, expiry=None):
+        """Return a Future for ``tx_hash`` reaching ``until`` (CONFIRMED or FINALIZED) with all relays."""
+        if until not in TARGET_STATUS:
+            raise ValueError("unknown target state: {}".format(until))
+        key = normalize_hash(tx_hash)
+        with self._lock:
+            root = self._roots.get((key, until))
+            if root is not None:
+                return root.future
+            root = _Root(key, until, expiry)
+            self._roots[(key, until)] = root
+            node = self._attach(key, tx_hash, root)
+            resolved = self._advance(root, key, node)
+            if expiry is not None and not resolved:
+                heapq.heappush(self._expiries, (expiry, key, until))
+            overdue = expiry is not None and self.finalized_time is not None and self.finalized_time > expiry
+        root.future.add_done_callback(lambda f: f.cancelled() and self._forget(root))
+        self._resolve(resolved)
+        if overdue:
+            self.advance_time(self.finalized_time)
+        return root.future
+
+    def track_many(self, tx_hashes, until=CONFIRMED, expiries=None):
+        if expiries is None:
+            return [self.track(h, until) for h in tx_hashes]
+        return [self.track(h, until, e) for h, e in zip(tx_hashes, expiries)]
+
+    def untrack(self, tx_hash, until=CONFIRMED):
+        with self._lock:
+            root = self._roots.get((normalize_hash(tx_hash), until))
+        if root is not None:
+            root.future.cancel()
+
+    def update(self, tx, default_state=None):
+        """Feed one transaction record (stream message or dx.transaction result)."""
+        tx_hash = tx.get("Hash", None) if isinstance(tx, dict) else None
+        if tx_hash is None:
+            return
+        key = normalize_hash(tx_hash)
+        with self._lock:
+            node = self._nodes.get(key)
+            if node is None:
+                return
+            state = tx.get("ConfirmState", None) or default_state
+            if state is not None and not self._is_regression(node.state, state):
+                node.state = state
+            invocation = tx.get("Invocation", None)
+            if isinstance(invocation, dict):
+                node.relays = list(invocation.get("Relays", []) or [])
+            if node.relays is None and state in dioxtypes.TXN_CONFIRMED_STATUS:
+                # confirmed without an Invocation: fetch the relays right away
+                node.due = time.time()
+                heapq.heappush(self._due, (node.due, key))
+            else:
+                node.due = time.time() + self.poll_after
+            resolved = []
+            for root_key in list(node.roots):
+                root = self._roots.get(root_key)
+                if root is not None and key in root.pending:
+                    resolved.extend(self._advance(root, key, node))
+        self._resolve(resolved)
+
+    @staticmethod
+    def _is_regression(old, new):
+        # a finalized report can arrive before the confirmed one
+        return old in dioxtypes.TXN_FINALIZED_STATUS and new not in dioxtypes.TXN_FINALIZED_STATUS
+
+    # internals (called with self._lock held) ---------------------------------
+    def _attach(self, key, query, root):
+        node = self._nodes.get(key)
+        if node is None:
+            node = _Node(query, time.time() + self.poll_after)
+            self._nodes[key] = node
+            heapq.heappush(self._due, (node.due, key))
+        node.roots.add((root.hash, root.until))
+        root.nodes.add(key)
+        return node
+
+    def _advance(self, root, key, node):
+        """Re-check ``key`` in root's pending frontier; returns [(future, result)] to resolve."""
+        if node.state in FAILED_STATUS:
+            return self._finish(root, node.state)
+        if node.state not in TARGET_STATUS[root.until] or node.relays is None:
+            return []
+        root.pending.discard(key)
+        resolved = []
+        for relay in node.relays:
+            relay_key = normalize_hash(relay)
+            if relay_key in root.nodes:
+                continue
+            relay_node = self._attach(relay_key, relay, root)
+            root.pending.add(relay_key)
+            resolved.extend(self._advance(root, relay_key, relay_node))
+            if root.future.done() or (root.hash, root.until) not in self._roots:
+                return resolved
+        if not root.pending and (root.hash, root.until) in self._roots:
+            resolved.extend(self._finish(root, self._nodes[root.hash].state))
+        return resolved
+
+    def _finish(self, root, result):
+        if self._roots.pop((root.hash, root.until), None) is None:
+            return []
+        self._release(root)
+        return [(root.future, result)]
+
+    def _release(self, root):
+        root_key = (root.hash, root.until)
+        for key in root.nodes:
+            node = self._nodes.get(key)
+            if node is None:
+                continue
+            node.roots.discard(root_key)
+            if not node.roots:
+                del self._nodes[key]
+
+    def _forget(self, root):
+        with self._lock:
+            if self._roots.pop((root.hash, root.until), None) is not None:
+                self._release(root)
+
+    @staticmethod
+    def _resolve(resolved):
+        for future, result in resolved:
+            if not future.done():
+                future.set_result(result)
+
+    # expiry ------------------------------------------------------------------
+    def advance_time(self, timestamp):
+        """Publish a finalized block time (ms or s); fails roots it proves expired."""
+        timestamp = int(timestamp)
+        if timestamp < _MS_TIMESTAMP_MIN:
+            timestamp *= 1000
+        candidates = []
+        with self._lock:
+            if self.finalized_time is None or timestamp > self.finalized_time:
+                self.finalized_time = timestamp
+            while self._expiries and self._expiries[0][0] < self.finalized_time:
+                _, key, until = heapq.heappop(self._expiries)
+                root = self._roots.get((key, until))
+                node = self._nodes.get(key)
+                if root is not None and node is not None and node.state not in dioxtypes.TXN_CONFIRMED_STATUS:
+                    candidates.append(root)
+        for root in candidates:
+            executor = self._executor
+            if executor is None:
+                self._expire(root)
+            else:
+                executor.submit(self._expire, root)
+        return len(candidates)
+
+    def _expire(self, root):
+        node = self._nodes.get(root.hash)
+        try:
+            tx = self.client.get_transaction(node.query if node is not None else root.hash)
+        except Exception:
+            tx = None
+        if tx:
+            self.update(tx)
+        with self._lock:
+            node = self._nodes.get(root.hash)
+            if (root.hash, root.until) not in self._roots or node is None or \
+                    node.state in dioxtypes.TXN_CONFIRMED_STATUS:
+                return
+            resolved = self._finish(root, dioxtypes.TxnConfirmState.TXN_EXPIRED.name)
+            self.expired += len(resolved)
+        self._resolve(resolved)
+
+    @staticmethod
+    def _block_time_of(msg):
+        if not isinstance(msg, dict):
+            return None
+        # a bare transaction's Timestamp is the sender's, not the block's
+        top = msg if "Transactions" in msg or "Txns" in msg or "Hash" not in msg else None
+        for holder in (top, msg.get("Header", None), msg.get("ConsensusHeader", None), msg.get("Block", None)):
+            if isinstance(holder, dict) and holder.get("Timestamp", None) is not None:
+                return holder["Timestamp"]
+        return None
+
+    # stream ------------------------------------------------------------------
+    @staticmethod
+    def _transactions_of(msg):
+        if isinstance(msg, list):
+            return msg
+        if not isinstance(msg, dict):
+            return []
+        if msg.get("Hash", None) is not None and "Transactions" not in msg:
+            return [msg]
+        txns = msg.get("Transactions", None) or msg.get("Txns", None) or []
+        return [{"Hash": t} if isinstance(t, str) else t for t in txns]
+
+    def _on_confirmed(self, msg):
+        for tx in self._transactions_of(msg):
+            self.pushed += 1
+            self.update(tx, dioxtypes.TxnConfirmState.TXN_CONFIRMED.name)
+
+    def _on_finalized(self, msg):
+        for tx in self._transactions_of(msg):
+            self.pushed += 1
+            self.update(tx, dioxtypes.TxnConfirmState.TXN_FINALIZED.name)
+        block_time = self._block_time_of(msg)
+        if block_time is not None:
+            self.advance_time(block_time)
+
+    # polling fallback --------------------------------------------------------
+    def _is_pending(self, key, node):
+        # settled nodes stay indexed until their root finishes but are not polled
+        for root_key in node.roots:
+            root = self._roots.get(root_key)
+            if root is not None and key in root.pending:
+                return True
+        return False
+
+    def _take_due(self, now):
+        batch = []
+        with self._lock:
+            while self._due and len(batch) < self.poll_batch:
+                due, key = self._due[0]
+                if due > now:
+                    break
+                heapq.heappop(self._due)
+                node = self._nodes.get(key)
+                if node is None or not self._is_pending(key, node):
+                    continue
+                if node.due > now:
+                    # reported by the stream since it was queued
+                    heapq.heappush(self._due, (node.due, key))
+                    continue
+                node.due = now + self.poll_after
+                heapq.heappush(self._due, (node.due, key))
+                batch.append(node.query)
+        return batch
+
+    def _poll_one(self, query):
+        try:
+            tx = self.client.get_transaction(query)
+        except Exception as e:
+            self.logger.debug("txn tracker poll {} failed: {}".format(query, e))
+            return
+        self.polled += 1
+        if tx:
+            self.update(tx)
+
+    def poll_once(self, now=None):
+        """Poll every hash that is due; returns how many were polled."""
+        batch = self._take_due(time.time() if now is None else now)
+        if batch:
+            executor = self._executor
+            if executor is None:
+                for query in batch:
+                    self._poll_one(query)
+            else:
+                list(executor.map(self._poll_one, batch))
+        return len(batch)
+
+    def _poll_loop(self):
+        while not self._stop.is_set():
+            try:
+                if self.poll_once() >= self.poll_batch:
+                    continue
+            except Exception as e:
+                self.logger.error("txn tracker poll failed: {}".format(e))
+            self._stop.wait(self.poll_interval)
@@ -2,4 +2,13 @@ class Config:
     rpc_url = "http://127.0.0.1:62222/api"
     log_dir = "logs"
     ws_rpc = "ws://127.0.0.1:62222/api"
-    default_thread_nums = 32
\ No newline at end of file
+    default_thread_nums = 32
+    source_cache_dir = None
+    metadata_cache_ttl = 300
+    shared_cache_path = None
+    deploy_plan_state_path = None  # json file remembering verified deploy plan matches
+    txn_hash_algorithm = "sha256"
+    # low stays at TXN_GAS_PRICE_DEFAULT, the price a call gets without a tier
+    gas_price_tiers = {"high": 400, "normal": 200, "low": 100}
+    priority_weights = {"high": 8, "normal": 2, "low": 1}
+    txn_inflight_margin = 30
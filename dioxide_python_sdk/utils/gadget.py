@@ -1,7 +1,10 @@
-import hashlib,json
+import hashlib,json,base64
 from ..client.types import SubscribeTopic
-import sys
+from ..config.client_config import Config
+import sys,threading
+from contextlib import contextmanager
 from .serializer import serialize, deserialize
+from .pow import PowSolver, ParallelPowSolver, pow_data_of
 
 try:
     import krock32
@@ -10,16 +13,29 @@ except ImportError:
     KROCK32_AVAILABLE = False
     print("Warning: krock32 module not available, some encoding features may be limited")
 
+_exception_output = threading.local()
+
 def exception_handler(func):
     def wrapper(*args, **kwargs):
         try:
             result = func(*args, **kwargs)
             return result
         except Exception as e:
-            print(f"exception: {e}")
+            if not getattr(_exception_output, "quiet", False):
+                print(f"exception: {e}")
             raise
     return wrapper
 
+@contextmanager
+def quiet_exceptions():
+    """Stop exception_handler printing on this thread; exceptions still propagate."""
+    previous = getattr(_exception_output, "quiet", False)
+    _exception_output.quiet = True
+    try:
+        yield
+    finally:
+        _exception_output.quiet = previous
+
 # pow
 class PowDifficulty:
     def __init__(self):
@@ -41,15 +57,14 @@ class PowDifficulty:
         self._TargetNum = num >> 32
         self._NonZeroBytes = bytes_needed + 8  # ULONGLONG size
 
+    @property
+    def threshold(self):
+        # bytes above _NonZeroBytes must be zero and the 32-bit word below them
+        # must be under _TargetNum, i.e. the little endian hash < this value
+        return self._TargetNum << ((self._NonZeroBytes-4)*8)
+
     def is_fullfiled(self,val):
-        if self._TargetNum <= int.from_bytes(val[self._NonZeroBytes-4:self._NonZeroBytes],'little'):
-            return False
-        p = self._NonZeroBytes
-        while p < 32:
-            if val[p] > 0:
-                return False
-            p += 1
-        return True
+        return int.from_bytes(val[0:32],'little') < self.threshold
 
 
 def get_ttl_from_signed_txn(tx):
@@ -62,23 +77,71 @@ def get_pow_difficulty(tx_size,ttl=30):
     pow_diff.set(denominator)
     return pow_diff
 
-def calculate_txn_pow(tx):
-    pow_data = hashlib.sha512(tx).digest()[0:-4]
-    nonces = [0] * 3
-    diff = get_pow_difficulty(len(tx)+12,get_ttl_from_signed_txn(tx))
-
-    nonce = 0
-    for i in range(3):
-        while True:
-            nonce_bytes = nonce.to_bytes(4, byteorder='little')
-            hash_result = hashlib.sha256(pow_data + nonce_bytes).digest()
-            if diff.is_fullfiled(hash_result):
-                nonces[i] = nonce
-                break
-            nonce += 1
-        nonce += 1
-
-    return nonces
+def get_txn_pow_difficulty(tx):
+    # the three 4-byte nonces appended after signing count toward the size
+    return get_pow_difficulty(len(tx)+12,get_ttl_from_signed_txn(tx))
+
+def calculate_txn_pow(tx,solver=None):
+    solver = solver or PowSolver()
+    return solver.solve(pow_data_of(tx),get_txn_pow_difficulty(tx).threshold)
+
+def calculate_txn_pow_batch(txs,solver=None):
+    """
+    Solve PoW for many signed payloads in parallel; results keep input order.
+    solver defaults to a ParallelPowSolver using every core.
+    """
+    jobs = [(pow_data_of(tx),get_txn_pow_difficulty(tx).threshold) for tx in txs]
+    if solver is not None:
+        return solver.solve_many(jobs)
+    with ParallelPowSolver() as pool:
+        return pool.solve_many(jobs)
+
+def append_txn_pow(tx,nonces):
+    return tx + b"".join(nonce.to_bytes(4,'little') for nonce in nonces)
+
+# crockford base32 (as krock32 writes it) via the C base32 codec
+_B32_TO_CROCKFORD = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567",b"0123456789abcdefghjkmnpqrstvwxyz")
+_CROCKFORD_TO_B32 = bytes.maketrans(b"0123456789abcdefghjkmnpqrstvwxyz",b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567")
+
+def encode_txn_hash(digest,shard_index=None):
+    h = base64.b32encode(digest).translate(_B32_TO_CROCKFORD).rstrip(b"=").decode()
+    return h if shard_index is None else "{}:{}".format(h,shard_index)
+
+def decode_txn_hash(tx_hash):
+    """Split "hash[:shard]" into (32-byte digest, shard index or None)."""
+    shard_index = None
+    if ":" in tx_hash:
+        # same rule as DioxClient._normalize_relay_hash: only a numeric suffix is a shard index
+        base,suffix = tx_hash.rsplit(":",1)
+        if suffix.isdigit():
+            tx_hash,shard_index = base,int(suffix)
+    data = tx_hash.lower().encode().translate(_CROCKFORD_TO_B32)
+    return base64.b32decode(data + b"=" * (-len(data) % 8))[0:32],shard_index
+
+def _txn_hasher(algorithm=None):
+    algorithm = algorithm or Config.txn_hash_algorithm
+    return getattr(hashlib,algorithm,None) or (lambda data: hashlib.new(algorithm,data))
+
+def get_txn_hash(tx,shard_index=None,algorithm=None):
+    """
+    Local content digest of a signed transaction (PoW nonces included) in
+    the node's base32 form, with a ":shard" suffix when shard_index is given.
+    The digest is Config.txn_hash_algorithm over the full signed bytes.
+    It is not verified to equal the Hash the node assigns: look transactions
+    up by the hash tx.send returns.
+    """
+    return encode_txn_hash(_txn_hasher(algorithm)(tx).digest()[0:32],shard_index)
+
+def get_txn_hashes(txs,shard_index=None,algorithm=None):
+    """Bulk get_txn_hash; shard_index may be one value or one per transaction."""
+    hasher = _txn_hasher(algorithm)
+    b32encode = base64.b32encode
+    digests = [b32encode(hasher(tx).digest()[0:32]).translate(_B32_TO_CROCKFORD).rstrip(b"=").decode() for tx in txs]
+    if shard_index is None:
+        return digests
+    if isinstance(shard_index,int):
+        return ["{}:{}".format(h,shard_index) for h in digests]
+    return [h if s is None else "{}:{}".format(h,s) for h,s in zip(digests,shard_index)]
 
 def get_subscribe_message(topic: SubscribeTopic):
     if topic == SubscribeTopic.CONSENSUS_HEADER:
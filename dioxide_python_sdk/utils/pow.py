@@ -0,0 +1,154 @@
+"""
+  pow is the transaction proof-of-work solver engine.
+
+  A nonce is valid when sha256(pow_data + nonce_le32), read as a little
+  endian 256-bit integer, is below the difficulty threshold. pow_data is
+  the 60-byte prefix sha512(signed_tx)[:60]; it is absorbed into a sha256
+  state once and the state is cloned for every attempt.
+"""
+import hashlib
+import os
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+POW_DATA_SIZE = 60
+POW_NONCE_COUNT = 3
+
+_pack_nonce = struct.Struct("<I").pack
+
+
+def pow_data_of(signed_tx):
+    return hashlib.sha512(signed_tx).digest()[0:POW_DATA_SIZE]
+
+
+def is_nonce_valid(pow_data, nonce, threshold):
+    digest = hashlib.sha256(pow_data + _pack_nonce(nonce)).digest()
+    return int.from_bytes(digest, "little") < threshold
+
+
+def expected_attempts(threshold):
+    """Mean number of hashes needed to find one valid nonce."""
+    return (1 << 256) / threshold
+
+
+def search_nonces(pow_data, threshold, start=0, stop=1 << 32, count=POW_NONCE_COUNT):
+    """Return up to ``count`` valid nonces in [start, stop), in increasing order."""
+    prefix = hashlib.sha256(pow_data)
+    clone = prefix.copy
+    from_bytes = int.from_bytes
+    pack = _pack_nonce
+    found = []
+    for nonce in range(start, stop):
+        h = clone()
+        h.update(pack(nonce))
+        if from_bytes(h.digest(), "little") < threshold:
+            found.append(nonce)
+            if len(found) == count:
+                break
+    return found
+
+
+class PowSolver:
+    """Solves transaction PoW: the first ``count`` valid nonces counted up from 0."""
+
+    def __init__(self, count=POW_NONCE_COUNT):
+        self.count = count
+
+    def solve(self, pow_data, threshold):
+        nonces = search_nonces(pow_data, threshold, 0, 1 << 32, self.count)
+        if len(nonces) < self.count:
+            raise ValueError("nonce space exhausted")
+        return nonces
+
+    def solve_many(self, jobs):
+        """Solve a list of (pow_data, threshold) jobs; results keep input order."""
+        return [self.solve(pow_data, threshold) for pow_data, threshold in jobs]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def _solve_job(pow_data, threshold, count):
+    return PowSolver(count).solve(pow_data, threshold)
+
+
+class ParallelPowSolver(PowSolver):
+    """Process pool PoW backend.
+
+    ``solve`` splits the nonce space into chunks searched by different
+    workers and consumes the chunk results in order, so it returns exactly
+    the nonces the sequential search would. ``solve_many`` hands whole
+    transactions to workers, which is the better split for batches.
+    """
+
+    MIN_CHUNK = 4096
+    MAX_CHUNK = 1 << 18
+
+    def __init__(self, workers=None, count=POW_NONCE_COUNT, chunk_size=None, executor=None):
+        super().__init__(count)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self):
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _chunk_size(self, threshold):
+        if self.chunk_size is not None:
+            return self.chunk_size
+        chunk = int(expected_attempts(threshold) // self.workers)
+        return max(self.MIN_CHUNK, min(self.MAX_CHUNK, chunk))
+
+    def solve(self, pow_data, threshold):
+        if self.workers <= 1:
+            return super().solve(pow_data, threshold)
+        chunk = self._chunk_size(threshold)
+        limit = 1 << 32
+        pending = deque()
+        next_start = 0
+        found = []
+
+        def submit():
+            nonlocal next_start
+            if next_start >= limit:
+                return
+            stop = min(next_start + chunk, limit)
+            pending.append(self.executor.submit(search_nonces, pow_data, threshold, next_start, stop, self.count))
+            next_start = stop
+
+        for _ in range(self.workers * 2):
+            submit()
+        while pending:
+            found.extend(pending.popleft().result())
+            if len(found) >= self.count:
+                for f in pending:
+                    f.cancel()
+                return found[:self.count]
+            submit()
+        raise ValueError("nonce space exhausted")
+
+    def solve_many(self, jobs):
+        jobs = list(jobs)
+        if self.workers <= 1 or len(jobs) <= 1:
+            return super().solve_many(jobs)
+        return list(self.executor.map(
+            _solve_job,
+            [j[0] for j in jobs], [j[1] for j in jobs], [self.count] * len(jobs),
+            chunksize=max(1, len(jobs) // (self.workers * 4))))
@@ -0,0 +1,107 @@
+"""
+  pow_cost predicts what a transaction's PoW will cost before solving it.
+
+  Each of the POW_NONCE_COUNT nonces needs 2^256 / threshold attempts on
+  average, where the threshold comes from get_pow_difficulty(size, ttl):
+  denominator = (1000 + size * (ttl * 10 + 100)) // 3, so the work grows
+  linearly with both the signed size and the TTL. Attempts are turned into
+  seconds with a hash rate measured by a short local benchmark.
+"""
+import hashlib
+import math
+import os
+import struct
+import time
+
+from .gadget import get_pow_difficulty
+from .pow import POW_DATA_SIZE, POW_NONCE_COUNT, expected_attempts
+
+MAX_TTL = 512  # ttl is a 9-bit field counting minutes
+TTL_UNIT_SECONDS = 60
+DEFAULT_CALIBRATION_SECONDS = 0.2
+NONCE_BYTES = POW_NONCE_COUNT * 4
+SIGNATURE_BYTES = 64
+PUBLIC_KEY_BYTES = {"ED25519": 32, "SM2": 64}
+
+_measured_hash_rate = None
+
+
+def measure_hash_rate(duration=DEFAULT_CALIBRATION_SECONDS):
+    """Single-core PoW attempts per second, timed with the solver's midstate loop."""
+    prefix = hashlib.sha256(os.urandom(POW_DATA_SIZE))
+    clone = prefix.copy
+    pack = struct.Struct("<I").pack
+    from_bytes = int.from_bytes
+    attempts = 0
+    batch = 2000
+    start = time.perf_counter()
+    deadline = start + duration
+    while True:
+        for nonce in range(attempts, attempts + batch):
+            h = clone()
+            h.update(pack(nonce))
+            from_bytes(h.digest(), "little")
+        attempts += batch
+        now = time.perf_counter()
+        if now >= deadline:
+            return attempts / (now - start)
+
+
+def signed_size(txdata_size, account_type="ED25519"):
+    """Signed size (PoW nonces included) of a transaction whose txdata is ``txdata_size`` bytes."""
+    name = getattr(account_type, "name", account_type)
+    return txdata_size + 1 + PUBLIC_KEY_BYTES[name] + SIGNATURE_BYTES + NONCE_BYTES
+
+
+class PowCostEstimator:
+    """Expected PoW attempts and wall time per transaction.
+
+    ``size`` is always the full signed size, nonces included (what
+    get_txn_pow_difficulty uses); see signed_size. ``hash_rate`` defaults to
+    a one-off local benchmark shared by every estimator in the process, and
+    ``workers`` scales it for ParallelPowSolver.
+    """
+
+    def __init__(self, hash_rate=None, workers=1):
+        self.hash_rate = hash_rate
+        self.workers = workers
+
+    def calibrate(self, duration=DEFAULT_CALIBRATION_SECONDS, force=False):
+        global _measured_hash_rate
+        if force or _measured_hash_rate is None:
+            _measured_hash_rate = measure_hash_rate(duration)
+        self.hash_rate = _measured_hash_rate
+        return self.hash_rate
+
+    def attempts(self, size, ttl):
+        """Expected hash attempts to find every nonce."""
+        return POW_NONCE_COUNT * expected_attempts(get_pow_difficulty(size, ttl).threshold)
+
+    def seconds(self, size, ttl):
+        """Expected PoW wall time on this machine."""
+        if self.hash_rate is None:
+            self.calibrate()
+        return self.attempts(size, ttl) / (self.hash_rate * self.workers)
+
+    def estimate(self, signed_payload):
+        """(attempts, seconds) for a signed payload without nonces, as passed to calculate_txn_pow."""
+        size = len(signed_payload) + NONCE_BYTES
+        ttl = 1 + (int.from_bytes(signed_payload[12:14], "little") & 0x1FF)
+        return self.attempts(size, ttl), self.seconds(size, ttl)
+
+    def pick_ttl(self, size, latency_target, margin=0.0, max_ttl=MAX_TTL):
+        """
+        Smallest TTL (minutes) that still outlives PoW plus ``latency_target``
+        seconds (plus ``margin``); PoW cost grows with TTL, so this is also
+        the cheapest TTL that meets the target. Raises ValueError if none does.
+        """
+        ttl = max(1, int(math.ceil((latency_target + margin) / TTL_UNIT_SECONDS)))
+        while ttl <= max_ttl:
+            if ttl * TTL_UNIT_SECONDS >= latency_target + margin + self.seconds(size, ttl):
+                return ttl
+            ttl += 1
+        raise ValueError("no ttl up to {} covers a {}s latency target for {} bytes".format(max_ttl, latency_target, size))
+
+    def batch_seconds(self, sizes, ttl):
+        """Expected PoW time for a batch of transactions sharing one TTL."""
+        return sum(self.seconds(size, ttl) for size in sizes)
@@ -16,9 +16,14 @@ class HTTPProvide:
         self.request_kwargs = kwargs or {}
     
     def encode_rpc_request(self,method,params):
-        self.request_params.update({"req":method})
         return json.dumps(params or {})
 
+    def encode_rpc_params(self,method):
+        # built per request: a shared dict would race when threads send concurrently
+        request_params = dict(self.request_params)
+        request_params.update({"req":method})
+        return request_params
+
     def decode_rpc_response(self,response):
         return response.json()
 
@@ -30,7 +35,7 @@ class HTTPProvide:
 
         raw_response = make_post_request(
             self.url,
-            self.request_params,
+            self.encode_rpc_params(method),
             request_data,
             **self.request_kwargs
         )
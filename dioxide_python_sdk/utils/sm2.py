@@ -0,0 +1,183 @@
+"""
+  sm2 is a fast SM2-with-SM3 signer for DioxAccount.
+
+  It signs exactly like gmssl's CryptSM2.sign_with_sm3 (same Z_A user id,
+  same r||s layout, byte-identical output for the same k) but keeps a
+  per-key context: Z_A, (1+d)^-1 and fixed-base window tables for G and
+  the public key are computed once, so a signature costs 64 mixed point
+  additions instead of a full double-and-add over hex strings.
+"""
+import hashlib
+import secrets
+
+P = 0xFFFFFFFEFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF00000000FFFFFFFFFFFFFFFF
+A = 0xFFFFFFFEFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF00000000FFFFFFFFFFFFFFFC
+B = 0x28E9FA9E9D9F5E344D5A9E4BCF6509A7F39789F515AB8F92DDBCBD414D940E93
+N = 0xFFFFFFFEFFFFFFFFFFFFFFFFFFFFFFFF7203DF6B21C6052B53BBF40939D54123
+GX = 0x32C4AE2C1F1981195F9904466A39C9948FE30BBFF2660BE1715A4589334C74C7
+GY = 0xBC3736A2F4F6779C59BDCEE36B692153D0A9877CC62A474002DF32E52139F0A0
+
+DEFAULT_USER_ID = b"1234567812345678"
+
+WINDOW_BITS = 4
+WINDOW_SIZE = 1 << WINDOW_BITS
+WINDOW_COUNT = 256 // WINDOW_BITS
+
+
+def _sm3_hashlib(data):
+    return hashlib.new("sm3", data).digest()
+
+
+def _sm3_gmssl(data):
+    from gmssl import sm3, func
+    return bytes.fromhex(sm3.sm3_hash(func.bytes_to_list(data)))
+
+
+def _pick_sm3():
+    try:
+        hashlib.new("sm3", b"")
+        return _sm3_hashlib
+    except ValueError:
+        return _sm3_gmssl
+
+
+sm3_digest = _pick_sm3()
+
+
+# jacobian arithmetic over the SM2 prime field, a = -3
+def _double(pt):
+    x1, y1, z1 = pt
+    if y1 == 0 or z1 == 0:
+        return (1, 1, 0)
+    delta = z1 * z1 % P
+    gamma = y1 * y1 % P
+    beta = x1 * gamma % P
+    alpha = 3 * (x1 - delta) * (x1 + delta) % P
+    x3 = (alpha * alpha - 8 * beta) % P
+    z3 = ((y1 + z1) * (y1 + z1) - gamma - delta) % P
+    y3 = (alpha * (4 * beta - x3) - 8 * gamma * gamma) % P
+    return (x3, y3, z3)
+
+
+def _add_affine(pt, q):
+    x1, y1, z1 = pt
+    x2, y2 = q
+    if z1 == 0:
+        return (x2, y2, 1)
+    z1z1 = z1 * z1 % P
+    u2 = x2 * z1z1 % P
+    s2 = y2 * z1 * z1z1 % P
+    h = (u2 - x1) % P
+    r = (s2 - y1) % P
+    if h == 0:
+        return _double(pt) if r == 0 else (1, 1, 0)
+    hh = h * h % P
+    hhh = h * hh % P
+    v = x1 * hh % P
+    x3 = (r * r - hhh - 2 * v) % P
+    y3 = (r * (v - x3) - y1 * hhh) % P
+    return (x3, y3, z1 * h % P)
+
+
+def _to_affine(pt):
+    x, y, z = pt
+    if z == 0:
+        return None
+    zi = pow(z, -1, P)
+    zi2 = zi * zi % P
+    return (x * zi2 % P, y * zi2 * zi % P)
+
+
+class FixedBaseTable:
+    """table[i][j] = j * 16^i * base (affine), so k*base is one addition per nibble of k."""
+
+    def __init__(self, x, y):
+        rows = []
+        base = (x, y, 1)
+        for _ in range(WINDOW_COUNT):
+            base_affine = _to_affine(base)
+            row = [None, base_affine]
+            acc = (base_affine[0], base_affine[1], 1)
+            for _ in range(2, WINDOW_SIZE):
+                acc = _add_affine(acc, base_affine)
+                row.append(_to_affine(acc))
+            rows.append(row)
+            for _ in range(WINDOW_BITS):
+                base = _double(base)
+        self.rows = rows
+
+    def multiply(self, k):
+        acc = (1, 1, 0)
+        i = 0
+        while k:
+            digit = k & (WINDOW_SIZE - 1)
+            if digit:
+                acc = _add_affine(acc, self.rows[i][digit])
+            k >>= WINDOW_BITS
+            i += 1
+        return acc
+
+
+_G_TABLE = None
+
+
+def g_table():
+    global _G_TABLE
+    if _G_TABLE is None:
+        _G_TABLE = FixedBaseTable(GX, GY)
+    return _G_TABLE
+
+
+def _add_jacobian(p1, p2):
+    if p2[2] == 0:
+        return p1
+    return _add_affine(p1, _to_affine(p2))
+
+
+class Sm2Signer:
+    """Per-key SM2 context. ``private_key`` may be None for a verify-only context."""
+
+    def __init__(self, private_key: bytes, public_key: bytes, user_id: bytes = DEFAULT_USER_ID):
+        self.d = int.from_bytes(private_key, "big") if private_key is not None else None
+        self.public_key = bytes(public_key)
+        self.px = int.from_bytes(self.public_key[0:32], "big")
+        self.py = int.from_bytes(self.public_key[32:64], "big")
+        self.d_inv = pow(self.d + 1, -1, N) if self.d is not None else None
+        entl = (len(user_id) * 8).to_bytes(2, "big")
+        self.z = sm3_digest(entl + user_id + b"".join(v.to_bytes(32, "big") for v in (A, B, GX, GY, self.px, self.py)))
+        self._pk_table = None
+
+    def digest(self, msg: bytes) -> int:
+        return int.from_bytes(sm3_digest(self.z + msg), "big")
+
+    def sign(self, msg: bytes, k: int = None) -> bytes:
+        """64-byte r||s signature; pass k only for reproducible test vectors."""
+        e = self.digest(msg)
+        table = g_table()
+        while True:
+            kk = k if k is not None else secrets.randbelow(N - 1) + 1
+            x1 = _to_affine(table.multiply(kk))[0]
+            r = (e + x1) % N
+            if r != 0 and r + kk != N:
+                s = (self.d_inv * (kk + r) - r) % N
+                if s != 0:
+                    return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+            if k is not None:
+                return None
+
+    def verify(self, sig: bytes, msg: bytes) -> bool:
+        if len(sig) != 64:
+            return False
+        r = int.from_bytes(sig[0:32], "big")
+        s = int.from_bytes(sig[32:64], "big")
+        if not (0 < r < N and 0 < s < N):
+            return False
+        t = (r + s) % N
+        if t == 0:
+            return False
+        if self._pk_table is None:
+            self._pk_table = FixedBaseTable(self.px, self.py)
+        pt = _to_affine(_add_jacobian(g_table().multiply(s), self._pk_table.multiply(t)))
+        if pt is None:
+            return False
+        return r == (self.digest(msg) + pt[0]) % N
@@ -0,0 +1,230 @@
+import sys
+import time
+
+import pytest
+
+sys.path.append('.')
+
+from box import Box
+from dioxide_python_sdk.client.account import DioxAccount, DioxAddress
+from dioxide_python_sdk.client.contract import ContractInvokeID, CORE_CONTRACT_COIN, DAPP_ID_CORE
+from dioxide_python_sdk.client.core_compose import CORE_FUNCTIONS
+from dioxide_python_sdk.client.dioxclient import DioxClient, DioxError
+from dioxide_python_sdk.client.transaction import UnsignedTransaction
+from dioxide_python_sdk.client.types import EngineID
+from dioxide_python_sdk.utils.serializer import serialize
+
+
+class FakeNode(DioxClient):
+    """tx.compose stand-in: core.wallet.transfer with an opcode and build the composer has to learn."""
+
+    OPCODE = 5
+    BUILD = 3
+
+    TOKEN_IDS = {"DIO": 1, "USDX": 77}
+
+    def __init__(self, garble=False, fca_encoding=None):
+        super().__init__(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        self.composed = []
+        self.garble = garble
+        self.fca_encoding = fca_encoding or node_fca
+        self.token_requests = []
+
+    def make_request(self, method, params):
+        assert method == "dx.token"
+        self.token_requests.append(params["symbol"])
+        if params["symbol"] not in self.TOKEN_IDS:
+            raise DioxError(-1, "token not found")
+        return {"TokenId": self.TOKEN_IDS[params["symbol"]]}
+
+    def get_isn(self, address):
+        return 11
+
+    def compose_transaction(self, sender, function, args, tokens=None, isn=None, is_delegatee=False,
+                            gas_price=None, gas_limit=None, ttl=None):
+        assert isinstance(sender, str)
+        self.composed.append(function)
+        if not function.startswith("core."):
+            tx, signature = self._prepare_local_transaction(sender, function, None, CONTRACT_INFO, is_delegatee,
+                                                            gas_price, gas_limit, ttl)
+            tx.set_isn(11 if isn is None else isn)
+            tx.mode |= 0x400
+            self.attach(tx, tokens)
+            return tx.serialize()
+        cid = ContractInvokeID(sn=CORE_CONTRACT_COIN, engine_id=EngineID.Core.value, dapp_id=DAPP_ID_CORE,
+                               scope=2, build=self.BUILD)
+        tx = UnsignedTransaction(cid, self.OPCODE, timestamp=time.time_ns() // 1_000_000)
+        tx.set_isn(11 if isn is None else isn)
+        tx.set_gas_price(1000 if gas_price is None else gas_price)
+        tx.set_gas_limit(300000 if gas_limit is None else gas_limit)
+        tx.ttl = 60 if ttl is None else ttl
+        tx.input = transfer_input(args["To"], args["Amount"], self.TOKEN_IDS[args["TokenId"]])
+        if self.garble:
+            tx.input = tx.input[::-1]
+        tx.input_size = len(tx.input)
+        self.attach(tx, tokens)
+        return tx.serialize()
+
+    def attach(self, tx, tokens):
+        # written by hand, not with add_fca, so the client's encoder is checked against it
+        for token in tokens or []:
+            for symbol, amount in token.items():
+                tx.fca_token.extend(self.fca_encoding(self.TOKEN_IDS[symbol], int(amount)))
+                tx.tsc += 1
+
+
+def node_fca(token_id, amount):
+    # uint64 id, then a one-limb bigint: sign|count byte and the limb
+    return token_id.to_bytes(8, "little") + bytes([1]) + amount.to_bytes(8, "little")
+
+
+def legacy_fca(token_id, amount):
+    return token_id.to_bytes(8, "little") + amount.to_bytes((amount.bit_length() + 7) // 8, "little")
+
+
+DAPP_CONTRACT_ID = (5 << 36) | (2 << 32) | (3 << 20)
+CONTRACT_INFO = Box({"ContractID": DAPP_CONTRACT_ID, "ContractVersionID": DAPP_CONTRACT_ID | 1,
+                     "Functions": [{"Name": "ping", "Opcode": 3, "Params": []}]})
+
+
+def transfer_input(to, amount, token_id):
+    return DioxAddress.from_key(to).address_bytes + serialize("bigint", int(amount)) + token_id.to_bytes(8, "little")
+
+
+def transfer_args(receiver, amount):
+    return {"To": receiver.address, "Amount": str(amount), "TokenId": "DIO"}
+
+
+class TestCoreCompose:
+    def test_transfer_encoder_is_fixed(self):
+        client = FakeNode()
+        to = DioxAccount.generate_key_pair().address
+        encoded = CORE_FUNCTIONS["core.wallet.transfer"].encode(client, {"To": to, "Amount": "300", "TokenId": "USDX"})
+        # address bytes, bigint 300 (1 limb), then the dx.token id as uint64
+        assert encoded == DioxAddress.from_key(to).address_bytes + bytes.fromhex("012c01000000000000") + \
+            bytes.fromhex("4d00000000000000")
+        assert client.token_requests == ["USDX"]
+        with pytest.raises(ValueError):
+            CORE_FUNCTIONS["core.wallet.transfer"].encode(client, {"To": to, "Amount": "1"})
+
+    def test_learns_from_first_compose_then_builds_locally(self):
+        client = FakeNode()
+        user, receiver = DioxAccount.generate_key_pair(), DioxAccount.generate_key_pair()
+        first = client.compose_transaction_local(user, "core.wallet.transfer", transfer_args(receiver, 5))
+        assert len(client.composed) == 1 and client.core_composer.is_calibrated("core.wallet.transfer")
+
+        local = client.compose_transaction_local(user, "core.wallet.transfer", transfer_args(receiver, 9), isn=12)
+        assert len(client.composed) == 1
+        node = client.compose_transaction(user.address, "core.wallet.transfer", transfer_args(receiver, 9), isn=12)
+        assert local[0:2] == node[0:2] and local[8:] == node[8:]
+        assert local[16] == FakeNode.OPCODE and local[28] == FakeNode.BUILD
+        assert first[17] == CORE_CONTRACT_COIN
+
+    def test_mismatch_keeps_rpc(self):
+        client = FakeNode(garble=True)
+        user, receiver = DioxAccount.generate_key_pair(), DioxAccount.generate_key_pair()
+        for _ in range(2):
+            client.compose_transaction_local(user, "core.wallet.transfer", transfer_args(receiver, 5))
+        assert len(client.composed) == 2
+        assert not client.core_composer.supports("core.wallet.transfer")
+
+    def test_token_attachments_are_built_locally_after_matching_the_node(self):
+        client = FakeNode()
+        user, receiver = DioxAccount.generate_key_pair(), DioxAccount.generate_key_pair()
+        tokens = [{"USDX": 250}, {"DIO": 3}]
+        client.compose_transaction_local(user, "core.wallet.transfer", transfer_args(receiver, 4))
+        assert client.core_composer.is_calibrated("core.wallet.transfer") and client.core_composer.fca_layout is None
+        # the first token-carrying call is composed by the node and rebuilt byte for byte
+        client.compose_transaction_local(user, "core.wallet.transfer", transfer_args(receiver, 5), tokens=tokens)
+        assert len(client.composed) == 2 and client.core_composer.fca_layout is True
+
+        local = client.compose_transaction_local(user, "core.wallet.transfer", transfer_args(receiver, 6),
+                                                 isn=12, tokens=tokens)
+        node = client.compose_transaction(user.address, "core.wallet.transfer", transfer_args(receiver, 6),
+                                          tokens=tokens, isn=12)
+        assert len(client.composed) == 3
+        assert local[0:2] == node[0:2] and local[8:] == node[8:]
+        assert (int.from_bytes(local[12:14], "little") >> 13) & 0x3 == 2
+        # each symbol is resolved through dx.token once, for TokenId and attachments alike
+        assert sorted(client.token_requests) == ["DIO", "USDX"]
+
+    def test_token_layout_mismatch_keeps_rpc(self):
+        client = FakeNode(fca_encoding=legacy_fca)
+        user, receiver = DioxAccount.generate_key_pair(), DioxAccount.generate_key_pair()
+        client.compose_transaction_local(user, "core.wallet.transfer", transfer_args(receiver, 4))
+        for _ in range(2):
+            client.compose_transaction_local(user, "core.wallet.transfer", transfer_args(receiver, 5),
+                                             tokens=[{"USDX": 250}])
+            client.compose_transaction_local(user, "app.bank.ping", {}, contract_info=CONTRACT_INFO,
+                                             tokens=[{"USDX": 2}])
+        assert client.core_composer.fca_layout is False
+        assert client.composed.count("core.wallet.transfer") == 3 and client.composed.count("app.bank.ping") == 2
+        # calls without attachments stay local
+        client.compose_transaction_local(user, "core.wallet.transfer", transfer_args(receiver, 6))
+        assert len(client.composed) == 5
+
+    def test_dapp_call_with_tokens_is_composed_locally(self):
+        client = FakeNode()
+        user = DioxAccount.generate_key_pair()
+        isn_queries = []
+        client.get_isn = lambda address: isn_queries.append(address) or 4
+        node = client.compose_transaction_local(user, "app.bank.ping", {}, contract_info=CONTRACT_INFO,
+                                                tokens=[{"USDX": 2}], isn=7)
+        assert client.composed == ["app.bank.ping"] and client.core_composer.fca_layout is True
+        local = client.compose_transaction_local(user, "app.bank.ping", {}, contract_info=CONTRACT_INFO,
+                                                 tokens=[{"USDX": 2}])
+        assert client.composed == ["app.bank.ping"] and isn_queries == [user.address]
+        assert local.endswith(bytes.fromhex("4d00000000000000" "010200000000000000"))
+        assert (int.from_bytes(local[12:14], "little") >> 13) & 0x3 == 1
+        assert local[0:2] == node[0:2] and local[12:] == node[12:]
+
+    def test_send_transaction_composes_non_core_functions_by_rpc(self):
+        client = FakeNode()
+        user = DioxAccount.generate_key_pair()
+        client.send_raw_transaction = lambda signed, sync=False, timeout=60: "hash"
+        client.compose_transaction = lambda sender, function, args, **kwargs: client.composed.append(function) or b"tx"
+        client.core_composer.compose = lambda *args, **kwargs: pytest.fail("core composer used for a dapp function")
+        assert client.send_transaction(user, "app.bank.ping", {}) == "hash"
+        assert client.composed == ["app.bank.ping"]
+
+    def test_token_attachments(self):
+        client = FakeNode()
+        assert client.token_attachments([{"DIO": "10"}, ("USDX", 2)]) == [(1, 10), (77, 2)]
+        assert client.token_attachments({"USDX": 1, 5: 9}) == [(77, 1), (5, 9)]
+        with pytest.raises(DioxError):
+            client.get_token_id("NOPE")
+
+
+@pytest.fixture
+def live_client():
+    client = DioxClient()
+    try:
+        client.get_block_number()
+    except Exception:
+        pytest.skip("no dioxide node available")
+    return client
+
+
+CORE_CALLS = [
+    ("core.coin.mint", lambda user, other: {"Amount": "1000"}),
+    ("core.wallet.transfer", lambda user, other: transfer_args(other, 10)),
+    ("core.delegation.create", lambda user, other: {"Type": 10, "Name": "cctest", "Deposit": "100"}),
+]
+
+
+class TestCoreComposeLive:
+    @pytest.mark.parametrize("function,make_args", CORE_CALLS)
+    def test_byte_equal_to_tx_compose(self, live_client, function, make_args):
+        user, other = DioxAccount.generate_key_pair(), DioxAccount.generate_key_pair()
+        args = make_args(user, other)
+        sender = "{}:{}".format(user.address, user.account_type.name.lower())
+        raw = live_client.compose_transaction(sender, function, args, isn=0)
+        # calibrate rebuilds the node's transaction locally and compares every byte
+        assert live_client.core_composer.calibrate(function, raw, sender, args)
+
+    def test_token_attachments_byte_equal_to_tx_compose(self, live_client):
+        user, other = DioxAccount.generate_key_pair(), DioxAccount.generate_key_pair()
+        sender = "{}:{}".format(user.address, user.account_type.name.lower())
+        args, tokens = transfer_args(other, 10), [{"DIO": 7}]
+        raw = live_client.compose_transaction(sender, "core.wallet.transfer", args, tokens=tokens, isn=0)
+        assert live_client.core_composer.calibrate("core.wallet.transfer", raw, sender, args, tokens=tokens)
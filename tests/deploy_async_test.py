@@ -0,0 +1,154 @@
+import sys
+import threading
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.dioxclient import DioxClient, DioxError
+from dioxide_python_sdk.client.head_tracker import HeadTracker
+from dioxide_python_sdk.client.txn_tracker import TxnTracker
+from box import Box  # type: ignore
+
+
+class DeployClient(DioxClient):
+    """Sends deploys to nowhere; the test drives confirmations, Scheduled and the head."""
+
+    def __init__(self):
+        super().__init__(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        self.scheduled = []
+        self.composed = []
+        self.lock = threading.Lock()
+        self._head_tracker = HeadTracker(self, use_subscription=False)
+        self._head_tracker.update(100)
+        self._txn_tracker = TxnTracker(self, poll_after=60, use_subscription=False)
+
+    def compose_transaction(self, sender, function, args, tokens=None, isn=None, is_delegatee=False, **kwargs):
+        with self.lock:
+            self.composed.append((sender, function, args, is_delegatee))
+            return "deploy{}".format(len(self.composed)).encode()
+
+    def send_raw_transaction(self, signed_txn, sync=False, timeout=60):
+        assert not sync
+        return signed_txn[-7:].decode()
+
+    def get_block_number(self):
+        return self._head_tracker.height
+
+    def get_contract_state(self, dapp_name, contract_name, scope, key):
+        return Box({"State": {"Scheduled": list(self.scheduled)}}, default_box=True)
+
+
+class Signer:
+    def sign_diox_transaction(self, txn):
+        return txn
+
+
+def confirm(client, tx_hash, state="TXN_CONFIRMED"):
+    client.txn_tracker.update({"Hash": tx_hash, "ConfirmState": state, "Invocation": {"Relays": []}})
+
+
+def wait_sent(client, count):
+    for _ in range(200):
+        if len(client.composed) >= count and len(client.txn_tracker) >= count:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("deployments were not sent")
+
+
+class TestContractDeployer:
+    def test_deployments_resolve_once_head_passes_target_height(self, tmp_path):
+        client = DeployClient()
+        paths = []
+        for name in ("a", "b"):
+            path = tmp_path / "{}.prd".format(name)
+            path.write_text("contract {} {{}}".format(name))
+            paths.append(str(path))
+        client.scheduled = [{"BuildKey": "deploy1", "TargetHeight": 103},
+                            {"BuildKey": "deploy2", "TargetHeight": 105}]
+        signer = Signer()
+        futures = client.deploy_contracts_async([("dappa", signer, {paths[0]: None}),
+                                                 ("dappb", signer, {paths[1]: {"x": 1}})], timeout=None)
+        wait_sent(client, 2)
+        assert sorted(args["code"][0] for _, _, args, _ in client.composed) == ["contract a {}", "contract b {}"]
+        assert all(function == "core.delegation.deploy_contracts" and delegatee
+                   for _, function, _, delegatee in client.composed)
+        for tx_hash in ("deploy1", "deploy2"):
+            confirm(client, tx_hash)
+
+        client.head_tracker.update(103)
+        threading.Event().wait(0.1)
+        assert not any(f.done() for f in futures)
+        client.head_tracker.update(104)
+        assert futures[0].result(timeout=2) == "deploy1"
+        assert not futures[1].done()
+        client.head_tracker.update(106)
+        assert sorted(f.result(timeout=2) for f in futures) == ["deploy1", "deploy2"]
+        client.deployer.close()
+
+    def test_unscheduled_deploy_resolves_on_confirmation(self):
+        client = DeployClient()
+        future = client.deployer.submit("dappa", Signer(), {"code": ["contract C {}"], "cargs": [""]})
+        wait_sent(client, 1)
+        confirm(client, "deploy1")
+        assert future.result(timeout=2) == "deploy1"
+        client.deployer.close()
+
+    def test_failed_and_timed_out_deploys(self):
+        client = DeployClient()
+        client.scheduled = [{"BuildKey": "deploy2", "TargetHeight": 500}]
+        deployer = client.deployer
+        deployer.wait_slice = 0.05
+        failed = deployer.submit("dappa", Signer(), {"code": ["contract C {}"], "cargs": [""]})
+        wait_sent(client, 1)
+        late = deployer.submit("dappb", Signer(), {"code": ["contract D {}"], "cargs": [""]}, timeout=0.2)
+        wait_sent(client, 2)
+        confirm(client, "deploy1", "TXN_ABORTED")
+        confirm(client, "deploy2")
+        for future in (failed, late):
+            error = future.exception(timeout=2)
+            assert isinstance(error, DioxError)
+        assert failed.exception().code == -10008
+        assert late.exception().code == -10000
+        deployer.close()
+
+    def test_invalid_dapp_name_fails_the_future(self):
+        client = DeployClient()
+        future = client.deployer.submit("", Signer(), {"code": ["contract C {}"], "cargs": [""]})
+        assert future.exception(timeout=2).code == -10002
+        client.deployer.close()
+
+    def test_timeout_applies_while_waiting_for_confirmation(self):
+        client = DeployClient()
+        deployer = client.deployer
+        deployer.wait_slice = 0.05
+        future = deployer.submit("dappa", Signer(), {"code": ["contract C {}"], "cargs": [""]}, timeout=0.2)
+        wait_sent(client, 1)
+        other = client.track_transaction("deploy1")
+        # never confirmed: the deadline set at submit still fails it
+        assert future.exception(timeout=2).code == -10000
+        # another caller waiting on the same hash is not cancelled
+        assert not other.cancelled()
+        confirm(client, "deploy1")
+        assert other.result(timeout=2) == "TXN_CONFIRMED"
+        deployer.close()
+
+    def test_send_failure_logs_no_transaction_hash(self, monkeypatch):
+        client = DeployClient()
+        warnings = []
+        monkeypatch.setattr(client.deployer.logger, "warning", warnings.append)
+        future = client.deployer.submit("", Signer(), {"code": ["contract C {}"], "cargs": [""]})
+        assert future.exception(timeout=2).code == -10002
+        assert warnings and all("None" not in w and " failed before it was sent" in w for w in warnings)
+        client.deployer.close()
+
+    def test_failures_are_not_printed(self, capsys):
+        client = DeployClient()
+
+        def unavailable(*args):
+            raise DioxError(-1, "state unavailable")
+        client.get_contract_state = unavailable
+        future = client.deployer.submit("dappa", Signer(), {"code": ["contract C {}"], "cargs": [""]})
+        wait_sent(client, 1)
+        confirm(client, "deploy1")
+        assert future.exception(timeout=2).code == -1
+        client.deployer.close()
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,80 @@
+import sys
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.deploy_plan import (
+    CHANGED, NEW, UNCHANGED, DeployPlanner, contract_name_of, source_digest)
+from dioxide_python_sdk.client.dioxclient import DioxClient, DioxError
+
+BANK = "contract Bank {\n    @global address owner;\n}\n"
+ENS = "import Bank as bank;\n\ncontract ENS {\n}\n"
+
+
+class ChainClient(DioxClient):
+    """dx.contract_info / dx.source_code over an in-memory dapp."""
+
+    def __init__(self, deployed):
+        super().__init__(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        self.deployed = dict(deployed)
+        self.calls = []
+        self.deploys = []
+
+    def make_request(self, method, params):
+        self.calls.append(method)
+        name = params["contract"].split(".", 1)[1]
+        if name not in self.deployed:
+            raise DioxError(-1, "contract not found")
+        if method == "dx.contract_info":
+            return {"Hash": "build-" + source_digest(self.deployed[name])[:8]}
+        if method == "dx.source_code":
+            return {"Source": self.deployed[name]}
+        raise AssertionError(method)
+
+    def deploy_contracts(self, dapp_name, delegator, contracts=None, compile_time=None):
+        self.deploys.append(dict(contracts))
+        return "deployhash"
+
+
+def write(tmp_path, name, source):
+    path = tmp_path / name
+    path.write_text(source)
+    return str(path)
+
+
+class TestDeployPlanner:
+    def test_contract_name_and_digest(self):
+        assert contract_name_of(ENS) == "ENS"
+        assert contract_name_of("// nothing here") is None
+        assert source_digest(BANK) == source_digest(BANK.replace("\n", "  \r\n"))
+        assert source_digest(BANK) != source_digest(BANK.replace("owner", "admin"))
+
+    def test_only_new_and_changed_contracts_are_planned(self, tmp_path):
+        client = ChainClient({"Bank": BANK, "ENS": ENS})
+        bank = write(tmp_path, "bank.gcl", BANK)
+        ens = write(tmp_path, "ens.gcl", ENS.replace("{\n}", "{\n    @global uint64 cid;\n}"))
+        ctrl = write(tmp_path, "controller.gcl", "contract Controller {\n}\n")
+        plan = client.plan_deploy("dapp", {bank: {"_owner": "a"}, ens: None, ctrl: None})
+        assert plan.entries == [(bank, "Bank", UNCHANGED), (ens, "ENS", CHANGED), (ctrl, "Controller", NEW)]
+        assert plan.contracts == {ens: None, ctrl: None}
+        assert plan.unchanged == ["Bank"]
+
+    def test_verified_match_skips_source_download(self, tmp_path):
+        client = ChainClient({"Bank": BANK})
+        state = str(tmp_path / "plan.json")
+        bank = write(tmp_path, "bank.gcl", BANK)
+        assert not DeployPlanner(client, state).plan("dapp", {bank: None})
+        client.calls.clear()
+        # a fresh planner (new process) reuses the stored match
+        assert not DeployPlanner(client, state).plan("dapp", {bank: None})
+        assert client.calls == ["dx.contract_info"]
+
+        client.deployed["Bank"] = BANK.replace("owner", "admin")
+        assert DeployPlanner(client, state).plan("dapp", {bank: None}).entries[0][2] == CHANGED
+
+    def test_deploy_changed_contracts_batches_changes(self, tmp_path):
+        client = ChainClient({"Bank": BANK})
+        bank = write(tmp_path, "bank.gcl", BANK)
+        ens = write(tmp_path, "ens.gcl", ENS)
+        assert client.deploy_changed_contracts("dapp", None, {bank: None}) is None
+        assert client.deploy_changed_contracts("dapp", None, {bank: None, ens: {"_owner": "a"}}) == "deployhash"
+        assert client.deploys == [{ens: {"_owner": "a"}}]
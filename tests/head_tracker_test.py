@@ -0,0 +1,65 @@
+import sys
+import threading
+import time
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.head_tracker import HeadTracker
+
+
+class FakeClient:
+    def __init__(self, start=10):
+        self.height = start
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get_block_number(self):
+        with self.lock:
+            self.calls += 1
+            self.height += 1
+            return self.height
+
+
+class TestHeadTracker:
+    def test_poll_fallback_shared_by_waiters(self):
+        client = FakeClient()
+        tracker = HeadTracker(client, poll_interval=0.01, use_subscription=False).start()
+        results = []
+
+        def waiter():
+            results.append(tracker.wait_until_height(15, timeout=5))
+
+        threads = [threading.Thread(target=waiter) for _ in range(50)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        tracker.stop()
+
+        assert results == [True] * 50
+        # one poller regardless of waiter count
+        assert client.calls < 20
+
+    def test_pushed_header_wakes_waiters(self):
+        tracker = HeadTracker(FakeClient(), poll_interval=0.01, stale_after=60)
+        tracker._started = True
+        seen = []
+        tracker.add_listener(lambda h, hs: seen.append((h, hs)))
+
+        def push():
+            time.sleep(0.05)
+            tracker._on_header({"Height": 100, "Hash": "abc"})
+
+        threading.Thread(target=push).start()
+        assert tracker.wait_until_height(100, timeout=5) is True
+        assert tracker.height == 100 and tracker.hash == "abc"
+        assert seen == [(100, "abc")]
+
+        # stale heights are ignored
+        assert tracker.update(99) is False
+        assert tracker.height == 100
+
+    def test_timeout(self):
+        tracker = HeadTracker(FakeClient(), stale_after=60)
+        tracker._started = True
+        assert tracker.wait_until_height(5, timeout=0.05) is False
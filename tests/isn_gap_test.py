@@ -0,0 +1,101 @@
+import sys
+import threading
+import time
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.account import DioxAccount
+from dioxide_python_sdk.client.dioxclient import DioxClient
+from dioxide_python_sdk.client.isn import IsnGapMonitor, isn_of
+from dioxide_python_sdk.client.txn_tracker import TxnTracker
+
+
+class ChainClient(DioxClient):
+    """Records what the monitor resubmits; dx.isn is whatever the test sets."""
+
+    def __init__(self, chain_isn=5):
+        super().__init__(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        self.chain_isn = chain_isn
+        self.composed = []
+        self.fail_send_isns = set()
+        self.sends = 0
+        self.lock = threading.Lock()
+        self._txn_tracker = TxnTracker(self, poll_after=60, use_subscription=False)
+
+    def get_isn(self, address):
+        return self.chain_isn
+
+    def compose_transaction_local(self, sender, function, args, isn=None, ttl=None, **kwargs):
+        with self.lock:
+            self.composed.append((function, isn, ttl, kwargs.get("tokens", None)))
+        return bytes(2) + (time.time_ns() // 1_000_000).to_bytes(6, 'little') + isn.to_bytes(4, 'little') + (1).to_bytes(2, 'little') + function.encode()
+
+    def send_raw_transaction(self, signed_txn, sync=False, timeout=60):
+        isn = isn_of(signed_txn)
+        with self.lock:
+            if isn in self.fail_send_isns:
+                raise RuntimeError("connection reset")
+            self.sends += 1
+            return "hash{}-{}".format(isn, self.sends)
+
+
+def in_flight(monitor, user, isns, **fields):
+    for isn in isns:
+        monitor.allocated(user, isn, dict({"user": user, "function": "demo.C.f{}".format(isn), "args": {}}, **fields))
+        monitor.sent(user.address, isn, "hash{}".format(isn))
+
+
+class TestIsnGapMonitor:
+    def test_slow_transactions_are_not_repaired(self):
+        client = ChainClient(chain_isn=5)
+        user = DioxAccount.generate_key_pair()
+        monitor = IsnGapMonitor(client)
+        in_flight(monitor, user, [5, 6, 7])
+        assert monitor.gaps(user.address) == []
+        assert monitor.check_once() == 0
+        assert client.composed == []
+
+    def test_failed_isns_are_resubmitted_with_every_field_then_filled(self):
+        client = ChainClient(chain_isn=5)
+        user = DioxAccount.generate_key_pair()
+        monitor = IsnGapMonitor(client, max_resubmits=1)
+        replaced = []
+        monitor.add_listener(lambda *event: replaced.append(event))
+        in_flight(monitor, user, [5, 6, 7], ttl=30, tokens=[{"DIO": 1}])
+
+        client.txn_tracker.update({"Hash": "hash6", "ConfirmState": "TXN_EXPIRED"})
+        client.txn_tracker.update({"Hash": "hash5", "ConfirmState": "TXN_CONFIRMED", "Invocation": {"Relays": []}})
+        client.chain_isn = 6
+        assert monitor.gaps(user.address) == [6]
+        assert monitor.check_once() == 1
+        assert client.composed == [("demo.C.f6", 6, 30, [{"DIO": 1}])]
+        assert len(monitor) == 2
+        new_hash = replaced[0][3]
+        assert replaced == [(user.address, 6, "hash6", new_hash)]
+        assert monitor.replacement_of("hash6") == new_hash
+
+        # the resubmission fails too: the ISN is filled with a no-op
+        client.txn_tracker.update({"Hash": new_hash, "ConfirmState": "TXN_ABORTED"})
+        assert monitor.check_once() == 1
+        assert client.composed[-1][0:2] == ("core.wallet.transfer", 6)
+        assert monitor.resubmitted == 1 and monitor.filled == 1
+        assert monitor.replacement_of("hash6") == replaced[-1][3]
+
+        client.chain_isn = 8
+        assert monitor.check_once() == 0
+        assert len(monitor) == 0
+        assert monitor.replacement_of("hash6") == "hash6"
+
+    def test_pipeline_reports_send_failures(self):
+        client = ChainClient(chain_isn=5)
+        client.fail_send_isns = {6}
+        user = DioxAccount.generate_key_pair()
+        monitor = IsnGapMonitor(client, use_tracker=False)
+        calls = [{"user": user, "function": "demo.C.f{}".format(i), "args": {}} for i in range(3)]
+        results = list(client.submit_stream(calls, gap_monitor=monitor))
+        assert sum(isinstance(r, Exception) for _, r in results) == 1
+
+        assert monitor.gaps(user.address) == [6]
+        client.fail_send_isns = set()
+        assert monitor.check_once() == 1
+        assert [isn for _, isn, _, _ in client.composed].count(6) == 2
@@ -0,0 +1,124 @@
+import sys
+import threading
+import time
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.account import DioxAccount
+from dioxide_python_sdk.client.dioxclient import DioxClient
+from dioxide_python_sdk.client.isn import IsnAllocator
+from dioxide_python_sdk.client.pipeline import SubmissionPipeline
+from dioxide_python_sdk.utils.gadget import get_txn_pow_difficulty
+from dioxide_python_sdk.utils.pow import is_nonce_valid, pow_data_of
+
+
+def fake_txdata(isn, function):
+    # version..timestamp, isn, ttl_sc_tsc with ttl=2 minutes, then the function name as payload
+    timestamp = time.time_ns() // 1_000_000
+    if function.endswith(".stale"):
+        timestamp -= 110 * 1000
+    return bytes(2) + timestamp.to_bytes(6, 'little') + isn.to_bytes(4, 'little') + (1).to_bytes(2, 'little') + function.encode()
+
+
+class StubClient(DioxClient):
+    def __init__(self):
+        super().__init__(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        self.sent = []
+        self.isn_queries = 0
+        self.lock = threading.Lock()
+
+    def get_isn(self, address):
+        self.isn_queries += 1
+        return 5
+
+    def compose_transaction_local(self, sender, function, args, isn=None, ttl=None, **kwargs):
+        if function.endswith(".broken"):
+            raise ValueError("no such function")
+        return fake_txdata(isn, function)
+
+    def compose_transaction(self, sender, function, args, tokens=None, isn=None, ttl=None, **kwargs):
+        return fake_txdata(isn, function)
+
+    def send_raw_transaction(self, signed_txn, sync=False, timeout=60):
+        with self.lock:
+            self.sent.append(signed_txn)
+            return "hash{}".format(len(self.sent))
+
+
+class TestSubmitStream:
+    def test_all_calls_complete_with_sequential_isns(self):
+        client = StubClient()
+        user = DioxAccount.generate_key_pair()
+        calls = [{"user": user, "function": "demo.C.f{}".format(i), "args": {}} for i in range(10)]
+        calls.append({"user": user, "function": "core.coin.mint", "args": {"Amount": "1"}})
+        results = list(client.submit_stream(calls, send_concurrency=4, queue_size=2))
+
+        assert len(results) == len(calls)
+        assert all(isinstance(r, str) for _, r in results)
+        assert sorted(id(c) for c, _ in results) == sorted(id(c) for c in calls)
+        assert client.isn_queries == 1
+        isns = sorted(int.from_bytes(tx[8:12], 'little') for tx in client.sent)
+        assert isns == list(range(5, 5 + len(calls)))
+
+        for tx in client.sent:
+            body = tx[:-12]
+            threshold = get_txn_pow_difficulty(body).threshold
+            for k in range(3):
+                nonce = int.from_bytes(tx[len(body) + 4 * k:len(body) + 4 * k + 4], 'little')
+                assert is_nonce_valid(pow_data_of(body), nonce, threshold)
+
+    def test_stage_errors_are_yielded(self):
+        client = StubClient()
+        user = DioxAccount.generate_key_pair()
+        calls = [{"user": user, "function": "demo.C.ok", "args": {}},
+                 {"user": user, "function": "demo.C.broken", "args": {}}]
+        results = dict((c["function"], r) for c, r in client.submit_stream(calls))
+        assert isinstance(results["demo.C.ok"], str)
+        assert isinstance(results["demo.C.broken"], ValueError)
+
+    def test_transactions_expiring_in_flight_are_dropped(self):
+        client = StubClient()
+        user = DioxAccount.generate_key_pair()
+        calls = [{"user": user, "function": "demo.C.ok", "args": {}},
+                 {"user": user, "function": "demo.C.stale", "args": {}}]
+        results = dict((c["function"], r) for c, r in client.submit_stream(calls))
+        assert isinstance(results["demo.C.ok"], str)
+        assert results["demo.C.stale"].code == -10007
+        assert len(client.sent) == 1
+
+    def test_failed_stages_leave_no_isn_holes(self):
+        client = StubClient()
+        user = DioxAccount.generate_key_pair()
+        calls = [{"user": user, "function": "demo.C.broken", "args": {}},
+                 {"user": user, "function": "demo.C.ok", "args": {}},
+                 {"user": user, "function": "demo.C.stale", "args": {}},
+                 {"user": user, "function": "demo.C.ok2", "args": {}}]
+        pipeline = SubmissionPipeline(client, compose_workers=4)
+        results = dict((c["function"], r) for c, r in pipeline.run(calls))
+        assert isinstance(results["demo.C.broken"], ValueError)
+        assert results["demo.C.stale"].code == -10007
+        isns = sorted(int.from_bytes(tx[8:12], 'little') for tx in client.sent)
+        assert isns == list(range(5, 5 + len(isns)))
+        assert isns[-1] + 1 == client.isn_allocator.allocate(user.address)
+        assert pipeline.filled == len(isns) - 2
+
+    def test_released_isns_are_reused_first(self):
+        allocator = IsnAllocator(StubClient())
+        assert [allocator.allocate("a") for _ in range(4)] == [5, 6, 7, 8]
+        allocator.release("a", 6)
+        allocator.release("a", 8)
+        assert allocator.allocate("a") == 6
+        allocator.release("a", 7)
+        assert allocator.allocate("a") == 7
+        assert allocator.allocate("a") == 8
+        assert allocator.released("a") == []
+
+    def test_sends_are_paced_by_rate_controller(self):
+        from dioxide_python_sdk.client.rate_control import AimdRateController
+        client = StubClient()
+        user = DioxAccount.generate_key_pair()
+        controller = AimdRateController(initial_rate=1000)
+        calls = [{"user": user, "function": "demo.C.f{}".format(i), "args": {}} for i in range(5)]
+        results = list(client.submit_stream(calls, rate_controller=controller))
+        assert all(isinstance(r, str) for _, r in results)
+        assert controller._sent == 5 and controller._errors == 0
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append('.')
+
+from dioxide_python_sdk.utils.gadget import calculate_txn_pow
+from dioxide_python_sdk.utils.pow_cost import PowCostEstimator, signed_size
+
+
+class TestPowCostEstimator:
+    def test_attempts_match_difficulty_denominator(self):
+        estimator = PowCostEstimator(hash_rate=1e6)
+        for size, ttl in [(150, 1), (300, 30), (900, 120)]:
+            denominator = (1000 + size * (ttl * 10 + 100)) // 3
+            assert estimator.attempts(size, ttl) == pytest.approx(3 * denominator, rel=1e-6)
+        assert estimator.seconds(300, 30) == pytest.approx(estimator.attempts(300, 30) / 1e6)
+        assert PowCostEstimator(hash_rate=1e6, workers=4).seconds(300, 30) == pytest.approx(estimator.seconds(300, 30) / 4)
+
+    def test_estimate_reads_size_and_ttl_from_payload(self):
+        payload = bytearray(os.urandom(180))
+        payload[12:14] = (29).to_bytes(2, 'little')
+        estimator = PowCostEstimator(hash_rate=1e6)
+        attempts, _ = estimator.estimate(bytes(payload))
+        assert attempts == estimator.attempts(192, 30)
+        assert signed_size(100) == 100 + 1 + 32 + 64 + 12
+
+    def test_pick_ttl_is_smallest_that_covers_target(self):
+        fast = PowCostEstimator(hash_rate=1e7)
+        assert fast.pick_ttl(250, latency_target=30) == 1
+        assert fast.pick_ttl(250, latency_target=90) == 2
+
+        slow = PowCostEstimator(hash_rate=2000)
+        ttl = slow.pick_ttl(250, latency_target=30)
+        assert ttl * 60 >= 30 + slow.seconds(250, ttl)
+        assert (ttl - 1) * 60 < 30 + slow.seconds(250, ttl - 1)
+        with pytest.raises(ValueError):
+            PowCostEstimator(hash_rate=10).pick_ttl(250, latency_target=30)
+
+    def test_calibrated_estimate_is_close_to_solving(self):
+        estimator = PowCostEstimator()
+        assert estimator.calibrate() > 0
+        payload = bytearray(os.urandom(120))
+        payload[12:14] = (0).to_bytes(2, 'little')
+        attempts, _ = estimator.estimate(bytes(payload))
+        # the last nonce found bounds the attempts; one sample is noisy, so only check the scale
+        nonces = calculate_txn_pow(bytes(payload))
+        assert nonces[-1] + 1 < attempts * 10
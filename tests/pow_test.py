@@ -0,0 +1,70 @@
+import hashlib
+import os
+import sys
+
+sys.path.append('.')
+
+from dioxide_python_sdk.utils.gadget import calculate_txn_pow, get_pow_difficulty, get_txn_pow_difficulty
+from dioxide_python_sdk.utils.pow import is_nonce_valid, pow_data_of, search_nonces
+
+
+def byte_loop_fulfilled(diff, val):
+    if diff._TargetNum <= int.from_bytes(val[diff._NonZeroBytes-4:diff._NonZeroBytes], 'little'):
+        return False
+    return all(b == 0 for b in val[diff._NonZeroBytes:32])
+
+
+def make_tx(size, ttl):
+    tx = bytearray(os.urandom(size))
+    tx[12:14] = ((ttl - 1) & 0x1FF).to_bytes(2, 'little')
+    return bytes(tx)
+
+
+class TestPowSolver:
+    def test_threshold_matches_byte_loop(self):
+        diff = get_pow_difficulty(300, 30)
+        word_lo = (diff._NonZeroBytes - 4)
+        edge = bytearray(32)
+        edge[word_lo:word_lo+4] = (diff._TargetNum - 1).to_bytes(4, 'little')
+        samples = [bytes(edge), bytes(32), b"\xff" * 32]
+        edge[word_lo:word_lo+4] = diff._TargetNum.to_bytes(4, 'little')
+        samples.append(bytes(edge))
+        samples += [hashlib.sha256(os.urandom(8)).digest() for _ in range(200)]
+        for val in samples:
+            assert diff.is_fullfiled(val) == byte_loop_fulfilled(diff, val)
+
+    def test_nonces_identical_to_sequential_search(self):
+        for size, ttl in [(80, 1), (120, 10)]:
+            tx = make_tx(size, ttl)
+            diff = get_txn_pow_difficulty(tx)
+            pow_data = pow_data_of(tx)
+            expected = []
+            nonce = 0
+            while len(expected) < 3:
+                if byte_loop_fulfilled(diff, hashlib.sha256(pow_data + nonce.to_bytes(4, 'little')).digest()):
+                    expected.append(nonce)
+                nonce += 1
+            assert calculate_txn_pow(tx) == expected
+            assert all(is_nonce_valid(pow_data, n, diff.threshold) for n in expected)
+
+    def test_search_range(self):
+        tx = make_tx(80, 1)
+        pow_data, threshold = pow_data_of(tx), get_txn_pow_difficulty(tx).threshold
+        nonces = calculate_txn_pow(tx)
+        assert search_nonces(pow_data, threshold, nonces[0] + 1, nonces[2] + 1) == nonces[1:]
+        assert search_nonces(pow_data, threshold, 0, nonces[0]) == []
+
+
+class TestParallelPowSolver:
+    def test_parallel_solve_matches_sequential(self):
+        from dioxide_python_sdk.utils.pow import ParallelPowSolver
+        tx = make_tx(120, 5)
+        with ParallelPowSolver(workers=2, chunk_size=1000) as solver:
+            assert calculate_txn_pow(tx, solver) == calculate_txn_pow(tx)
+
+    def test_batch_keeps_order(self):
+        from dioxide_python_sdk.utils.gadget import calculate_txn_pow_batch
+        from dioxide_python_sdk.utils.pow import ParallelPowSolver
+        txs = [make_tx(80 + i, 2) for i in range(6)]
+        with ParallelPowSolver(workers=2) as solver:
+            assert calculate_txn_pow_batch(txs, solver) == [calculate_txn_pow(tx) for tx in txs]
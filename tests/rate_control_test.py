@@ -0,0 +1,96 @@
+import sys
+import time
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.rate_control import AimdRateController
+
+
+def run_window(controller, now, sent, errors=0):
+    for i in range(sent):
+        controller.on_send(i >= errors)
+    return controller.adjust(now)
+
+
+class TestAimdRateController:
+    def test_additive_increase_needs_utilization(self):
+        controller = AimdRateController(initial_rate=100, increase=10)
+        start = controller._window_start
+        assert run_window(controller, start + 1, sent=100) == 110
+        # an idle window (application limited) does not raise the rate
+        assert run_window(controller, start + 2, sent=20) == 110
+
+    def test_each_signal_cuts_the_rate(self):
+        controller = AimdRateController(initial_rate=100, decrease=0.5)
+        now = controller._window_start
+        assert run_window(controller, now + 1, sent=100, errors=10) == 50
+        assert controller.last_signal == "errors"
+
+        controller.on_mempool({"Transactions": [{}] * 10})
+        assert run_window(controller, now + 2, sent=50) == 25
+        assert controller.last_signal == "mempool"
+
+        controller._mempool_seen = False
+        controller.observe_overview({"TxnCount": [1000, 0], "Throughput": 10.0})
+        controller.observe_overview({"TxnCount": [1400, 0], "Throughput": 10.0})
+        assert run_window(controller, now + 3, sent=25) == 12.5
+        assert controller.last_signal == "backlog"
+        # the same backlog report is not counted twice
+        assert run_window(controller, now + 4, sent=13) > 12.5
+
+    def test_mempool_counts_only_our_inserts(self):
+        controller = AimdRateController(initial_rate=10, increase=10)
+        now = controller._window_start
+        for i in range(10):
+            controller.on_send(True, "own{}:2".format(i))
+        # a busy node: plenty of inserts, but only 3 of ours
+        controller.on_mempool({"Transactions": [{"Hash": "other{}".format(i)} for i in range(50)]})
+        controller.on_mempool([{"Hash": "own0"}, "own1", {"Hash": "own2:2"}, {"Hash": "own2"}])
+        # the window is judged once its inserts had an interval to arrive
+        assert run_window(controller, now + 1, sent=0) == 20
+        assert run_window(controller, now + 2, sent=0) == 10
+        assert controller.last_signal == "mempool"
+
+        for i in range(10, 15):
+            controller.on_send(True, "own{}".format(i))
+        controller.on_mempool([{"Hash": "own{}".format(i)} for i in range(10, 15)])
+        run_window(controller, now + 3, sent=0)
+        assert run_window(controller, now + 4, sent=0) == 10
+        assert controller.last_signal is None
+
+    def test_inserts_before_send_and_after_window_count(self):
+        controller = AimdRateController(initial_rate=10, increase=10)
+        now = controller._window_start
+        # the node reports half of the inserts before tx.send returns
+        controller.on_mempool([{"Hash": "own{}".format(i)} for i in range(5)])
+        for i in range(10):
+            controller.on_send(True, "own{}".format(i))
+        assert run_window(controller, now + 1, sent=0) == 20
+        # the other half lands after the window closed, next to new traffic
+        controller.on_mempool([{"Hash": "own{}".format(i)} for i in range(5, 10)])
+        for i in range(10, 30):
+            controller.on_send(True, "own{}".format(i))
+        controller.on_mempool([{"Hash": "own{}".format(i)} for i in range(10, 30)])
+        assert run_window(controller, now + 2, sent=0) == 30
+        assert run_window(controller, now + 3, sent=0) == 30
+        assert controller.last_signal is None
+
+    def test_settles_near_capacity(self):
+        capacity = 400
+        controller = AimdRateController(initial_rate=20, increase=20, max_rate=5000)
+        now = controller._window_start
+        rates = []
+        for step in range(1, 301):
+            sent = int(controller.rate)
+            errors = max(0, sent - capacity)
+            rates.append(run_window(controller, now + step, sent, errors))
+        settled = rates[100:]
+        assert max(settled) <= capacity * 1.1
+        assert sum(settled) / len(settled) >= capacity * 0.6
+
+    def test_acquire_paces_sends(self):
+        controller = AimdRateController(initial_rate=200)
+        start = time.monotonic()
+        for _ in range(41):
+            controller.acquire()
+        assert time.monotonic() - start >= 0.19
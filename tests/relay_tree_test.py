@@ -0,0 +1,116 @@
+import sys
+import threading
+from collections import Counter
+
+sys.path.append('.')
+
+from box import Box
+from dioxide_python_sdk.client.dioxclient import DioxClient
+from dioxide_python_sdk.client.relay_tree import RelayTree
+
+
+def tx(hash, relays=(), state="TXN_CONFIRMED", status="IVKRET_SUCCESS", function="app.c.f", mode="TMF_NORMAL"):
+    return {"Hash": hash, "ConfirmState": state, "Function": function, "Mode": mode,
+            "Invocation": {"Status": status, "Relays": list(relays)}}
+
+
+class StubClient(DioxClient):
+    def __init__(self, txs):
+        super().__init__(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        self.txs = txs
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    def get_transaction(self, hash, shard_index=None):
+        base = hash.split(":")[0]
+        with self.lock:
+            self.calls[base] += 1
+        if base not in self.txs:
+            raise RuntimeError("not found")
+        return Box(self.txs[base], default_box=True)
+
+
+def diamond(**overrides):
+    # root -> a, b; a -> c; b -> c (c reached twice)
+    txs = {
+        "root": tx("root", ["a:1", "b:2"]),
+        "a": tx("a", ["c:3"]),
+        "b": tx("b", ["c:3"], mode="TMF_EXTERNAL"),
+        "c": tx("c"),
+    }
+    for k, v in overrides.items():
+        txs[k] = v
+    return txs
+
+
+class TestRelayTree:
+    def test_fetches_every_hash_once(self):
+        client = StubClient(diamond())
+        tree = client.get_relay_tree("root")
+        assert list(tree.transactions) == ["root", "a", "b", "c"]
+        assert tree.relay_hashes == ["a:1", "b:2", "c:3"]
+        assert set(client.calls.values()) == {1}
+        assert tree.is_confirmed() and tree.is_success() and not tree.is_finalized()
+        assert tree.statuses["c"] == "TXN_CONFIRMED"
+        assert [e.Hash for e in tree.events] == ["b"]
+        assert tree.children["b"] == ["c"]
+
+    def test_missing_or_pending_relay_is_not_confirmed(self):
+        txs = diamond()
+        del txs["c"]
+        assert not StubClient(txs).get_relay_tree("root").is_confirmed()
+        pending = StubClient(diamond(c=tx("c", state="TXN_READY")))
+        assert pending.get_all_relay_transactions(Box({"Hash": "root"})) is None
+
+    def test_deploy_helpers_walk_tree_once(self):
+        client = StubClient(diamond())
+        assert client.wait_for_dapp_deployed("root", 5) is True
+        assert set(client.calls.values()) == {1}
+
+        refunded = StubClient(diamond(c=tx("c", function="core.coin.address.deposit")))
+        assert refunded.wait_for_token_deployed("root", 5) is False
+        failed = StubClient(diamond(a=tx("a", ["c:3"], status="IVKRET_FAILED")))
+        assert failed.wait_for_dapp_deployed("root", 5) is False
+
+    def test_expand_reuses_fetched_nodes(self):
+        client = StubClient(diamond())
+        tree = RelayTree("root")
+        tree.expand(client, ["b:2"])
+        tree.expand(client, ["root"])
+        assert set(tree.transactions) == {"root", "a", "b", "c"}
+        assert set(client.calls.values()) == {1}
+
+
+class ChainClient(StubClient):
+    """root -> r1 -> r2 -> r3; each hop confirms on its second fetch."""
+
+    def __init__(self, depth=3):
+        names = ["root"] + ["r{}".format(i) for i in range(1, depth + 1)]
+        txs = {}
+        for i, name in enumerate(names):
+            relays = ["{}:{}".format(names[i + 1], i)] if i + 1 < len(names) else []
+            txs[name] = tx(name, relays)
+        super().__init__(txs)
+
+    def get_transaction(self, hash, shard_index=None):
+        confirmed = super().get_transaction(hash, shard_index)
+        if self.calls[hash.split(":")[0]] < 2:
+            return Box(tx(confirmed.Hash, state="TXN_READY"), default_box=True)
+        return confirmed
+
+
+class TestRelayTreeRefresh:
+    def test_refresh_polls_only_pending_frontier(self):
+        client = ChainClient(depth=3)
+        tree = client.wait_for_relay_tree("root", 5, poll_interval=0.01)
+        assert tree is not None and tree.is_confirmed()
+        assert list(tree.transactions) == ["root", "r1", "r2", "r3"]
+        # every hop is fetched until it confirms and never again afterwards
+        assert dict(client.calls) == {"root": 2, "r1": 2, "r2": 2, "r3": 2}
+
+    def test_pending_lists_unsettled_and_missing(self):
+        txs = diamond(a=tx("a", ["c:3"], state="TXN_READY"))
+        del txs["c"]
+        tree = StubClient(txs).get_relay_tree("root")
+        assert sorted(tree.pending()) == ["a", "c"]
+        assert tree.pending(["TXN_CONFIRMED", "TXN_READY"]) == ["c"]
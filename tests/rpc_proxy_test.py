@@ -0,0 +1,81 @@
+import sys
+import threading
+import time
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.dioxclient import DioxClient
+from dioxide_python_sdk.client.rpc_proxy import RpcCachingProxy, response_ttl, SETTLED_TTL
+
+
+class FakeUpstream:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def make_request(self, method, params):
+        with self.lock:
+            self.calls.append(method)
+        time.sleep(self.delay)
+        if method == "dx.dapp":
+            return {"ret": {"DappID": 9}}
+        if method == "dx.isn":
+            return {"ret": {"ISN": len(self.calls)}}
+        if method == "tx.send":
+            return {"ret": {"Hash": "h" + params["txdata"]}}
+        if method == "dx.transaction":
+            return {"ret": {"Hash": params["hash"], "ConfirmState": "TXN_FINALIZED"}}
+        return {"err": 1, "ret": "unknown"}
+
+
+class TestRpcCachingProxy:
+    def setup_method(self):
+        self.upstream = FakeUpstream()
+        self.proxy = RpcCachingProxy(upstream="http://127.0.0.1:1/api", port=0)
+        self.proxy.client.rpc = self.upstream
+        self.proxy.start()
+        self.client = DioxClient(url="http://127.0.0.1:{}/api".format(self.proxy.address[1]))
+
+    def teardown_method(self):
+        self.proxy.stop()
+
+    def test_reads_cached_writes_forwarded(self):
+        assert self.client.get_dapp_info("demo").DappID == 9
+        assert self.client.get_dapp_info("demo").DappID == 9
+        assert self.client.get_isn("addr") != self.client.get_isn("addr")
+        assert self.client.send_raw_transaction(b"\x01") == self.client.send_raw_transaction(b"\x01")
+        assert self.upstream.calls.count("dx.dapp") == 1
+        assert self.upstream.calls.count("dx.isn") == 2
+        assert self.upstream.calls.count("tx.send") == 2
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            try:
+                self.client.get_overview()
+            except Exception:
+                pass
+        assert self.upstream.calls.count("dx.overview") == 2
+
+    def test_concurrent_misses_coalesce(self):
+        self.upstream.delay = 0.2
+        threads = [threading.Thread(target=self.client.get_transaction, args=("abc",)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert self.upstream.calls.count("dx.transaction") == 1
+        assert self.proxy.stats()["Coalesced"] + self.proxy.stats()["Hits"] == 7
+
+    def test_settled_responses_expire(self):
+        finalized = {"ret": {"ConfirmState": "TXN_FINALIZED"}}
+        pending = {"ret": {"ConfirmState": "TXN_CONFIRMED"}}
+        # finalized transactions later become TXN_ARCHIVED: cached longer, never forever
+        assert response_ttl("dx.transaction", {}, finalized) == (True, SETTLED_TTL)
+        assert response_ttl("dx.transaction", {}, pending) == (True, 0.5)
+        assert response_ttl("tx.send", {}, finalized) == (False, None)
+        block = {"ret": {"Height": 9, "State": "Finalized"}}
+        assert response_ttl("dx.consensus_header", {"query_type": 1}, block) == (True, SETTLED_TTL)
+        assert response_ttl("dx.transaction_block", {"query_type": 1}, block) == (True, SETTLED_TTL)
+        assert response_ttl("dx.consensus_header", {"query_type": 0}, block) == (True, 1.0)
+        assert response_ttl("dx.dapp", {}, block) == (True, None)
@@ -0,0 +1,76 @@
+import sys
+import threading
+import time
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.account import DioxAccount
+from dioxide_python_sdk.client.dioxclient import DioxClient
+from dioxide_python_sdk.client.scheduler import WeightedFairQueue
+
+
+class GateClient(DioxClient):
+    """Records the gas price and send order; sends block until the gate opens."""
+
+    def __init__(self):
+        super().__init__(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        self.gate = threading.Event()
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def get_isn(self, address):
+        return 0
+
+    def compose_transaction_local(self, sender, function, args, isn=None, gas_price=None, ttl=None, **kwargs):
+        # length-prefixed so the stub can read it back whatever the signature and nonces contain
+        payload = "{}|{}".format(function, gas_price).encode()
+        return (bytes(2) + (time.time_ns() // 1_000_000).to_bytes(6, 'little') + isn.to_bytes(4, 'little') + (1).to_bytes(2, 'little')
+                + len(payload).to_bytes(2, 'little') + payload)
+
+    def send_raw_transaction(self, signed_txn, sync=False, timeout=60):
+        self.gate.wait(5)
+        with self.lock:
+            size = int.from_bytes(signed_txn[14:16], 'little')
+            self.sent.append(signed_txn[16:16 + size].decode())
+            return "hash{}".format(len(self.sent))
+
+
+class TestWeightedFairQueue:
+    def test_backlogged_classes_share_by_weight(self):
+        wfq = WeightedFairQueue({"high": 3, "low": 1})
+        for i in range(40):
+            wfq.put("low", i)
+            wfq.put("high", i)
+        served = [wfq.get()[0] for _ in range(40)]
+        assert served.count("high") == 30 and served.count("low") == 10
+        # an idle class does not bank credit
+        assert wfq.pending() == {"high": 10, "low": 30}
+
+    def test_fifo_within_class(self):
+        wfq = WeightedFairQueue({"a": 1})
+        for i in range(5):
+            wfq.put("a", i)
+        assert [wfq.get()[1] for _ in range(5)] == list(range(5))
+
+
+class TestSubmissionScheduler:
+    def test_high_priority_overtakes_bulk_backlog(self):
+        client = GateClient()
+        user = DioxAccount.generate_key_pair()
+        scheduler = client.submission_scheduler(send_concurrency=1, queue_size=1)
+        bulk = scheduler.submit_many([{"user": user, "function": "d.C.bulk", "args": {}} for _ in range(30)], "low")
+        time.sleep(0.2)
+        urgent = scheduler.submit({"user": user, "function": "d.C.urgent", "args": {}}, "high")
+        client.gate.set()
+
+        assert urgent.result(timeout=10).startswith("hash")
+        assert all(f.result(timeout=10) for f in bulk)
+        order = client.sent.index("d.C.urgent|400")
+        # only what was already inside the pipeline (workers + size-1 queues) goes first
+        assert order < 16
+        assert client.sent.count("d.C.bulk|100") == 30
+
+        stats = scheduler.stats()
+        assert stats["high"]["dispatched"] == 1 and stats["low"]["dispatched"] == 30
+        assert stats["low"]["max_delay"] > stats["high"]["max_delay"]
+        scheduler.stop()
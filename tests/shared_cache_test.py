@@ -0,0 +1,65 @@
+import multiprocessing
+import os
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.cache import MetadataCache
+from dioxide_python_sdk.client.shared_cache import SharedMetadataCache, FILE_HEADER_SIZE, SLOT_HEADER
+
+
+def _fill(path):
+    cache = SharedMetadataCache(path, slot_count=64, slot_size=1024)
+    cache.put("contract", "demo.Bank", {"ContractID": 42, "Functions": [{"Name": "f"}]}, time.time())
+    cache.close()
+
+
+class TestSharedMetadataCache:
+    def setup_method(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "meta.cache")
+
+    def teardown_method(self):
+        self.dir.cleanup()
+
+    def test_entry_written_by_other_process_is_visible(self):
+        p = multiprocessing.get_context("spawn").Process(target=_fill, args=(self.path,))
+        p.start()
+        p.join(30)
+        cache = SharedMetadataCache(self.path, slot_count=64, slot_size=1024)
+        value, stored = cache.get("contract", "demo.Bank")
+        assert value["ContractID"] == 42
+        assert stored <= time.time()
+        assert cache.get("contract", "demo.Other") is None
+
+    def test_overwrite_invalidate_and_oversize(self):
+        cache = SharedMetadataCache(self.path, slot_count=4, slot_size=256)
+        for i in range(10):
+            cache.put("shard", ["address", "a{}".format(i)], i, time.time())
+        assert cache.get("shard", ["address", "a9"])[0] == 9
+        cache.put("shard", ["address", "a9"], 99, time.time())
+        assert cache.get("shard", ["address", "a9"])[0] == 99
+        cache.invalidate("shard", ["address", "a9"])
+        assert cache.get("shard", ["address", "a9"]) is None
+        assert cache.put("contract", "big", "x" * 1000, time.time()) is False
+
+    def test_reader_never_sees_write_in_progress(self):
+        cache = SharedMetadataCache(self.path, slot_count=1, slot_size=256)
+        cache.put("token", "ABC", {"TokenId": 1}, time.time())
+        version = struct.unpack_from("<Q", cache._mm, FILE_HEADER_SIZE)[0]
+        struct.pack_into("<Q", cache._mm, FILE_HEADER_SIZE, version + 1)
+        assert cache.get("token", "ABC") is None
+        struct.pack_into("<Q", cache._mm, FILE_HEADER_SIZE, version + 2)
+        # corrupt payload under a stable version is rejected by the checksum
+        value_offset = FILE_HEADER_SIZE + SLOT_HEADER.size + len(cache._key_bytes("token", "ABC"))
+        cache._mm[value_offset + 2] ^= 0xFF
+        assert cache.get("token", "ABC") is None
+
+    def test_metadata_cache_falls_back_to_shared(self):
+        shared = SharedMetadataCache(self.path, slot_count=16, slot_size=512)
+        MetadataCache(shared=shared).put("dapp", "demo", {"DappID": 5})
+        other = MetadataCache(shared=SharedMetadataCache(self.path, slot_count=16, slot_size=512))
+        assert other.get("dapp", "demo").DappID == 5
@@ -0,0 +1,50 @@
+import sys
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.account import DioxAccount, DioxAccountType
+from dioxide_python_sdk.utils.pow import is_nonce_valid, pow_data_of
+from dioxide_python_sdk.utils.gadget import get_txn_pow_difficulty
+
+
+def make_txdata(i):
+    # minimal composed header: version..isn, ttl_sc_tsc (ttl=2), then payload
+    return bytes(12) + (1).to_bytes(2, 'little') + i.to_bytes(4, 'little') * 8
+
+
+def check_signed(account, txdata, signed):
+    header = txdata + account.account_type.value.to_bytes(1, 'little') + account.pk_bytes
+    assert signed.startswith(header)
+    sig = signed[len(header):len(header) + 64]
+    assert account.verify(sig, header)
+    body = signed[:-12]
+    diff = get_txn_pow_difficulty(body)
+    for k in range(3):
+        nonce = int.from_bytes(signed[-12 + 4 * k:len(signed) - 8 + 4 * k], 'little')
+        assert is_nonce_valid(pow_data_of(body), nonce, diff.threshold)
+
+
+class TestSignMany:
+    def test_serial_matches_single_sign(self):
+        account = DioxAccount.generate_key_pair()
+        txdatas = [make_txdata(i) for i in range(4)]
+        # ed25519 signatures are deterministic, so the whole payload is
+        assert account.sign_many(txdatas) == [account.sign_diox_transaction(t) for t in txdatas]
+
+    def test_process_pool_keeps_order(self):
+        account = DioxAccount.generate_key_pair()
+        txdatas = [make_txdata(i) for i in range(6)]
+        signed = account.sign_many(txdatas, workers=2)
+        assert len(signed) == len(txdatas)
+        for txdata, s in zip(txdatas, signed):
+            check_signed(account, txdata, s)
+        assert signed == [account.sign_diox_transaction(t) for t in txdatas]
+
+    def test_key_cache_follows_key_changes(self):
+        a = DioxAccount.generate_key_pair()
+        b = DioxAccount.generate_key_pair()
+        msg = b"hello"
+        assert a.verify(a.sign(msg), msg)
+        a.sk_bytes, a.pk_bytes = b.sk_bytes, b.pk_bytes
+        assert a.sign(msg) == b.sign(msg)
+        assert a.account_type == DioxAccountType.ED25519
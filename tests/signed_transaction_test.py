@@ -0,0 +1,95 @@
+import sys
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.account import DioxAccount, DioxAddress, DioxAddressType
+from dioxide_python_sdk.client.contract import ContractInvokeID, CORE_CONTRACT_COIN, DAPP_ID_CORE
+from dioxide_python_sdk.client.signed_transaction import (
+    SignedTransaction, validate_signed_transactions, MALFORMED, BAD_POW, BAD_SIGNATURE,
+)
+from dioxide_python_sdk.client.transaction import UnsignedTransaction
+from dioxide_python_sdk.client.types import EngineID
+from dioxide_python_sdk.utils.gadget import calculate_txn_pow, append_txn_pow
+
+
+RVM_CONTRACT = (5 << 36) | (2 << 32) | (3 << 20) | 1
+
+
+def unsigned(isn=7, delegatee=None, data=b"\x05\x00\x00\x00", core=False, ttl=2):
+    if core:
+        cid = ContractInvokeID(sn=CORE_CONTRACT_COIN, engine_id=EngineID.Core.value, dapp_id=DAPP_ID_CORE, scope=2, build=3)
+    else:
+        cid = ContractInvokeID(RVM_CONTRACT)
+    tx = UnsignedTransaction(cid, 2, timestamp=1_700_000_000_123, delegatee=delegatee)
+    tx.set_isn(isn)
+    tx.set_gas_price((1 << 40) + 5)
+    tx.set_gas_limit(300000)
+    tx.ttl = ttl
+    tx.input = bytearray(data)
+    tx.input_size = len(data)
+    return tx.serialize()
+
+
+class TestSignedTransaction:
+    def test_parse_is_inverse_of_signing(self):
+        user = DioxAccount.generate_key_pair()
+        delegatee = DioxAddress(None, DioxAddressType.DAPP)
+        delegatee.set_delegatee_from_string("testa")
+        txdata = unsigned(delegatee=delegatee)
+        signed = user.sign_diox_transaction(txdata)
+
+        tx = SignedTransaction.parse(signed)
+        assert (tx.version, tx.isn, tx.ttl, tx.opcode, tx.timestamp) == (txdata[0], 7, 2, 2, 1_700_000_000_123)
+        assert tx.gas_price == ((1 << 40) + 5) >> 9 << 9 and tx.gas_limit == 300000
+        assert tx.rvm_contract == RVM_CONTRACT and tx.build is None
+        assert bytes(tx.delegatee) == delegatee.address_bytes
+        assert bytes(tx.input) == b"\x05\x00\x00\x00"
+        assert bytes(tx.txdata) == txdata
+        assert bytes(tx.public_key) == user.pk_bytes and tx.account_type == user.account_type
+        assert user.verify(bytes(tx.signature), bytes(tx.signed_message))
+        assert len(tx.nonces) == 3
+        # fields are views of the caller's buffer
+        assert tx.input.obj is signed and tx.signature.obj is signed
+
+        core = SignedTransaction.parse(user.sign_diox_transaction(unsigned(core=True, data=b"")))
+        assert core.build == 3 and core.rvm_contract is None
+        assert core.delegatee is None and len(core.input) == 0
+
+    def test_parse_token_attachments(self):
+        user = DioxAccount.generate_key_pair()
+        cid = ContractInvokeID(RVM_CONTRACT)
+        tx = UnsignedTransaction(cid, 2, timestamp=1_700_000_000_123)
+        tx.input = bytearray(b"\x05\x00\x00\x00")
+        tx.input_size = 4
+        tx.add_fca(77, 1000)
+        tx.add_fca(1, 5)
+        # uint64 token id + bigint amount per attachment
+        assert bytes(tx.fca_token) == bytes.fromhex("4d00000000000000" "01e803000000000000"
+                                                    "0100000000000000" "010500000000000000")
+        parsed = SignedTransaction.parse(user.sign_diox_transaction(tx.serialize()))
+        assert parsed.tsc == 2 and parsed.delegatee is None
+        assert bytes(parsed.input) == b"\x05\x00\x00\x00"
+        assert bytes(parsed.fca) == bytes(tx.fca_token)
+        assert len(SignedTransaction.parse(user.sign_diox_transaction(unsigned())).fca) == 0
+
+    def test_validate_rejects_bad_signature_and_pow(self):
+        user = DioxAccount.generate_key_pair()
+        good = user.sign_diox_transaction(unsigned())
+
+        tampered = bytearray(good)
+        tampered[40] ^= 1
+        payload = bytearray(user.sign_transaction_payload(unsigned(isn=8)))
+        payload[-1] ^= 1
+        bad_sig = append_txn_pow(bytes(payload), calculate_txn_pow(bytes(payload)))
+
+        results = validate_signed_transactions([good, bytes(tampered), bad_sig, b"short"])
+        assert results == [None, BAD_POW, BAD_SIGNATURE, MALFORMED]
+        assert validate_signed_transactions([bad_sig], check_signature=False) == [None]
+
+    def test_bulk_validation_in_processes(self):
+        user = DioxAccount.generate_key_pair()
+        txs = user.sign_many([unsigned(isn=i) for i in range(6)])
+        txs[3] = txs[3][:-1] + bytes([txs[3][-1] ^ 0xFF])
+        expected = validate_signed_transactions(txs)
+        assert expected.count(None) == 5 and expected[3] == BAD_POW
+        assert validate_signed_transactions(txs, workers=2, chunksize=2) == expected
@@ -0,0 +1,52 @@
+import base64
+import sys
+
+sys.path.append('.')
+
+from gmssl.sm2 import CryptSM2
+
+from dioxide_python_sdk.client.account import DioxAccount, DioxAccountType
+from dioxide_python_sdk.utils.sm2 import Sm2Signer, N, g_table, _to_affine, GX, GY
+
+test_sm2_json = {
+    "PrivateKey": "+OfM+tj9R8I/BnIjCvc+JAdl0ADy1vAkbu0n2KINwzw=",
+    "PublicKey": "AX1hRvLswVwarsbSDiQHzxmSGwR95G4DPfjnLP2oAtDr3kNsJ7X7Q5l5yhnWg/5hTe30O/CZRIbOvv94y3cmvQ==",
+    "Address": "zqgx8f30g04qpd2fxxm9e05een3ytjp970vzbjnhctjrf7kj5per84cj34:sm2",
+    "AddressType": "SM2",
+}
+SK = base64.b64decode(test_sm2_json["PrivateKey"])
+PK = base64.b64decode(test_sm2_json["PublicKey"])
+
+
+class TestSm2Signer:
+    def setup_method(self):
+        self.signer = Sm2Signer(SK, PK)
+        self.gmssl = CryptSM2(private_key=SK.hex(), public_key=PK.hex(), asn1=False)
+
+    def test_public_key_matches_private_key(self):
+        d = int.from_bytes(SK, "big")
+        x, y = _to_affine(g_table().multiply(d))
+        assert x.to_bytes(32, "big") + y.to_bytes(32, "big") == PK
+        assert _to_affine(g_table().multiply(1)) == (GX, GY)
+
+    def test_byte_identical_to_gmssl_for_same_k(self):
+        for i, msg in enumerate([b"", b"abc", b"\x00" * 300]):
+            k = (0x1234567890ABCDEF * (i + 7) ** 9) % N
+            expected = bytes.fromhex(self.gmssl.sign_with_sm3(msg, "%064x" % k))
+            assert self.signer.sign(msg, k) == expected
+
+    def test_cross_verification(self):
+        msg = b"dioxide sm2"
+        ours = self.signer.sign(msg)
+        assert self.gmssl.verify_with_sm3(ours.hex(), msg)
+        theirs = bytes.fromhex(self.gmssl.sign_with_sm3(msg))
+        assert self.signer.verify(theirs, msg)
+        assert not self.signer.verify(theirs, msg + b"!")
+        assert not self.signer.verify(theirs[:63], msg)
+
+    def test_account_uses_fast_path(self):
+        account = DioxAccount.from_json(test_sm2_json, type=DioxAccountType.SM2)
+        sig = account.sign(b"payload")
+        assert len(sig) == 64
+        assert account.verify(sig, b"payload")
+        assert self.gmssl.verify_with_sm3(sig.hex(), b"payload")
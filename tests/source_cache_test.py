@@ -0,0 +1,81 @@
+import os
+import re
+import sys
+import tempfile
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.cache import SourceCodeCache
+from dioxide_python_sdk.client.dioxclient import DioxClient
+
+
+class RecordingClient(DioxClient):
+    def __init__(self):
+        super().__init__(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        self.calls = []
+        self.build_hash = "hash_v1"
+        self.source_has_hash = False
+
+    def make_request(self, method, params):
+        self.calls.append(method)
+        if method == "dx.contract_info":
+            return {"Hash": self.build_hash}
+        if method == "dx.source_code":
+            response = {"Source": "contract Bank {} // " + self.build_hash}
+            if self.source_has_hash:
+                response["Hash"] = self.build_hash
+            return response
+        raise AssertionError(method)
+
+
+class TestSourceCodeCache:
+    def test_reuses_source_for_same_build(self):
+        client = RecordingClient()
+        first = client.get_source_code("dapp", "Bank")
+        second = client.get_source_code("dapp", "Bank")
+        assert first == second
+        # a miss reuses the Hash read before the download
+        assert client.calls == ["dx.contract_info", "dx.source_code", "dx.contract_info"]
+
+    def test_refetches_when_build_changes(self):
+        client = RecordingClient()
+        client.get_source_code("dapp", "Bank")
+        client.build_hash = "hash_v2"
+        src = client.get_source_code("dapp", "Bank")
+        assert src["Source"].endswith("hash_v2")
+        assert client.calls.count("dx.source_code") == 2
+
+    def test_deploy_during_download_is_cached_under_the_response_hash(self):
+        client = RecordingClient()
+        client.source_has_hash = True
+        make_request = client.make_request
+
+        def deploy_while_downloading(method, params):
+            if method == "dx.source_code":
+                # a deploy lands between dx.contract_info and the download
+                client.build_hash = "hash_v2"
+            return make_request(method, params)
+        client.make_request = deploy_while_downloading
+        src = client.get_source_code("dapp", "Bank")
+        assert client.source_cache.get("hash_v1") is None
+        assert client.source_cache.get("hash_v2") == src
+        assert client.get_source_code("dapp", "Bank") == src
+        assert client.calls.count("dx.source_code") == 1
+
+    def test_disk_cache_survives_new_instance(self):
+        with tempfile.TemporaryDirectory() as d:
+            SourceCodeCache(d).put("h", "contract C {}")
+            cache = SourceCodeCache(d)
+            assert "h" in cache
+            assert cache.get("h") == "contract C {}"
+            assert cache.get("missing") is None
+
+    def test_disk_file_names_stay_in_cache_dir(self):
+        with tempfile.TemporaryDirectory() as root:
+            d = os.path.join(root, "cache")
+            cache = SourceCodeCache(d)
+            cache.put("../../escape", "contract C {}")
+            assert os.listdir(root) == ["cache"]
+            [name] = os.listdir(d)
+            assert re.fullmatch(r"[0-9a-f]{64}\.src\.z", name)
+            assert SourceCodeCache(d).get("../../escape") == "contract C {}"
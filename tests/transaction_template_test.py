@@ -0,0 +1,80 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append('.')
+
+from box import Box
+from dioxide_python_sdk.client.account import DioxAccount, DioxAddress, DioxAddressType
+from dioxide_python_sdk.client.contract import ContractInvokeID
+from dioxide_python_sdk.client.dioxclient import DioxClient
+from dioxide_python_sdk.client.transaction import UnsignedTransaction, TransactionTemplate
+
+CONTRACT_ID = (5 << 36) | (2 << 32) | (3 << 20)
+CONTRACT_INFO = Box({
+    "ContractID": CONTRACT_ID,
+    "ContractVersionID": CONTRACT_ID | 1,
+    "Functions": [
+        {"Name": "transfer", "Opcode": 2, "Params": [{"Type": "uint32", "Name": "Amount"}]},
+        {"Name": "ping", "Opcode": 3, "Params": []},
+    ],
+})
+
+
+def reference(isn, timestamp, data, delegatee=None, gas_price=100):
+    tx = UnsignedTransaction(ContractInvokeID(0x1100000001), 0, timestamp=timestamp, delegatee=delegatee)
+    tx.set_gas_price(gas_price)
+    tx.set_isn(isn)
+    tx.input = bytearray(data)
+    tx.input_size = len(data)
+    if not data:
+        tx.mode |= 0x400
+    return tx.serialize()
+
+
+class TestTransactionTemplate:
+    def test_build_matches_serialize(self):
+        delegatee = DioxAddress(None, DioxAddressType.DAPP)
+        delegatee.set_delegatee_from_string("testa")
+        for kwargs in ({}, {"delegatee": delegatee}, {"gas_price": (1 << 40) + 12345}):
+            prototype = UnsignedTransaction(ContractInvokeID(0x1100000001), 0, timestamp=0,
+                                            delegatee=kwargs.get("delegatee", None))
+            prototype.set_gas_price(kwargs.get("gas_price", 100))
+            template = TransactionTemplate(prototype, capacity=8)
+            for isn, size in ((0, 0), (7, 5), (0xFFFFFFFF, 300), (42, 3)):
+                data = os.urandom(size)
+                ts = 1756808332132 + isn
+                assert template.build(isn, input=data, timestamp=ts) == reference(isn, ts, data, **kwargs)
+
+    def test_build_many(self):
+        prototype = UnsignedTransaction(ContractInvokeID(0x1100000001), 0, timestamp=0)
+        template = TransactionTemplate(prototype)
+        txs = template.build_many(range(3), [b"a", b"bc", b""], timestamp=99)
+        assert txs == [reference(0, 99, b"a"), reference(1, 99, b"bc"), reference(2, 99, b"")]
+
+    def test_token_attachments_are_rejected(self):
+        prototype = UnsignedTransaction(ContractInvokeID(0x1100000001), 0, timestamp=0)
+        prototype.add_fca(1, 5)
+        with pytest.raises(ValueError):
+            TransactionTemplate(prototype)
+
+    def test_client_template_matches_compose_local(self):
+        client = DioxClient(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        user = DioxAccount.generate_key_pair()
+        for function, args in (("app.bank.transfer", {"Amount": 77}), ("app.bank.ping", {})):
+            local = client.compose_transaction_local(user, function, args, contract_info=CONTRACT_INFO,
+                                                     isn=9, gas_limit=1000)
+            template = client.compose_transaction_template(user, function, contract_info=CONTRACT_INFO, gas_limit=1000)
+            timestamp = int.from_bytes(local[2:8], "little")
+            assert template.build(9, args=args, timestamp=timestamp) == local
+
+    def test_compose_local_stamps_current_time(self, monkeypatch):
+        import time
+        client = DioxClient(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        user = DioxAccount.generate_key_pair()
+        later = time.time_ns() + 3 * 3600 * 10**9
+        monkeypatch.setattr(time, "time_ns", lambda: later)
+        local = client.compose_transaction_local(user, "app.bank.ping", {}, contract_info=CONTRACT_INFO, isn=1)
+        assert int.from_bytes(local[2:8], "little") == later // 1_000_000
+        assert UnsignedTransaction(ContractInvokeID(0x1100000001), 0).timestamp == later // 1_000_000
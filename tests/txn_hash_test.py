@@ -0,0 +1,74 @@
+import hashlib
+import os
+import sys
+
+sys.path.append('.')
+
+import krock32
+import pytest
+from dioxide_python_sdk.client.dioxclient import DioxClient
+from dioxide_python_sdk.client.transaction import UnsignedTransaction, ContractInvokeID
+from dioxide_python_sdk.config.client_config import Config
+from dioxide_python_sdk.utils.gadget import encode_txn_hash, decode_txn_hash, get_txn_hash, get_txn_hashes
+
+
+def krock32_encode(data):
+    encoder = krock32.Encoder()
+    encoder.update(data)
+    return encoder.finalize().lower()
+
+
+class StubClient(DioxClient):
+    def __init__(self, node_hash):
+        super().__init__(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        self.node_hash = node_hash
+
+    def make_request(self, method, params):
+        return {"Hash": self.node_hash}
+
+
+class TestTxnHash:
+    def test_encoding_matches_krock32(self):
+        for _ in range(50):
+            digest = os.urandom(32)
+            h = encode_txn_hash(digest)
+            assert h == krock32_encode(digest) and len(h) == 52
+            assert decode_txn_hash(h) == (digest, None)
+            assert decode_txn_hash(encode_txn_hash(digest, 7)) == (digest, 7)
+
+    def test_decode_suffix_matches_relay_normalization(self):
+        digest = os.urandom(32)
+        h = encode_txn_hash(digest)
+        client = StubClient(h)
+        for suffix in (":12", ":", ":x1", ":-3"):
+            normalized = client._normalize_relay_hash(h + suffix)
+            if normalized == h:
+                assert decode_txn_hash(h + suffix) == (digest, int(suffix[1:]))
+            else:
+                # not a shard suffix for the client either: it is part of the (invalid) hash
+                with pytest.raises(Exception):
+                    decode_txn_hash(h + suffix)
+
+    def test_signed_hash_and_bulk(self):
+        txs = [os.urandom(150 + i) for i in range(20)]
+        assert get_txn_hash(txs[0]) == krock32_encode(hashlib.sha256(txs[0]).digest())
+        assert get_txn_hash(txs[0], 3).endswith(":3")
+        assert get_txn_hashes(txs) == [get_txn_hash(tx) for tx in txs]
+        assert get_txn_hashes(txs, 2) == [get_txn_hash(tx, 2) for tx in txs]
+        shards = [i % 3 or None for i in range(20)]
+        assert get_txn_hashes(txs, shards) == [get_txn_hash(tx, s) for tx, s in zip(txs, shards)]
+
+    def test_algorithm_is_configurable(self, monkeypatch):
+        tx = os.urandom(200)
+        monkeypatch.setattr(Config, "txn_hash_algorithm", "sha3_256")
+        assert get_txn_hash(tx) == krock32_encode(hashlib.sha3_256(tx).digest())
+        assert get_txn_hash(tx, algorithm="sha256") == krock32_encode(hashlib.sha256(tx).digest())
+
+    def test_send_returns_node_hash(self):
+        tx = os.urandom(180)
+        assert StubClient("0" * 52 + ":4").send_raw_transaction(tx) == "0" * 52 + ":4"
+
+    def test_unsigned_hash_wraps_get_txn_hash(self):
+        tx = UnsignedTransaction(ContractInvokeID(73152856577), 0, timestamp=1756808332132)
+        assert tx.hash() == get_txn_hash(tx.serialize())
+
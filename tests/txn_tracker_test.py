@@ -0,0 +1,147 @@
+import sys
+import threading
+import time
+
+sys.path.append('.')
+
+import pytest
+from dioxide_python_sdk.client.contract import ContractInvokeID
+from dioxide_python_sdk.client.dioxclient import DioxClient, DioxError
+from dioxide_python_sdk.client.transaction import UnsignedTransaction
+from dioxide_python_sdk.client.txn_tracker import TxnTracker, CONFIRMED, FINALIZED
+
+
+class FakeClient:
+    def __init__(self, txs=None):
+        self.txs = txs or {}
+        self.queries = []
+        self.lock = threading.Lock()
+
+    def get_transaction(self, hash):
+        with self.lock:
+            self.queries.append(hash)
+        base = hash.split(":")[0]
+        if base not in self.txs:
+            raise RuntimeError("not found")
+        return self.txs[base]
+
+
+class SendClient(DioxClient):
+    """tx.send stand-in whose confirmations are fed to the tracker by the test."""
+
+    def __init__(self):
+        super().__init__(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        self._txn_tracker = TxnTracker(self, poll_after=60, use_subscription=False)
+
+    def make_request(self, method, params):
+        assert method == "tx.send"
+        return {"Hash": "sent:2"}
+
+
+def tx(hash, state, relays=None):
+    return {"Hash": hash, "ConfirmState": state, "Invocation": {"Relays": relays or []}}
+
+
+class TestTxnTracker:
+    def test_stream_resolves_relay_tree_without_polling(self):
+        client = FakeClient()
+        tracker = TxnTracker(client, poll_after=60, use_subscription=False)
+        future = tracker.track("root")
+
+        tracker._on_confirmed(tx("root", "TXN_CONFIRMED", ["r1:3", "r2:5"]))
+        tracker._on_confirmed(tx("r1", "TXN_CONFIRMED", ["r3:1"]))
+        assert not future.done()
+        tracker._on_confirmed(tx("r2", "TXN_CONFIRMED"))
+        assert not future.done()
+        tracker._on_finalized({"Transactions": [tx("r3", "TXN_FINALIZED")]})
+
+        assert future.result(timeout=1) == "TXN_CONFIRMED"
+        assert client.queries == []
+        assert len(tracker) == 0 and tracker._nodes == {}
+
+    def test_finalized_target_and_failures(self):
+        tracker = TxnTracker(FakeClient(), poll_after=60, use_subscription=False)
+        finalized = tracker.track("a", until=FINALIZED)
+        confirmed = tracker.track("a", until=CONFIRMED)
+        expired = tracker.track("b")
+
+        tracker._on_confirmed(tx("a", "TXN_CONFIRMED"))
+        assert confirmed.result(timeout=1) == "TXN_CONFIRMED"
+        assert not finalized.done()
+        tracker._on_finalized({"Transactions": ["a"]})
+        assert finalized.result(timeout=1) == "TXN_FINALIZED"
+
+        tracker.update(tx("b", "TXN_EXPIRED"))
+        assert expired.result(timeout=1) == "TXN_EXPIRED"
+
+    def test_polls_only_missed_hashes(self):
+        client = FakeClient({
+            "missed": tx("missed", "TXN_CONFIRMED", ["relay:2"]),
+            "relay": tx("relay", "TXN_CONFIRMED"),
+        })
+        tracker = TxnTracker(client, poll_after=5, use_subscription=False)
+        seen = tracker.track("seen")
+        missed = tracker.track("missed")
+        tracker._on_confirmed(tx("seen", "TXN_CONFIRMED"))
+        assert seen.result(timeout=1) == "TXN_CONFIRMED"
+
+        now = time.time() + 6
+        assert tracker.poll_once(now) == 1
+        assert client.queries == ["missed"]
+        # the relay was only just discovered, so it is not due yet
+        assert tracker.poll_once(time.time()) == 0
+        assert tracker.poll_once(now + 6) == 1
+        assert client.queries == ["missed", "relay:2"]
+        assert missed.result(timeout=1) == "TXN_CONFIRMED"
+
+    def test_cancel_and_scale(self):
+        tracker = TxnTracker(FakeClient(), poll_after=60, use_subscription=False)
+        futures = tracker.track_many(["h{}".format(i) for i in range(100000)])
+        assert len(tracker) == 100000
+        futures[0].cancel()
+        assert len(tracker) == 99999
+
+        start = time.time()
+        for i in range(1, 100000):
+            tracker._on_confirmed(tx("h{}".format(i), "TXN_CONFIRMED"))
+        assert time.time() - start < 30
+        assert all(f.result(timeout=1) == "TXN_CONFIRMED" for f in futures[1:])
+        assert len(tracker) == 0
+
+    def test_expiry_fails_once_finalized_time_passes_it(self):
+        client = FakeClient({"landed": tx("landed", "TXN_CONFIRMED")})
+        tracker = TxnTracker(client, poll_after=60, use_subscription=False)
+        lost = tracker.track("lost", expiry=1_000_000_000_000)
+        landed = tracker.track("landed", expiry=1_000_000_000_000)
+        fresh = tracker.track("fresh", expiry=2_000_000_000_000)
+
+        tracker._on_finalized({"Height": 9, "Timestamp": 1_000_000_000_000, "Transactions": []})
+        assert not lost.done()
+        tracker._on_finalized({"Height": 10, "Timestamp": 1_000_000_000_500, "Transactions": []})
+        assert lost.result(timeout=1) == "TXN_EXPIRED"
+        # confirmed but missed by the stream: the expiry check finds it
+        assert landed.result(timeout=1) == "TXN_CONFIRMED"
+        assert not fresh.done() and tracker.expired == 1
+
+        # block times in seconds are accepted too
+        tracker.advance_time(2_000_000_001)
+        assert fresh.result(timeout=1) == "TXN_EXPIRED"
+        assert len(tracker) == 0
+
+
+class TestSyncWaitsUseTracker:
+    def test_send_raw_transaction_sync_resolves_from_the_stream(self):
+        client = SendClient()
+        signed = UnsignedTransaction(ContractInvokeID(73152856577), 0).serialize()
+        threading.Timer(0.1, client.txn_tracker._on_confirmed, [tx("sent", "TXN_CONFIRMED")]).start()
+        assert client.send_raw_transaction(signed, sync=True, timeout=5) == "sent:2"
+        assert len(client.txn_tracker) == 0
+
+    def test_failure_returns_without_waiting_out_the_timeout(self):
+        client = SendClient()
+        threading.Timer(0.1, client.txn_tracker.update, [tx("sent", "TXN_EXPIRED")]).start()
+        start = time.time()
+        assert client.wait_for_transaction_confirmed("sent:2", 30) is False
+        assert time.time() - start < 5
+        with pytest.raises(DioxError):
+            client.send_raw_transaction(b"\0" * 16, sync=True, timeout=0.1)
@@ -0,0 +1,81 @@
+import sys
+import threading
+
+sys.path.append('.')
+
+from dioxide_python_sdk.client.dioxclient import DioxClient
+
+
+class RecordingClient(DioxClient):
+    def __init__(self):
+        super().__init__(url="http://127.0.0.1:1/api", ws_url="ws://127.0.0.1:1/api")
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def make_request(self, method, params):
+        with self.lock:
+            self.calls.append((method, params))
+        if method == "dx.contract_info":
+            return {"ContractID": 1, "Functions": [], "Contract": params["contract"]}
+        if method == "dx.dapp":
+            if params["name"] == "BAD":
+                raise RuntimeError("unknown dapp")
+            return {"DappID": len(params["name"])}
+        if method == "dx.token":
+            if params["symbol"] == "BAD":
+                raise RuntimeError("unknown token")
+            return {"TokenId": 7}
+        if method == "dx.shard_index":
+            return {"ShardIndex": 3}
+        raise AssertionError(method)
+
+
+class TestWarmUp:
+    def test_warm_up_populates_caches(self):
+        client = RecordingClient()
+        report = client.warm_up({
+            "contracts": ["demo.Bank", "demo.Vault"],
+            "tokens": ["ABC"],
+            "shards": [("address", "addr1")],
+        })
+        assert report.Loaded == {"contracts": 2, "dapps": 1, "tokens": 1, "shards": 1}
+        assert report.Failed == {}
+        assert report.Elapsed >= 0
+
+        before = len(client.calls)
+        assert client.get_contract_info("demo", "Bank", use_cache=True).Contract == "demo.Bank"
+        assert client.get_dapp_info("demo", use_cache=True).DappID == 4
+        assert client.get_token_info("ABC", use_cache=True).TokenId == 7
+        assert client.get_shard_index("address", "addr1", use_cache=True) == 3
+        assert len(client.calls) == before
+
+    def test_warm_up_reports_failures(self):
+        client = RecordingClient()
+        report = client.warm_up({"tokens": ["ABC", "BAD"]})
+        assert report.Loaded["tokens"] == 1
+        assert ("tokens", "BAD") in report.Failed
+
+    def test_default_getters_read_prefetched_entries(self):
+        client = RecordingClient()
+        client.warm_up({"contracts": ["demo.Bank"], "tokens": ["ABC"], "shards": [("address", "addr1")]})
+        before = len(client.calls)
+        assert client.get_contract_info("demo", "Bank").Contract == "demo.Bank"
+        assert client.get_dapp_info("demo").DappID == 4
+        assert client.get_token_info("ABC").TokenId == 7
+        assert client.get_shard_index("address", "addr1") == 3
+        assert len(client.calls) == before
+        # entries that were not prefetched, and use_cache=False, still ask the node
+        client.get_token_info("XYZ")
+        client.get_token_info("ABC", use_cache=False)
+        assert [params for _, params in client.calls[before:]] == [{"symbol": "XYZ"}, {"symbol": "ABC"}]
+
+    def test_failures_are_not_printed(self, capsys):
+        client = RecordingClient()
+        report = client.warm_up({"dapps": ["BAD"], "tokens": ["BAD"]})
+        assert len(report.Failed) == 2
+        assert capsys.readouterr().out == ""
+
+    def test_failures_of_same_name_are_kept_per_kind(self):
+        client = RecordingClient()
+        report = client.warm_up({"dapps": ["BAD"], "tokens": ["BAD"]})
+        assert report.Failed == {("dapps", "BAD"): "unknown dapp", ("tokens", "BAD"): "unknown token"}